@@ -328,6 +328,19 @@ async function loadPortfolioDataFromAPI() {
     return localData ? JSON.parse(localData) : DEFAULT_DATA;
   }
 
+  // Published pages ship the data inline; no API round trip needed
+  const inlined = document.getElementById('portfolio-data');
+  if (inlined) {
+    try {
+      const data = JSON.parse(inlined.textContent);
+      if (data && data.personalInfo && data.skills) {
+        return data;
+      }
+    } catch (error) {
+      // Fall through to the API
+    }
+  }
+
   try {
     const data = await apiRequest('/portfolio-data/');
     // Validate data structure before returning
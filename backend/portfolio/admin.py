@@ -1,8 +1,186 @@
+from functools import partial
+
 from django.contrib import admin
+from django.contrib.admin.views.main import (
+    ChangeList, IS_FACETS_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, TO_FIELD_VAR
+)
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.forms import ModelChoiceField
+from django.forms.models import BaseModelFormSet
+from django.utils import timezone
+from django.utils.functional import cached_property
 from .models import (
-    PersonalInfo, Skill, Experience, Project, 
+    Tenant, PersonalInfo, Skill, Experience, Project, 
     Certification, ContactMessage, PortfolioSettings
 )
+from . import counters
+from .bulk import refresh_derived_fields, stamp_updated_at
+from .changes import coalesce_changes, record_changes
+from .signals import notify_content_changed
+from .tenants import tenant_key
+
+# Query parameters that page or sort a changelist without filtering it
+UNFILTERED_PARAMS = {PAGE_VAR, ORDER_VAR, IS_POPUP_VAR, TO_FIELD_VAR, IS_FACETS_VAR, '_changelist_filters'}
+COUNT_CAP = 10000
+COUNT_TTL = 60
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs an exact COUNT(*) over a whole table: the
+    count comes from ``estimate`` when given, else counting stops at
+    ``COUNT_CAP`` matching rows.
+    """
+
+    def __init__(self, object_list, per_page, estimate=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.estimate = estimate
+
+    @cached_property
+    def count(self):
+        if self.estimate is not None:
+            return self.estimate()
+        return self.object_list.values('pk')[:COUNT_CAP].count()
+
+
+class TrimmedChangeList(ChangeList):
+    """Changelist loading only the columns it displays"""
+
+    def get_results(self, request):
+        # Only the displayed page is trimmed: actions get the full queryset
+        queryset = self.queryset
+        self.queryset = queryset.only(*self.model_admin.changelist_columns())
+        try:
+            super().get_results(request)
+        finally:
+            self.queryset = queryset
+
+
+class ScalableAdminMixin:
+    """
+    Changelists that stay fast on large tables: no full-result COUNT, no
+    filter facet counts, an estimated (cached) total when nothing is
+    filtered, and only the displayed columns loaded.
+    """
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_changelist(self, request, **kwargs):
+        return TrimmedChangeList
+
+    def changelist_columns(self):
+        names = {field.name for field in self.model._meta.concrete_fields}
+        # The tenant is read by the change log when list_editable rows are saved
+        return ['pk', 'tenant'] + [name for name in self.list_display if name in names]
+
+    def estimated_count(self):
+        """Row count of the current tenant's table, recounted at most every ``COUNT_TTL`` seconds"""
+        key = tenant_key(f'admin:count:{self.model._meta.label_lower}')
+        count = cache.get(key)
+        if count is None:
+            count = self.model.objects.count()
+            cache.set(key, count, COUNT_TTL)
+        return count
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        filtered = any(param not in UNFILTERED_PARAMS for param in request.GET)
+        return EstimatedCountPaginator(queryset, per_page, orphans=orphans,
+                                       allow_empty_first_page=allow_empty_first_page,
+                                       estimate=None if filtered else self.estimated_count)
+
+    def delete_queryset(self, request, queryset):
+        # One change-log insert (and counter update) for the whole selection
+        with transaction.atomic(), coalesce_changes(), counters.batched():
+            queryset.delete()
+
+
+class LoadedRowsFormSet(BaseModelFormSet):
+    """
+    Changelist formset that resolves each row's hidden id against the rows
+    it already loaded, instead of one query per row in
+    ``ModelChoiceField.to_python``.
+    """
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        field = form.fields.get(self.model._meta.pk.name)
+        if isinstance(field, ModelChoiceField):
+            field.to_python = partial(self._loaded_row, field.to_python)
+
+    def _loaded_row(self, to_python, value):
+        try:
+            row = self._existing_object(self.model._meta.pk.to_python(value))
+        except ValidationError:
+            row = None
+        return row if row is not None else to_python(value)
+
+
+class CoalescedListEditMixin:
+    """
+    Save ``list_editable`` changes with one ``bulk_update`` in one
+    transaction, one batched change-log write and one cache/publish
+    notification, instead of an UPDATE, a commit and a rebuild per row.
+    """
+
+    def get_changelist_formset(self, request, **kwargs):
+        return super().get_changelist_formset(request, formset=LoadedRowsFormSet, **kwargs)
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != 'POST':
+            return super().changelist_view(request, extra_context)
+        request._list_edits = []
+        with transaction.atomic(), coalesce_changes():
+            response = super().changelist_view(request, extra_context)
+            self.save_list_edits(request._list_edits)
+        return response
+
+    def save_model(self, request, obj, form, change):
+        edits = getattr(request, '_list_edits', None)
+        if edits is None or not change:
+            return super().save_model(request, obj, form, change)
+        edits.append((obj, form.changed_data))  # Written by save_list_edits()
+
+    def save_list_edits(self, edits):
+        if not edits:
+            return
+        fields = set()
+        for obj, changed_data in edits:
+            fields.update(changed_data)
+            # bulk_update() bypasses save(); sources that weren't loaded are skipped
+            fields.update(refresh_derived_fields(obj))
+        objs = [obj for obj, _ in edits]
+        self.model.objects.bulk_update(objs, stamp_updated_at(self.model, objs, fields))
+        record_changes(self.model, [obj.pk for obj in objs], 'updated')
+        notify_content_changed()
+
+
+@admin.register(Tenant)
+class TenantAdmin(admin.ModelAdmin):
+    # Content admin pages show the tenant being served; other tenants'
+    # content is administered under /t/<slug>/admin/ or their domain
+    list_display = ['slug', 'name', 'domain', 'is_active', 'created_at']
+    list_filter = ['is_active']
+    search_fields = ['slug', 'name', 'domain']
+    filter_horizontal = ['admins']
+
+    # Tenants and their admins span portfolios: superusers only
+    def has_module_permission(self, request):
+        return request.user.is_superuser
+
+    def has_view_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_add_permission(self, request):
+        return request.user.is_superuser
+
+    def has_change_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_delete_permission(self, request, obj=None):
+        return request.user.is_superuser
 
 
 @admin.register(PersonalInfo)
@@ -12,31 +190,53 @@ class PersonalInfoAdmin(admin.ModelAdmin):
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'category', 'proficiency', 'created_at']
     list_filter = ['category']
-    search_fields = ['name']
+    # Prefix matches, served by portfolio_skill_name_idx
+    search_fields = ['^name']
     ordering = ['category', 'name']
 
 
 @admin.register(Experience)
-class ExperienceAdmin(admin.ModelAdmin):
+class ExperienceAdmin(CoalescedListEditMixin, admin.ModelAdmin):
     list_display = ['title', 'company', 'duration', 'order', 'created_at']
     list_editable = ['order']
     ordering = ['order', '-created_at']
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ScalableAdminMixin, CoalescedListEditMixin, admin.ModelAdmin):
     list_display = ['title', 'is_featured', 'order', 'created_at']
     list_filter = ['is_featured']
     list_editable = ['is_featured', 'order']
-    search_fields = ['title', 'description']
+    # Prefix matches, served by portfolio_proj_title_idx
+    search_fields = ['^title']
     ordering = ['order', '-created_at']
+    actions = ['mark_featured', 'mark_not_featured']
+
+    def _set_featured(self, request, queryset, is_featured):
+        with transaction.atomic():
+            ids = list(queryset.exclude(is_featured=is_featured).values_list('pk', flat=True))
+            # update() skips auto_now fields
+            changed = Project.objects.filter(pk__in=ids).update(
+                is_featured=is_featured, updated_at=timezone.now()
+            )
+            record_changes(Project, ids, 'updated')
+            notify_content_changed()
+        self.message_user(request, f'{changed} project(s) updated.')
+
+    @admin.action(description='Mark selected projects as featured')
+    def mark_featured(self, request, queryset):
+        self._set_featured(request, queryset, True)
+
+    @admin.action(description='Mark selected projects as not featured')
+    def mark_not_featured(self, request, queryset):
+        self._set_featured(request, queryset, False)
 
 
 @admin.register(Certification)
-class CertificationAdmin(admin.ModelAdmin):
+class CertificationAdmin(CoalescedListEditMixin, admin.ModelAdmin):
     list_display = ['title', 'issuer', 'issue_date', 'order', 'created_at']
     list_editable = ['order']
     search_fields = ['title', 'issuer']
@@ -44,16 +244,32 @@ class CertificationAdmin(admin.ModelAdmin):
 
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'is_read', 'created_at']
     list_filter = ['is_read', 'created_at']
-    search_fields = ['name', 'email', 'subject']
+    # Prefix matches, each served by its own case-insensitive index
+    search_fields = ['^name', '^email', '^subject']
     readonly_fields = ['name', 'email', 'subject', 'message', 'created_at']
     ordering = ['-created_at']
+    actions = ['mark_read', 'mark_unread']
 
     def has_add_permission(self, request):
         return False
 
+    def estimated_count(self):
+        # Exact, and a primary-key lookup: the maintained inbox counter
+        return counters.get_total()
+
+    @admin.action(description='Mark selected messages as read')
+    def mark_read(self, request, queryset):
+        changed = counters.set_read_state(queryset, True)
+        self.message_user(request, f'{changed} message(s) marked as read.')
+
+    @admin.action(description='Mark selected messages as unread')
+    def mark_unread(self, request, queryset):
+        changed = counters.set_read_state(queryset, False)
+        self.message_user(request, f'{changed} message(s) marked as unread.')
+
 
 @admin.register(PortfolioSettings)
 class PortfolioSettingsAdmin(admin.ModelAdmin):
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.contrib.admin import apps as admin_apps
 
 
 class PortfolioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (registers signal receivers)
+
+
+class PortfolioAdminConfig(admin_apps.AdminConfig):
+    """django.contrib.admin with a site that checks which portfolio staff manage"""
+    default = False  # Named explicitly in INSTALLED_APPS
+    default_site = 'portfolio.sites.TenantAdminSite'
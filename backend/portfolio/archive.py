@@ -0,0 +1,138 @@
+"""
+Compressed archival for old ContactMessage rows.
+
+Messages older than a cutoff are written to immutable gzip NDJSON segments
+under the tenant's archive directory and removed from the hot table. A small
+``index.json`` records each segment's id and date range once its rows are
+deleted, so lookups by id or date only open the segments that can contain
+a match.
+"""
+import gzip
+import json
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import counters
+from .changes import coalesce_changes
+from .models import ContactMessage
+from .publish import atomic_write
+from .serializers import ContactMessageSerializer
+from .tenants import DEFAULT_TENANT_ID, current_tenant_or_default
+
+INDEX_FILENAME = 'index.json'
+
+
+def archive_root():
+    """The current tenant's archive; the default tenant keeps ``ARCHIVE_ROOT`` itself"""
+    tenant_id = current_tenant_or_default()
+    if tenant_id == DEFAULT_TENANT_ID:
+        return str(settings.ARCHIVE_ROOT)
+    return os.path.join(settings.ARCHIVE_ROOT, 'tenants', str(tenant_id))
+
+
+def load_index(root=None):
+    try:
+        with open(os.path.join(root or archive_root(), INDEX_FILENAME), 'rb') as index:
+            return json.load(index)
+    except FileNotFoundError:
+        return {'segments': []}
+
+
+def save_index(index, root=None):
+    atomic_write(os.path.join(root or archive_root(), INDEX_FILENAME),
+                 json.dumps(index, indent=2).encode())
+
+
+def add_to_index(entry, root=None):
+    """Index a segment, replacing an earlier entry for the same file (the same id range)"""
+    index = load_index(root)
+    index['segments'] = [segment for segment in index['segments'] if segment['file'] != entry['file']]
+    index['segments'].append(entry)
+    save_index(index, root)
+
+
+def write_segment(rows):
+    """Write serialized messages to a new segment; returns its index entry"""
+    filename = f"messages-{rows[0]['id']:012d}-{rows[-1]['id']:012d}.ndjson.gz"
+    body = b''.join(json.dumps(row, separators=(',', ':')).encode() + b'\n' for row in rows)
+    atomic_write(os.path.join(archive_root(), filename), gzip.compress(body))
+    dates = sorted(row['created_at'] for row in rows)
+    return {
+        'file': filename,
+        'first_id': rows[0]['id'],
+        'last_id': rows[-1]['id'],
+        'count': len(rows),
+        'start': dates[0],
+        'end': dates[-1],
+        'archived_at': timezone.now().isoformat(),
+    }
+
+
+def read_segment(entry):
+    with gzip.open(os.path.join(archive_root(), entry['file']), 'rb') as segment:
+        for line in segment:
+            yield json.loads(line)
+
+
+def archive_messages(older_than_days, batch_size=1000):
+    """
+    Move the current tenant's messages created more than ``older_than_days``
+    ago into archive segments, one segment per batch. Returns the number of
+    messages moved.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    moved = 0
+    while True:
+        with transaction.atomic():
+            batch = list(ContactMessage.objects.filter(created_at__lt=cutoff).order_by('id')[:batch_size])
+            if not batch:
+                break
+            # The segment is durable before the rows go, but only indexed once
+            # they are: a rolled-back batch leaves an unindexed file (which a
+            # retry of the same rows overwrites). Counters and the change log
+            # are updated once per batch rather than per row.
+            entry = write_segment(ContactMessageSerializer(batch, many=True).data)
+            # Resolved now: on_commit hooks may run outside the tenant's scope
+            root = archive_root()
+            transaction.on_commit(lambda entry=entry, root=root: add_to_index(entry, root))
+            with coalesce_changes(), counters.batched():
+                ContactMessage.objects.filter(pk__in=[message.pk for message in batch]).delete()
+        moved += len(batch)
+    return moved
+
+
+def find_archived_message(message_id):
+    for entry in load_index()['segments']:
+        if entry['first_id'] <= message_id <= entry['last_id']:
+            for row in read_segment(entry):
+                if row['id'] == message_id:
+                    return row
+    return None
+
+
+def archived_messages_between(start, end):
+    """Archived messages with ``start <= created_at <= end`` (aware datetimes), oldest first"""
+    rows = []
+    for entry in load_index()['segments']:
+        if parse_datetime(entry['end']) < start or parse_datetime(entry['start']) > end:
+            continue
+        rows.extend(
+            row for row in read_segment(entry)
+            if start <= parse_datetime(row['created_at']) <= end
+        )
+    return sorted(rows, key=lambda row: (row['created_at'], row['id']))
+
+
+def archive_summary():
+    segments = load_index()['segments']
+    return {
+        'segments': len(segments),
+        'messages': sum(entry['count'] for entry in segments),
+        'start': min((entry['start'] for entry in segments), default=None),
+        'end': max((entry['end'] for entry in segments), default=None),
+    }
@@ -0,0 +1,343 @@
+"""
+Online, incremental backups of the SQLite database.
+
+The live database is copied with SQLite's online backup API a few pages at
+a time, pausing between steps, so the web tier's readers and writers never
+wait on more than one step. Each copy is compared page by page with the
+previous backup: the first backup of a chain stores the whole database,
+later ones only the pages that changed. Everything is written under
+``BACKUP_ROOT``, gzip-compressed where it helps:
+
+- ``<id>.sqlite3.gz``: a full copy (ids ending in ``-full``)
+- ``<id>.pages.gz``: pages changed since the previous backup (``-incr``)
+- ``<id>.hashes``: one digest per page, to diff the next backup against
+- ``<id>.json``: metadata shown by ``GET /api/admin/backups/``
+
+A new chain starts after ``BACKUP_INCREMENTALS_PER_FULL`` increments and
+only the newest ``BACKUP_KEEP_CHAINS`` chains are kept. :func:`restore`
+rebuilds any kept backup from its chain and verifies it before use.
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import struct
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import bus
+from .changes import coalesce_changes, record_changes
+from .models import Tenant, PortfolioSettings, ChangeEvent, ChangeLogCompaction
+from .publish import atomic_write, publish_site_safely
+
+BACKUP_ID_RE = re.compile(r'^[0-9]{14}-[0-9]{6}-(full|incr)$')
+DIGEST_SIZE = 8
+PAGE_NUMBER = struct.Struct('>I')
+COPY_CHUNK = 1024 * 1024
+
+
+class BackupError(Exception):
+    pass
+
+
+def backup_root():
+    return str(settings.BACKUP_ROOT)
+
+
+def backup_path(backup_id, suffix):
+    if not BACKUP_ID_RE.match(backup_id):
+        return None
+    return os.path.join(backup_root(), backup_id + suffix)
+
+
+def database_path():
+    database = settings.DATABASES['default']
+    if database['ENGINE'] != 'django.db.backends.sqlite3':
+        raise BackupError('Backups are only supported for the SQLite database')
+    return str(database['NAME'])
+
+
+@contextmanager
+def exclusive():
+    """Hold the backup lock: one backup or restore at a time, across processes"""
+    os.makedirs(backup_root(), exist_ok=True)
+    with open(os.path.join(backup_root(), '.lock'), 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise BackupError('Another backup or restore is running') from None
+        yield
+
+
+def copy_live_database(path):
+    """Consistent copy of the live database, made in small, paced steps"""
+    source = sqlite3.connect(database_path(), timeout=30)
+    target = sqlite3.connect(path)
+    try:
+        # SQLite only takes the source's read lock for the duration of a
+        # step; the pause lets queued writers in between steps
+        source.backup(target, pages=settings.BACKUP_STEP_PAGES,
+                      progress=lambda status, remaining, total: time.sleep(settings.BACKUP_STEP_PAUSE))
+        page_size = target.execute('PRAGMA page_size').fetchone()[0]
+    finally:
+        target.close()
+        source.close()
+    return page_size
+
+
+def iter_pages(path, page_size):
+    with open(path, 'rb') as database:
+        for page in iter(lambda: database.read(page_size), b''):
+            yield page
+
+
+def page_digests(path, page_size):
+    return b''.join(hashlib.blake2b(page, digest_size=DIGEST_SIZE).digest()
+                    for page in iter_pages(path, page_size))
+
+
+def changed_page_records(path, page_size, page_numbers):
+    with open(path, 'rb') as database:
+        for number in page_numbers:
+            database.seek(number * page_size)
+            yield PAGE_NUMBER.pack(number) + database.read(page_size)
+
+
+def write_compressed(path, chunks):
+    """gzip ``chunks`` to ``path`` via a temporary file and an atomic rename; returns the size"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp, gzip.GzipFile(fileobj=tmp, mode='wb', compresslevel=6) as stream:
+            for chunk in chunks:
+                stream.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return os.path.getsize(path)
+
+
+def list_backups():
+    """Metadata of kept backups, newest first"""
+    try:
+        names = os.listdir(backup_root())
+    except FileNotFoundError:
+        return []
+    backups = []
+    for name in sorted(names, reverse=True):
+        if name.endswith('.json') and BACKUP_ID_RE.match(name[:-5]):
+            try:
+                with open(os.path.join(backup_root(), name), 'rb') as meta:
+                    backups.append(json.load(meta))
+            except (OSError, ValueError):
+                continue  # Rotated away or half-written meanwhile
+    return backups
+
+
+def load_digests(meta):
+    try:
+        with open(backup_path(meta['id'], '.hashes'), 'rb') as digests:
+            return digests.read()
+    except OSError:
+        return None
+
+
+def backup_database(full=False):
+    """
+    Back up the live database: a full copy when starting a chain (or when
+    ``full`` is set), else the pages changed since the previous backup.
+    Returns the new backup's metadata.
+    """
+    with exclusive():
+        started = time.perf_counter()
+        now = timezone.now()
+        backup_id = f'{now:%Y%m%d%H%M%S-%f}-'
+        previous = next(iter(list_backups()), None)
+
+        fd, snapshot = tempfile.mkstemp(dir=backup_root(), prefix='.snapshot-')
+        os.close(fd)
+        try:
+            page_size = copy_live_database(snapshot)
+            digests = page_digests(snapshot, page_size)
+            previous_digests = None if previous is None else load_digests(previous)
+            if (full or previous_digests is None or previous['page_size'] != page_size
+                    or previous['sequence'] >= settings.BACKUP_INCREMENTALS_PER_FULL):
+                backup_id += 'full'
+                meta = {'kind': 'full', 'chain': backup_id, 'parent': None, 'sequence': 0}
+                changed = len(digests) // DIGEST_SIZE
+                stored = write_compressed(backup_path(backup_id, '.sqlite3.gz'), iter_pages(snapshot, page_size))
+            else:
+                backup_id += 'incr'
+                meta = {'kind': 'incremental', 'chain': previous['chain'], 'parent': previous['id'],
+                        'sequence': previous['sequence'] + 1}
+                changed_pages = [
+                    number for number in range(len(digests) // DIGEST_SIZE)
+                    if digests[number * DIGEST_SIZE:(number + 1) * DIGEST_SIZE]
+                    != previous_digests[number * DIGEST_SIZE:(number + 1) * DIGEST_SIZE]
+                ]
+                changed = len(changed_pages)
+                stored = write_compressed(backup_path(backup_id, '.pages.gz'),
+                                          changed_page_records(snapshot, page_size, changed_pages))
+            atomic_write(backup_path(backup_id, '.hashes'), digests)
+        finally:
+            os.unlink(snapshot)
+
+        meta.update({
+            'id': backup_id,
+            'page_size': page_size,
+            'page_count': len(digests) // DIGEST_SIZE,
+            'changed_pages': changed,
+            'database_bytes': page_size * len(digests) // DIGEST_SIZE,
+            'stored_bytes': stored,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+            'created_at': now.isoformat(),
+        })
+        # Metadata last: a backup is listed (and restorable) only once its files exist
+        atomic_write(backup_path(backup_id, '.json'), json.dumps(meta, indent=2).encode())
+        rotate()
+    mark_backed_up(now)
+    return meta
+
+
+def rotate():
+    """Delete every backup outside the newest ``BACKUP_KEEP_CHAINS`` chains"""
+    kept_chains = []
+    for meta in list_backups():
+        if meta['chain'] not in kept_chains:
+            kept_chains.append(meta['chain'])
+        if kept_chains.index(meta['chain']) >= settings.BACKUP_KEEP_CHAINS:
+            # Metadata first, so a partially deleted backup is never listed
+            for suffix in ('.json', '.hashes', '.sqlite3.gz', '.pages.gz'):
+                try:
+                    os.unlink(backup_path(meta['id'], suffix))
+                except FileNotFoundError:
+                    pass
+
+
+def mark_backed_up(when):
+    """
+    Stamp ``last_backup`` on every tenant's settings; delta-sync clients see
+    it. A backup changes no content, so cached views are kept.
+    """
+    with transaction.atomic():
+        rows = list(PortfolioSettings.all_tenants.values_list('pk', 'tenant_id'))
+        PortfolioSettings.all_tenants.update(last_backup=when)
+        with coalesce_changes():
+            for pk, tenant_id in rows:
+                record_changes(PortfolioSettings, [pk], 'updated', tenant_id=tenant_id, content=False)
+
+
+def backup_chain(backup_id):
+    """The full backup and increments ``backup_id`` is built from, oldest first"""
+    backups = {meta['id']: meta for meta in list_backups()}
+    chain = []
+    while backup_id is not None:
+        meta = backups.get(backup_id)
+        if meta is None:
+            raise BackupError(f'Backup {backup_id} is missing from the chain')
+        chain.append(meta)
+        backup_id = meta['parent']
+    return chain[::-1]
+
+
+def rebuild(backup_id, path):
+    """Write the database as of ``backup_id`` to ``path`` and verify it"""
+    chain = backup_chain(backup_id)
+    target = chain[-1]
+    with gzip.open(backup_path(chain[0]['id'], '.sqlite3.gz'), 'rb') as full, open(path, 'wb') as database:
+        shutil.copyfileobj(full, database, COPY_CHUNK)
+    record_size = PAGE_NUMBER.size + target['page_size']
+    with open(path, 'r+b') as database:
+        for meta in chain[1:]:
+            with gzip.open(backup_path(meta['id'], '.pages.gz'), 'rb') as pages:
+                for record in iter(lambda: pages.read(record_size), b''):
+                    database.seek(PAGE_NUMBER.unpack_from(record)[0] * meta['page_size'])
+                    database.write(record[PAGE_NUMBER.size:])
+            database.truncate(meta['page_count'] * meta['page_size'])
+
+    if page_digests(path, target['page_size']) != load_digests(target):
+        raise BackupError(f'Backup {backup_id} does not match its recorded page digests')
+    check = sqlite3.connect(path)
+    try:
+        result = check.execute('PRAGMA integrity_check').fetchone()[0]
+    finally:
+        check.close()
+    if result != 'ok':
+        raise BackupError(f'Backup {backup_id} failed the integrity check: {result}')
+    return target
+
+
+def restore(backup_id, output=None):
+    """
+    Restore ``backup_id`` to ``output``, or over the live database when
+    ``output`` is None. The live database is replaced through the backup
+    API in one transaction, so concurrent readers see the old or the new
+    contents, never a mix.
+    """
+    if not BACKUP_ID_RE.match(backup_id):
+        raise BackupError(f'Invalid backup id: {backup_id}')
+    with exclusive():
+        directory = os.path.dirname(os.path.abspath(output)) if output else backup_root()
+        fd, rebuilt = tempfile.mkstemp(dir=directory, prefix='.restore-')
+        os.close(fd)
+        try:
+            meta = rebuild(backup_id, rebuilt)
+            if output:
+                os.replace(rebuilt, output)
+                return meta
+            previous_version = ChangeEvent.all_tenants.aggregate(latest=Max('id'))['latest'] or 0
+            connections.close_all()
+            source = sqlite3.connect(rebuilt)
+            live = sqlite3.connect(database_path(), timeout=30)
+            try:
+                source.backup(live)
+            finally:
+                live.close()
+                source.close()
+        finally:
+            if os.path.exists(rebuilt):
+                os.unlink(rebuilt)
+    resume_after_restore(previous_version)
+    return meta
+
+
+def resume_after_restore(previous_version):
+    """
+    Versions issued before a restore no longer describe the data. Issue
+    each tenant a newer one (SQLite would otherwise hand out the same ids
+    again), send delta-sync clients holding an older one to a full
+    reload, and drop cached views and published pages.
+    """
+    tenant_ids = list(Tenant.objects.order_by('pk').values_list('pk', flat=True))
+    with transaction.atomic():
+        ChangeEvent.all_tenants.bulk_create(
+            ChangeEvent(id=previous_version + number, tenant_id=tenant_id,
+                        model='restore', object_id=0, action='updated')
+            for number, tenant_id in enumerate(tenant_ids, 1)
+        )
+        ChangeLogCompaction.objects.create(horizon=previous_version + 1)
+    # Cached views and in-process copies in every worker describe the old database
+    bus.bump_all()
+    for tenant_id in tenant_ids:
+        publish_site_safely(tenant_id)
+
+
+def backup_status():
+    backups = list_backups()
+    return {
+        'last_backup': backups[0]['created_at'] if backups else None,
+        'chains': len({meta['chain'] for meta in backups}),
+        'stored_bytes': sum(meta['stored_bytes'] for meta in backups),
+        'backups': backups,
+    }
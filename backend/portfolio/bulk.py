@@ -0,0 +1,174 @@
+"""
+List-level write actions for the content ViewSets.
+
+Each action runs in one transaction with ``bulk_create``/``bulk_update``
+(or a single DELETE), refreshes sanitized rich-text copies and parsed dates,
+records its change events in one INSERT and fires one
+cache-invalidation/republish notification, however many rows it touches.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .changes import coalesce_changes, record_changes
+from .signals import notify_content_changed
+from .validators import sanitize_instance
+
+
+def refresh_derived_fields(instance):
+    """What save() would maintain: sanitized copies, and parsed dates where the model has them"""
+    changed = sanitize_instance(instance)
+    refresh_dates = getattr(instance, 'refresh_dates', None)
+    if refresh_dates is not None:
+        changed += refresh_dates()
+    return changed
+
+
+def stamp_updated_at(model, instances, fields):
+    """bulk_update() skips auto_now fields; set them and return the field list to write"""
+    fields = sorted(fields)
+    if any(field.name == 'updated_at' for field in model._meta.fields):
+        now = timezone.now()
+        for instance in instances:
+            instance.updated_at = now
+        fields.append('updated_at')
+    return fields
+
+
+class IdListSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Duplicate ids are not allowed")
+        return value
+
+
+class BulkWriteMixin:
+    """
+    Adds ``/bulk/`` to a ModelViewSet:
+
+    - POST   a list of objects to create them
+    - PATCH  a list of objects with ``id`` to partially update them
+    - DELETE ``{"ids": [...]}`` to delete them
+    """
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        if not isinstance(request.data, (list, dict)):
+            return Response({'detail': 'Expected a list or an object'}, status=status.HTTP_400_BAD_REQUEST)
+        handler = {
+            'POST': self.bulk_create,
+            'PATCH': self.bulk_update,
+            'DELETE': self.bulk_delete,
+        }[request.method]
+        try:
+            with transaction.atomic(), coalesce_changes():
+                return handler(request)
+        except IntegrityError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def bulk_create(self, request):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        model = self.get_queryset().model
+        objs = [model(**item) for item in serializer.validated_data]
+        for obj in objs:
+            refresh_derived_fields(obj)  # bulk_create() bypasses save()
+        objs = model.objects.bulk_create(objs)
+        self.after_bulk_write(objs)
+        record_changes(model, [obj.pk for obj in objs], 'created')
+        notify_content_changed()
+        return Response(self.get_serializer(objs, many=True).data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, request):
+        items = request.data if isinstance(request.data, list) else []
+        if not items or any(not isinstance(item, dict) or 'id' not in item for item in items):
+            return Response({'detail': 'Expected a non-empty list of objects with an "id"'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        # JSON ids may arrive as strings ("3"); compare them as primary keys
+        try:
+            ids = [model._meta.pk.to_python(item['id']) for item in items]
+        except DjangoValidationError:
+            return Response({'detail': 'Invalid "id" value'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(set(ids)) != len(ids):
+            return Response({'detail': 'Duplicate ids are not allowed'}, status=status.HTTP_400_BAD_REQUEST)
+        instances = model.objects.in_bulk(ids)
+        missing = [pk for pk in ids if pk not in instances]
+        if missing:
+            return Response({'detail': f'Not found: {missing}'}, status=status.HTTP_404_NOT_FOUND)
+
+        errors, fields, changed = {}, set(), []
+        for pk, item in zip(ids, items):
+            instance = instances[pk]
+            serializer = self.get_serializer(instance, data=item, partial=True)
+            if not serializer.is_valid():
+                errors[pk] = serializer.errors
+                continue
+            for field, value in serializer.validated_data.items():
+                setattr(instance, field, value)
+                fields.add(field)
+            fields.update(refresh_derived_fields(instance))
+            changed.append(instance)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        if fields:
+            model.objects.bulk_update(changed, stamp_updated_at(model, changed, fields))
+            self.after_bulk_write(changed)
+            record_changes(model, [instance.pk for instance in changed], 'updated')
+            notify_content_changed()
+        return Response(self.get_serializer(changed, many=True).data)
+
+    def after_bulk_write(self, instances):
+        """Hook for derived data that save() signals would normally maintain"""
+
+    def bulk_delete(self, request):
+        serializer = IdListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        model = self.get_queryset().model
+        existing = list(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        # Delete receivers are coalesced by the surrounding coalesce_changes()
+        deleted, _ = model.objects.filter(pk__in=existing).delete()
+        return Response({'deleted': existing}, status=status.HTTP_200_OK if deleted else status.HTTP_404_NOT_FOUND)
+
+
+class ReorderMixin:
+    """
+    Adds ``POST /reorder/`` taking ``{"ids": [...]}`` in the new display order.
+    Rows left out of ``ids`` follow the listed ones in their current order, so
+    every row of the tenant ends up with a distinct position.
+    """
+
+    @action(detail=False, methods=['post'])
+    def reorder(self, request):
+        serializer = IdListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        model = self.get_queryset().model
+        with transaction.atomic():
+            instances = {instance.pk: instance for instance in model.objects.select_for_update()}
+            missing = [pk for pk in ids if pk not in instances]
+            if missing:
+                return Response({'detail': f'Not found: {missing}'}, status=status.HTTP_404_NOT_FOUND)
+
+            listed = set(ids)
+            order = ids + [pk for pk in instances if pk not in listed]
+            moved = []
+            for position, pk in enumerate(order):
+                instance = instances[pk]
+                if instance.order != position:
+                    instance.order = position
+                    moved.append(instance)
+            if moved:
+                model.objects.bulk_update(moved, stamp_updated_at(model, moved, ['order']))
+                record_changes(model, [instance.pk for instance in moved], 'updated')
+                notify_content_changed()
+        return Response({'order': order, 'moved': [instance.pk for instance in moved]})
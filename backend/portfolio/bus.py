@@ -0,0 +1,119 @@
+"""
+Cross-worker invalidation bus.
+
+A small memory-mapped file of 64-bit counters shared by every worker on
+the host, one per namespace (hashed into a fixed number of slots). A worker
+keeps, next to each in-process copy, the version of the namespace it was
+built under and compares it on use: one read from shared memory, with no
+system call or query. Writers bump namespaces once their transaction has
+committed (:func:`bump_on_commit`), under an exclusive lock on the file,
+and every worker sees the new value on its next read. Each process opens
+the file itself on first use, also after a fork, so the lock excludes
+workers from one another.
+
+Namespaces sharing a slot only cause extra reloads. Slot 0 is an epoch
+added to every version: it starts at the file's creation time in
+microseconds, so versions keep growing if the file is deleted, and
+:func:`bump_all` invalidates every namespace at once.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+
+SLOTS = 4096
+SLOT = struct.Struct('<Q')
+
+_open_lock = threading.Lock()
+# flock() does not exclude threads sharing the descriptor
+_write_lock = threading.Lock()
+_mapped = None  # (pid, file descriptor, mmap)
+
+
+def _map():
+    global _mapped
+    if _mapped is None or _mapped[0] != os.getpid():
+        with _open_lock:
+            if _mapped is not None and _mapped[0] != os.getpid():
+                # Inherited across fork(): the descriptor shares its open file
+                # description (and so its flock) with the parent and siblings
+                _, fd, counters = _mapped
+                counters.close()
+                os.close(fd)
+                _mapped = None
+            if _mapped is None:
+                path = str(settings.INVALIDATION_BUS_PATH)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(fd).st_size < SLOTS * SLOT.size:
+                        os.ftruncate(fd, SLOTS * SLOT.size)
+                    counters = mmap.mmap(fd, SLOTS * SLOT.size)
+                    if SLOT.unpack_from(counters, 0)[0] == 0:
+                        SLOT.pack_into(counters, 0, time.time_ns() // 1000)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                _mapped = (os.getpid(), fd, counters)
+    return _mapped
+
+
+def close():
+    """Unmap the file in this process, e.g. before the server forks; reopened on next use"""
+    global _mapped
+    with _open_lock:
+        if _mapped is not None:
+            _, fd, counters = _mapped
+            counters.close()
+            os.close(fd)
+        _mapped = None
+
+
+@lru_cache(maxsize=4096)
+def _offset(namespace):
+    digest = hashlib.blake2b(namespace.encode(), digest_size=8).digest()
+    return (1 + int.from_bytes(digest, 'little') % (SLOTS - 1)) * SLOT.size
+
+
+def version(namespace):
+    """Current version of ``namespace``; changes whenever it (or everything) is bumped"""
+    counters = _map()[2]
+    return SLOT.unpack_from(counters, 0)[0] + SLOT.unpack_from(counters, _offset(namespace))[0]
+
+
+def _bump_offsets(offsets):
+    _, fd, counters = _map()
+    with _write_lock:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            for offset in offsets:
+                SLOT.pack_into(counters, offset, SLOT.unpack_from(counters, offset)[0] + 1)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def bump(*namespaces):
+    """Invalidate ``namespaces`` in every worker, now"""
+    _bump_offsets({_offset(namespace) for namespace in namespaces})
+
+
+def bump_all():
+    """Invalidate every namespace, e.g. after the database was replaced"""
+    _bump_offsets((0,))
+
+
+def _bump_namespaces(namespaces):
+    bump(*namespaces)
+
+
+def bump_on_commit(*namespaces, using=None):
+    """Bump ``namespaces`` once the current transaction commits (now, outside one)"""
+    from .signals import on_commit_once  # signals imports modules that use the bus
+
+    on_commit_once(_bump_namespaces, using=using, namespaces=namespaces)
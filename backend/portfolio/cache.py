@@ -0,0 +1,568 @@
+"""
+Two-tier cache for the portfolio backend.
+
+L1 is a bounded in-process LRU holding live Python objects, so warm reads
+never pickle, unpickle or leave the process. L2 is a SQLite file shared by
+every worker on the host; it needs no external service and survives
+restarts. Values read from L1 are shared references and must be treated as
+read-only by callers.
+"""
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import NamedTuple, Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.http import HttpResponse
+
+
+class CacheStats:
+    """Thread-safe hit/miss/eviction counters for one cache instance"""
+
+    FIELDS = ('l1_hits', 'l2_hits', 'misses', 'sets', 'deletes',
+              'l1_evictions', 'l1_expirations', 'l2_evictions')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, field, amount=1):
+        with self._lock:
+            self._counts[field] += amount
+
+    def reset(self):
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def snapshot(self):
+        with self._lock:
+            data = dict(self._counts)
+        lookups = data['l1_hits'] + data['l2_hits'] + data['misses']
+        data['hit_rate'] = round((data['l1_hits'] + data['l2_hits']) / lookups, 4) if lookups else 0.0
+        return data
+
+
+class LRUStore:
+    """Bounded in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries, stats):
+        self.max_entries = max_entries
+        self.stats = stats
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return ``(found, value)``; expired entries are dropped on access"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats.incr('l1_expirations')
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.incr('l1_evictions')
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def items(self):
+        """Snapshot of ``(key, value)`` pairs, expired ones included until next accessed"""
+        with self._lock:
+            return [(key, value) for key, (value, _) in self._data.items()]
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteStore:
+    """Shared on-host store backed by a single SQLite file in WAL mode"""
+
+    def __init__(self, path, max_entries, stats):
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = stats
+        self._local = threading.local()
+        # Capacity is checked every few writes rather than counted on each
+        self._cull_every = max(1, max_entries // 20)
+        self._writes = itertools.count(1)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid != os.getpid():
+            # Inherited across fork(): SQLite connections must not be shared
+            # between processes, so leave it untouched and open our own
+            conn = None
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entry ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self):
+        """Close this thread's connection; the next operation reopens it"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+    def get(self, key):
+        """Return ``(found, value, expires)`` with ``expires`` as wall-clock time"""
+        row = self._connection().execute(
+            'SELECT value, expires FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            return False, None, None
+        return True, pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, expires):
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        conn = self._connection()
+        conn.execute('INSERT OR REPLACE INTO cache_entry (key, value, expires) VALUES (?, ?, ?)',
+                     (key, blob, expires))
+        if next(self._writes) % self._cull_every == 0:
+            self._cull(conn)
+
+    def add(self, key, value, expires):
+        """Insert only if the key is absent or expired; atomic across processes"""
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM cache_entry WHERE key = ? AND expires IS NOT NULL AND expires <= ?',
+                         (key, time.time()))
+            cursor = conn.execute('INSERT OR IGNORE INTO cache_entry (key, value, expires) VALUES (?, ?, ?)',
+                                  (key, blob, expires))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+
+    def touch(self, key, expires):
+        cursor = self._connection().execute(
+            'UPDATE cache_entry SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (expires, key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        cursor = self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+        return cursor.rowcount == 1
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
+
+    def _cull(self, conn):
+        # Cull expired rows first, then the entries closest to expiry, down
+        # to 90% of capacity; the slack absorbs the writes between checks.
+        count = conn.execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+        if count <= self.max_entries:
+            return
+        conn.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+        excess = conn.execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0] - int(self.max_entries * 0.9)
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM cache_entry WHERE key IN ('
+                'SELECT key FROM cache_entry ORDER BY expires IS NULL, expires LIMIT ?)',
+                (excess,),
+            )
+            self.stats.incr('l2_evictions', excess)
+
+
+class TwoTierCache(BaseCache):
+    """
+    Django cache backend: in-process LRU (L1) in front of a SQLite file (L2).
+
+    OPTIONS:
+        MAX_ENTRIES     L2 capacity (Django's standard option, default 300)
+        L1_MAX_ENTRIES  L1 capacity per process (default 512)
+        L1_TIMEOUT      upper bound in seconds on how long L1 may serve a value
+                        without re-reading L2, which bounds cross-worker
+                        staleness (default 10)
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.stats = CacheStats()
+        self.l1_timeout = options.get('L1_TIMEOUT', 10)
+        self._l1 = LRUStore(int(options.get('L1_MAX_ENTRIES', 512)), self.stats)
+        self._l2 = SQLiteStore(location, self._max_entries, self.stats)
+
+    def _l1_ttl(self, expires):
+        if expires is None:
+            return self.l1_timeout
+        remaining = expires - time.time()
+        return remaining if self.l1_timeout is None else min(remaining, self.l1_timeout)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        found, value = self._l1.get(key)
+        if found:
+            self.stats.incr('l1_hits')
+            return value
+        found, value, expires = self._l2.get(key)
+        if not found:
+            self.stats.incr('misses')
+            return default
+        self.stats.incr('l2_hits')
+        self._l1.set(key, value, self._l1_ttl(expires))
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        expires = self.get_backend_timeout(timeout)
+        if expires is not None and expires <= time.time():
+            self._l1.delete(key)
+            self._l2.delete(key)
+            return
+        self._l2.set(key, value, expires)
+        self._l1.set(key, value, self._l1_ttl(expires))
+        self.stats.incr('sets')
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        expires = self.get_backend_timeout(timeout)
+        if not self._l2.add(key, value, expires):
+            return False
+        self._l1.set(key, value, self._l1_ttl(expires))
+        self.stats.incr('sets')
+        return True
+
+    def get_shared(self, key, default=None, version=None):
+        """Read ``key`` from L2, skipping and then refreshing L1, for a value this process knows is outdated"""
+        key = self.make_and_validate_key(key, version=version)
+        found, value, expires = self._l2.get(key)
+        if not found:
+            self._l1.delete(key)
+            self.stats.incr('misses')
+            return default
+        self.stats.incr('l2_hits')
+        self._l1.set(key, value, self._l1_ttl(expires))
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1.delete(key)
+        return self._l2.touch(key, self.get_backend_timeout(timeout))
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1.delete(key)
+        self.stats.incr('deletes')
+        return self._l2.delete(key)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        found, _ = self._l1.get(key)
+        return found or self._l2.get(key)[0]
+
+    def clear(self):
+        self._l1.clear()
+        self._l2.clear()
+
+    def close_connections(self):
+        """
+        Close the L2 connection of the calling thread, e.g. before the server
+        forks workers. Not done in :meth:`close`, which Django calls after
+        every request.
+        """
+        self._l2.close()
+
+    def get_stats(self):
+        data = self.stats.snapshot()
+        data['l1_entries'] = len(self._l1)
+        data['l1_max_entries'] = self._l1.max_entries
+        data['l2_max_entries'] = self._max_entries
+        return data
+
+
+VIEW_CACHE_PREFIX = 'view'
+
+# Seconds a superseded entry may still be served while one request refreshes it
+STALE_GRACE = 300
+# Upper bound on one recomputation; a crashed holder's lock expires after this
+RECOMPUTE_LOCK_TIMEOUT = 30
+# How long a request with nothing stale to serve waits for the holder before computing itself
+RECOMPUTE_WAIT = 5
+# Poll interval while the holder is another worker
+RECOMPUTE_POLL = 0.02
+
+
+def _generation_namespace(tenant_id=None):
+    from .tenants import tenant_key  # tenants imports this module
+
+    return tenant_key(f'{VIEW_CACHE_PREFIX}:generation', tenant_id)
+
+
+def _view_generation():
+    from . import bus
+
+    return bus.version(_generation_namespace())
+
+
+def invalidate_cached_views(tenant_id=None):
+    """
+    Mark every entry stored by :func:`cached_view` for a tenant (default: the
+    current one) stale, in every worker at once: the generation lives on the
+    invalidation bus rather than in the cache, whose L1 may lag.
+    """
+    from . import bus
+
+    bus.bump(_generation_namespace(tenant_id))
+
+
+class ViewEntry(NamedTuple):
+    generation: int
+    fresh_until: Optional[float]  # wall clock, None for no expiry
+    status_code: int
+    content_type: str
+    content: bytes
+
+    def is_fresh(self, generation):
+        return self.generation == generation and (self.fresh_until is None or time.time() < self.fresh_until)
+
+
+class SingleFlightStats:
+    """Per-key counts of how cached view requests were answered, newest ``max_keys`` keys kept"""
+
+    FIELDS = ('fresh', 'stale', 'coalesced', 'recomputed', 'wait_timeouts', 'recompute_ms')
+
+    def __init__(self, max_keys=256):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()
+
+    def incr(self, key, field, amount=1):
+        with self._lock:
+            counts = self._keys.get(key)
+            if counts is None:
+                counts = self._keys[key] = dict.fromkeys(self.FIELDS, 0)
+                while len(self._keys) > self.max_keys:
+                    self._keys.popitem(last=False)
+            else:
+                self._keys.move_to_end(key)
+            counts[field] += amount
+
+    def reset(self):
+        with self._lock:
+            self._keys.clear()
+
+    def snapshot(self):
+        with self._lock:
+            data = {key: dict(counts) for key, counts in self._keys.items()}
+        for counts in data.values():
+            counts['recompute_ms'] = round(counts['recompute_ms'], 3)
+        return data
+
+
+class SingleFlight:
+    """
+    At most one recomputation per key: across threads through a table of
+    in-flight keys, across workers through an ``add()`` lock in the shared
+    cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> (threading.Event, monotonic start)
+
+    def acquire(self, cache, key):
+        """True if the caller now holds ``key`` and must :meth:`release` it"""
+        now = time.monotonic()
+        with self._lock:
+            current = self._inflight.get(key)
+            if current is not None and now - current[1] < RECOMPUTE_LOCK_TIMEOUT:
+                return False
+            done = threading.Event()
+            self._inflight[key] = (done, now)
+        if cache.add(f'{key}:lock', os.getpid(), RECOMPUTE_LOCK_TIMEOUT):
+            return True
+        # Another worker holds it; local waiters fall back to polling the store
+        self._finish(key, done)
+        return False
+
+    def release(self, cache, key):
+        cache.delete(f'{key}:lock')
+        with self._lock:
+            current = self._inflight.get(key)
+        if current is not None:
+            self._finish(key, current[0])
+
+    def wait(self, key, timeout):
+        """Until the holder of ``key`` is done (or ``timeout``); False if it is another worker"""
+        with self._lock:
+            current = self._inflight.get(key)
+        if current is None:
+            time.sleep(min(timeout, RECOMPUTE_POLL))
+            return False
+        current[0].wait(timeout)
+        return True
+
+    def _finish(self, key, done):
+        with self._lock:
+            if self._inflight.get(key, (None,))[0] is done:
+                del self._inflight[key]
+        done.set()
+
+
+single_flight = SingleFlight()
+single_flight_stats = SingleFlightStats()
+
+
+def _is_shareable_request(request, any_user=False):
+    """
+    Only JSON reads are shared, and only anonymous ones unless the view's
+    output does not depend on who asks: the browsable API's HTML carries
+    the user's name and CSRF token.
+    """
+    if 'text/html' in request.META.get('HTTP_ACCEPT', ''):
+        return False
+    if any_user:
+        return True
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def _is_shareable_response(request, response):
+    media = response.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    if media != 'application/json':
+        return False  # e.g. ?format=api
+    # Reading the session to find the user is fine (the user is anonymous);
+    # a CSRF token or a response that says it varies by cookie is not
+    return not request.META.get('CSRF_COOKIE_NEEDS_UPDATE') and 'Cookie' not in response.get('Vary', '')
+
+
+def cached_view(timeout=DEFAULT_TIMEOUT, alias='default', any_user=False):
+    """
+    Cache successful GET/HEAD responses of a view function or method.
+
+    The rendered body is stored, not the serializer output, so warm hits skip
+    both ORM work and rendering. Only anonymous JSON responses that did not
+    issue a CSRF token or vary by cookie are stored or served; anything else
+    runs the view. ``any_user=True`` extends this to signed-in users, for
+    views (behind their own permission checks) whose JSON is the same for
+    everyone allowed to see it. Entries are keyed by tenant, path and query string, and
+    carry the view generation they were rendered under, so
+    :func:`invalidate_cached_views` marks them stale without removing them.
+
+    A stale or expired entry is recomputed by one request at a time per key
+    (see :class:`SingleFlight`); meanwhile other requests get the stale body
+    for up to ``STALE_GRACE`` seconds, or wait for the fresh one when there
+    is none. Compressed variants are stored per entry generation (see
+    :mod:`portfolio.compression`).
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            # Works for plain views (request first) and methods (self first)
+            request = args[0] if hasattr(args[0], 'method') else args[1]
+            if request.method not in ('GET', 'HEAD') or not _is_shareable_request(request, any_user):
+                return view_func(*args, **kwargs)
+
+            from .tenants import tenant_key
+
+            cache = caches[alias]
+            ttl = cache.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+            key = tenant_key(f'{VIEW_CACHE_PREFIX}:json:{request.get_full_path()}')
+            hard_timeout = None if ttl is None else ttl + STALE_GRACE
+
+            def cached_response(entry):
+                response = HttpResponse(entry.content, status=entry.status_code, content_type=entry.content_type)
+                response.precompressed_cache = (alias, f'{key}:{entry.generation}:{entry.fresh_until}', hard_timeout)
+                return response
+
+            generation = _view_generation()
+            entry = cache.get(key)
+            if entry is not None and not entry.is_fresh(generation) and hasattr(cache, 'get_shared'):
+                # This worker's L1 copy may predate a refresh done by another one
+                entry = cache.get_shared(key)
+            if entry is not None and entry.is_fresh(generation):
+                single_flight_stats.incr(key, 'fresh')
+                return cached_response(entry)
+
+            deadline = time.monotonic() + RECOMPUTE_WAIT
+            holder = single_flight.acquire(cache, key)
+            while not holder:
+                if entry is not None:
+                    single_flight_stats.incr(key, 'stale')
+                    return cached_response(entry)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # The holder is slow or gone; answer without waiting longer
+                    single_flight_stats.incr(key, 'wait_timeouts')
+                    return view_func(*args, **kwargs)
+                single_flight.wait(key, remaining)
+                entry = getattr(cache, 'get_shared', cache.get)(key)
+                if entry is not None and entry.is_fresh(generation):
+                    single_flight_stats.incr(key, 'coalesced')
+                    return cached_response(entry)
+                holder = single_flight.acquire(cache, key)
+
+            started = time.perf_counter()
+            try:
+                response = view_func(*args, **kwargs)
+            except BaseException:
+                single_flight.release(cache, key)
+                raise
+            if response.status_code != 200 or response.streaming:
+                single_flight.release(cache, key)
+                return response
+
+            fresh_until = None if ttl is None else time.time() + ttl
+
+            def store(rendered):
+                try:
+                    if _is_shareable_response(request, rendered):
+                        cache.set(key, ViewEntry(generation, fresh_until, rendered.status_code,
+                                                 rendered['Content-Type'], rendered.content), hard_timeout)
+                        # Lets CompressionMiddleware keep the encoded body next to this entry
+                        rendered.precompressed_cache = (alias, f'{key}:{generation}:{fresh_until}', hard_timeout)
+                finally:
+                    single_flight.release(cache, key)
+                    single_flight_stats.incr(key, 'recomputed')
+                    single_flight_stats.incr(key, 'recompute_ms', (time.perf_counter() - started) * 1000)
+
+            # DRF responses are rendered after content negotiation, once the
+            # handler has returned; store them when that happens.
+            if hasattr(response, 'add_post_render_callback') and not response.is_rendered:
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+            return response
+        return wrapper
+    return decorator
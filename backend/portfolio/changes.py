@@ -0,0 +1,198 @@
+"""
+Change log shared by the live stream and any cache keyed on content version.
+
+Every tracked write appends a ChangeEvent in the same transaction, so the
+event id doubles as a monotonically increasing content version that all
+workers agree on. Each tenant's version is the id of its latest event.
+
+Once the write commits, the tenant's namespaces on the invalidation bus
+(:mod:`portfolio.bus`) are bumped too, so in-process copies can check
+:func:`change_token` without querying the log.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import (
+    PersonalInfo, Skill, Experience, Project,
+    Certification, ContactMessage, PortfolioSettings,
+    ChangeEvent, ChangeLogCompaction
+)
+from .serializers import (
+    PersonalInfoSerializer, SkillSerializer, ExperienceSerializer,
+    ProjectSerializer, CertificationSerializer, PortfolioSettingsSerializer
+)
+from . import bus
+from .tenants import tenant_key
+
+TRACKED_MODELS = (PersonalInfo, Skill, Experience, Project, Certification, ContactMessage, PortfolioSettings)
+
+# Events for these models are only delivered to staff clients
+PRIVATE_MODELS = frozenset({ContactMessage._meta.model_name})
+
+# Bus namespaces: any change at all, and any public content change of a tenant
+CHANGES_NAMESPACE = 'changes'
+CONTENT_NAMESPACE = 'content'
+
+
+_pending = threading.local()
+
+
+def record_change(instance, action):
+    """Append a change event for ``instance``, in its tenant's log"""
+    record_changes(type(instance), [instance.pk], action, tenant_id=instance.tenant_id)
+
+
+def record_changes(model, object_ids, action, tenant_id=None, content=True):
+    """
+    Append one change event per id, buffered inside :func:`coalesce_changes`;
+    events belong to ``tenant_id``, by default the current tenant. With
+    ``content=False`` (bookkeeping columns only) the tenant's cached views
+    are left alone.
+    """
+    tenant = {} if tenant_id is None else {'tenant_id': tenant_id}
+    events = [
+        ChangeEvent(model=model._meta.model_name, object_id=object_id, action=action, **tenant)
+        for object_id in object_ids
+    ]
+    buffered = getattr(_pending, 'events', None)
+    if buffered is not None:
+        buffered.extend(events)
+    elif len(events) == 1:
+        events[0].save()
+    elif events:
+        ChangeEvent.objects.bulk_create(events)
+    if events:
+        namespaces = [CHANGES_NAMESPACE, tenant_key(model._meta.model_name, tenant_id)]
+        if content and model._meta.model_name not in PRIVATE_MODELS:
+            namespaces.append(tenant_key(CONTENT_NAMESPACE, tenant_id))
+        bus.bump_on_commit(*namespaces)
+
+
+@contextmanager
+def coalesce_changes():
+    """
+    Buffer change events recorded inside the block and write them with a
+    single INSERT when it exits. Use inside ``transaction.atomic()`` so the
+    events commit or roll back with the writes they describe.
+    """
+    if getattr(_pending, 'events', None) is not None:
+        yield  # Nested: the outermost block flushes
+        return
+    _pending.events = []
+    try:
+        yield
+        if _pending.events:
+            ChangeEvent.objects.bulk_create(_pending.events)
+    finally:
+        _pending.events = None
+
+
+def current_version(tenant_id=None):
+    """Latest content version of a tenant (default: the current scope), 0 when nothing has been recorded yet"""
+    events = ChangeEvent.objects.all()
+    if tenant_id is not None:
+        events = events.filter(tenant_id=tenant_id)
+    latest = events.order_by('-id').values_list('id', flat=True).first()
+    return latest or 0
+
+
+def change_token(model=None):
+    """
+    Token that moves whenever the current tenant's rows of ``model`` (by
+    default: any public content) change, read from the invalidation bus in
+    O(1). Unlike :func:`current_version` it is not a change-log position.
+    """
+    name = CONTENT_NAMESPACE if model is None else model._meta.model_name
+    return bus.version(tenant_key(name))
+
+
+def events_since(version, include_private=False, limit=1000, tenant_id=None):
+    """Change events newer than ``version`` (of one tenant, else the current scope), oldest first"""
+    events = ChangeEvent.objects.filter(id__gt=version)
+    if tenant_id is not None:
+        events = events.filter(tenant_id=tenant_id)
+    if not include_private:
+        events = events.exclude(model__in=PRIVATE_MODELS)
+    return list(events.order_by('id')[:limit])
+
+
+# Serializers used to ship changed rows to delta-sync clients
+SYNC_SERIALIZERS = {
+    serializer.Meta.model._meta.model_name: serializer
+    for serializer in (
+        PersonalInfoSerializer, SkillSerializer, ExperienceSerializer,
+        ProjectSerializer, CertificationSerializer, PortfolioSettingsSerializer,
+    )
+}
+
+
+def sync_horizon():
+    """Oldest version a client may still hold and receive a correct delta for"""
+    return ChangeLogCompaction.objects.aggregate(horizon=Max('horizon'))['horizon'] or 0
+
+
+def changes_since(version):
+    """
+    Net changes after ``version``: current rows for everything created or
+    updated and tombstone ids for everything deleted, grouped by model.
+
+    Returns None if compaction has discarded tombstones the client would
+    need, in which case it must reload the full portfolio.
+    """
+    if version < sync_horizon():
+        return None
+
+    events = (ChangeEvent.objects.filter(id__gt=version, model__in=SYNC_SERIALIZERS)
+              .order_by('id').values_list('id', 'model', 'object_id', 'action'))
+    latest_action = {}
+    new_version = version
+    for event_id, model, object_id, action in events:
+        latest_action[(model, object_id)] = action
+        new_version = event_id
+
+    changes = {}
+    for (model, object_id), action in latest_action.items():
+        entry = changes.setdefault(model, {'upserted': [], 'deleted': []})
+        entry['deleted' if action == 'deleted' else 'upserted'].append(object_id)
+
+    for model, entry in changes.items():
+        serializer = SYNC_SERIALIZERS[model]
+        rows = serializer.Meta.model.objects.filter(pk__in=entry['upserted'])
+        entry['upserted'] = serializer(rows, many=True).data
+
+    # Only a version that was scanned: an event committed after the query
+    # must still be newer than the cursor the client keeps
+    return {'since': version, 'version': new_version, 'changes': changes}
+
+
+def compact_change_log(tombstone_days=30):
+    """
+    Shrink the change log without changing any delta it can produce:
+    superseded events are dropped (only the newest event per row matters),
+    and tombstones older than ``tombstone_days`` are expired, which moves
+    the sync horizon forward.
+
+    Returns ``(removed, horizon)``.
+    """
+    with transaction.atomic():
+        latest_ids = (ChangeEvent.objects.values('model', 'object_id')
+                      .annotate(latest=Max('id')).values('latest'))
+        removed, _ = ChangeEvent.objects.exclude(id__in=latest_ids).delete()
+
+        # The newest event of each tenant is its current version and always survives
+        versions = ChangeEvent.objects.values('tenant').annotate(latest=Max('id')).values('latest')
+        expired = ChangeEvent.objects.filter(
+            action='deleted', created_at__lt=timezone.now() - timedelta(days=tombstone_days)
+        ).exclude(id__in=versions)
+        horizon = expired.aggregate(horizon=Max('id'))['horizon']
+        if horizon is not None:
+            removed += expired.delete()[0]
+
+        if removed:
+            ChangeLogCompaction.objects.create(horizon=horizon or sync_horizon(), removed=removed)
+    return removed, sync_horizon()
@@ -0,0 +1,313 @@
+"""
+Response compression.
+
+``CompressionMiddleware`` negotiates brotli or gzip from ``Accept-Encoding``
+and compresses textual bodies above ``COMPRESSION_MIN_SIZE``. Streaming
+responses are compressed chunk by chunk. Bodies served by
+:func:`portfolio.cache.cached_view` carry their cache key, so their
+compressed form is stored next to them and reused: a cached payload is
+compressed once per content version rather than once per request.
+
+brotli is optional; without it only gzip is offered. Bytes in/out and the
+CPU time spent compressing are counted per encoding and reported on each
+buffered response in a ``Server-Timing`` header.
+"""
+import secrets
+import struct
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.crypto import get_random_string
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+BROTLI = 'br'
+GZIP = 'gzip'
+
+# Per-request quality favours latency; cached bodies are compressed once, so
+# they get the best ratio the encoder offers
+BROTLI_QUALITY = 5
+BROTLI_CACHED_QUALITY = 11
+GZIP_LEVEL = 6
+
+# Same BREACH mitigation as django.middleware.gzip for per-request gzip
+MAX_RANDOM_BYTES = 100
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/javascript', 'application/xml',
+    'application/manifest+json', 'image/svg+xml',
+)
+
+# Attribute set by cached_view: (cache alias, cache key, timeout)
+PRECOMPRESSED_ATTR = 'precompressed_cache'
+
+
+def min_size():
+    return getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+
+def supported_encodings():
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate_encoding(accept_encoding, offered=None):
+    """
+    Pick the best of ``offered`` for an ``Accept-Encoding`` header, or None.
+
+    Higher q-values win; ties go to the earlier offer (brotli before gzip).
+    ``*`` covers any encoding not listed explicitly.
+    """
+    offered = offered or supported_encodings()
+    weights = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    wildcard = weights.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type):
+    media = content_type.split(';', 1)[0].strip().lower()
+    return (media.startswith('text/') and media != 'text/event-stream'
+            or media in COMPRESSIBLE_TYPES
+            or media.endswith(('+json', '+xml')))
+
+
+def compress(content, encoding, cached=False):
+    """Compress a whole body; ``cached`` bodies are public and compressed for reuse"""
+    if encoding == BROTLI:
+        quality = BROTLI_CACHED_QUALITY if cached else BROTLI_QUALITY
+        return brotli.compress(content, quality=quality)
+    if cached:
+        return compress_string(content)
+    return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+class StreamEncoder:
+    """Incremental encoder for one streaming response"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # Raw deflate framed by hand, so the header can carry the same
+            # random-length filename padding as compress_string()
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self._crc = 0
+        self.started = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_time = 0.0
+
+    @staticmethod
+    def gzip_header():
+        filename = get_random_string(secrets.randbelow(MAX_RANDOM_BYTES) + 1).encode()
+        # magic, deflate, FNAME flag, mtime 0, no extra flags, unknown OS
+        return b'\x1f\x8b\x08\x08' + b'\x00' * 4 + b'\x00\xff' + filename + b'\x00'
+
+    def _run(self, operation, *args):
+        started = time.thread_time()
+        data = operation(*args)
+        self.cpu_time += time.thread_time() - started
+        self.bytes_out += len(data)
+        return data
+
+    def feed(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        self.bytes_in += len(chunk)
+        if self.encoding == BROTLI:
+            return self._run(self._compressor.process, chunk)
+        self._crc = zlib.crc32(chunk, self._crc)
+        data = self._run(self._compressor.compress, chunk)
+        if not self.started:
+            self.started = True
+            header = self.gzip_header()
+            self.bytes_out += len(header)
+            data = header + data
+        return data
+
+    def finish(self):
+        if self.encoding == BROTLI:
+            data = self._run(self._compressor.finish)
+        else:
+            data = self.feed(b'') if not self.started else b''
+            data += self._run(self._compressor.flush)
+            trailer = struct.pack('<II', self._crc, self.bytes_in & 0xffffffff)
+            self.bytes_out += len(trailer)
+            data += trailer
+        stats.record(self.encoding, self.bytes_in, self.bytes_out, self.cpu_time, streamed=True)
+        return data
+
+    def wrap(self, iterator):
+        for chunk in iterator:
+            data = self.feed(chunk)
+            if data:
+                yield data
+        yield self.finish()
+
+    async def awrap(self, iterator):
+        async for chunk in iterator:
+            data = self.feed(chunk)
+            if data:
+                yield data
+        yield self.finish()
+
+
+class CompressionStats:
+    """Thread-safe per-encoding byte and CPU-time counters for this worker"""
+
+    FIELDS = ('responses', 'streamed', 'cache_reuses', 'bytes_in', 'bytes_out', 'cpu_time')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._counts = {}
+
+    def _bucket(self, encoding):
+        return self._counts.setdefault(encoding, dict.fromkeys(self.FIELDS, 0))
+
+    def record(self, encoding, bytes_in, bytes_out, cpu_time, streamed=False):
+        with self._lock:
+            bucket = self._bucket(encoding)
+            bucket['responses'] += 1
+            bucket['streamed'] += int(streamed)
+            bucket['bytes_in'] += bytes_in
+            bucket['bytes_out'] += bytes_out
+            bucket['cpu_time'] += cpu_time
+
+    def record_reuse(self, encoding, bytes_in, bytes_out):
+        with self._lock:
+            bucket = self._bucket(encoding)
+            bucket['responses'] += 1
+            bucket['cache_reuses'] += 1
+            bucket['bytes_in'] += bytes_in
+            bucket['bytes_out'] += bytes_out
+
+    def snapshot(self):
+        with self._lock:
+            data = {encoding: dict(bucket) for encoding, bucket in self._counts.items()}
+        for bucket in data.values():
+            bucket['ratio'] = round(bucket['bytes_in'] / bucket['bytes_out'], 2) if bucket['bytes_out'] else 0.0
+            bucket['cpu_ms'] = round(bucket.pop('cpu_time') * 1000, 3)
+        return data
+
+
+stats = CompressionStats()
+
+
+def server_timing(encoding, bytes_in, bytes_out, cpu_time):
+    ratio = bytes_in / bytes_out if bytes_out else 0.0
+    return f'compress;dur={cpu_time * 1000:.3f};desc="{encoding} {ratio:.1f}x"'
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses the client accepts in br or gzip.
+
+    Skipped for non-2xx or partial responses, bodies that are already
+    encoded or not textual, responses marked ``no-transform``, bodies
+    smaller than ``COMPRESSION_MIN_SIZE`` and event streams (which must
+    reach the client one event at a time).
+    """
+
+    def process_response(self, request, response):
+        if not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        if not is_compressible(response.get('Content-Type', '')):
+            return response
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return response
+        if not response.streaming and len(response.content) < min_size():
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        offered = supported_encodings()
+        if response.get('Content-Type', '').startswith('text/html'):
+            # Pages can carry CSRF tokens; only gzip has the random-padding
+            # BREACH mitigation, so HTML is never sent as brotli
+            offered = (GZIP,)
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), offered)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            self.compress_stream(response, encoding)
+        elif not self.compress_content(response, encoding):
+            return response
+
+        # A strong ETag no longer matches the encoded bytes (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def compress_stream(self, response, encoding):
+        encoder = StreamEncoder(encoding)
+        if response.is_async:
+            response.streaming_content = encoder.awrap(response.streaming_content)
+        else:
+            response.streaming_content = encoder.wrap(response.streaming_content)
+        # The compressed size is unknown until the stream ends
+        del response.headers['Content-Length']
+
+    def compress_content(self, response, encoding):
+        """Replace the body with its compressed form; False if that would not help"""
+        content = response.content
+        precompressed = getattr(response, PRECOMPRESSED_ATTR, None)
+        compressed = None
+        if precompressed is not None:
+            alias, key, timeout = precompressed
+            cache = caches[alias]
+            key = f'{key}:{encoding}'
+            compressed = cache.get(key)
+            if compressed is not None:
+                stats.record_reuse(encoding, len(content), len(compressed))
+                response['Server-Timing'] = server_timing(encoding, len(content), len(compressed), 0.0)
+
+        if compressed is None:
+            started = time.thread_time()
+            compressed = compress(content, encoding, cached=precompressed is not None)
+            cpu_time = time.thread_time() - started
+            stats.record(encoding, len(content), len(compressed), cpu_time)
+            response['Server-Timing'] = server_timing(encoding, len(content), len(compressed), cpu_time)
+            if precompressed is not None:
+                cache.set(key, compressed, timeout)
+
+        if len(compressed) >= len(content):
+            return False
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        return True
@@ -0,0 +1,168 @@
+"""
+Maintained inbox counters for ContactMessage.
+
+Counts are kept in InboxCounter rows and adjusted with single UPSERT
+statements inside the writing transaction, so reading them is a primary-key
+lookup whatever the size of the inbox. Keys are prefixed with the tenant
+id (``<tenant>:unread``). ``reconcile_counters`` rebuilds them from scratch
+should they ever drift.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .changes import record_changes
+from .models import ContactMessage, InboxCounter
+from .tenants import current_tenant_or_default
+
+TOTAL = 'total'
+UNREAD = 'unread'
+
+
+def day_key(day):
+    return f'day:{day.isoformat()}'
+
+
+def scoped(tenant_id, counts):
+    """Prefix each counter name in ``{name: value}`` with the tenant id"""
+    return {f'{tenant_id}:{name}': value for name, value in counts.items()}
+
+
+_pending = threading.local()
+
+
+@contextmanager
+def batched():
+    """Accumulate counter adjustments made inside the block into one statement"""
+    if getattr(_pending, 'deltas', None) is not None:
+        yield  # Nested: the outermost block flushes
+        return
+    _pending.deltas = defaultdict(int)
+    try:
+        yield
+        deltas, _pending.deltas = _pending.deltas, None
+        adjust(deltas)
+    finally:
+        _pending.deltas = None
+
+
+def adjust(deltas):
+    """Add each ``{key: delta}`` to its counter in one statement"""
+    pending = getattr(_pending, 'deltas', None)
+    if pending is not None:
+        for key, delta in deltas.items():
+            pending[key] += delta
+        return
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = connection.ops.quote_name(InboxCounter._meta.db_table)
+    values = ', '.join(['(%s, %s)'] * len(deltas))
+    params = [item for pair in deltas.items() for item in pair]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (key, value) VALUES {values} '
+            f'ON CONFLICT (key) DO UPDATE SET value = {table}.value + excluded.value',
+            params,
+        )
+
+
+def message_created(message):
+    adjust(scoped(message.tenant_id, {
+        TOTAL: 1,
+        UNREAD: 0 if message.is_read else 1,
+        day_key(timezone.localdate(message.created_at)): 1,
+    }))
+    message._loaded_is_read = message.is_read
+
+
+def message_saved(message):
+    """Account for a read-state change made through ``save()``"""
+    previous = getattr(message, '_loaded_is_read', None)
+    if previous is not None and previous != message.is_read:
+        adjust(scoped(message.tenant_id, {UNREAD: -1 if message.is_read else 1}))
+    message._loaded_is_read = message.is_read
+
+
+def message_deleted(message):
+    adjust(scoped(message.tenant_id, {
+        TOTAL: -1,
+        UNREAD: 0 if message.is_read else -1,
+        day_key(timezone.localdate(message.created_at)): -1,
+    }))
+
+
+def set_read_state(queryset, is_read):
+    """Mark messages read/unread with one UPDATE and one counter UPSERT"""
+    with transaction.atomic():
+        rows = list(queryset.filter(is_read=not is_read).values_list('pk', 'tenant_id'))
+        ids = [pk for pk, _ in rows]
+        changed = ContactMessage.all_tenants.filter(pk__in=ids).update(is_read=is_read)
+        per_tenant = defaultdict(int)
+        for _, tenant_id in rows:
+            per_tenant[f'{tenant_id}:{UNREAD}'] += -1 if is_read else 1
+        adjust(per_tenant)
+        record_changes(ContactMessage, ids, 'updated')
+    return changed
+
+
+def get_total(tenant_id=None):
+    """Number of messages in a tenant's inbox (default: the current tenant), from one primary-key lookup"""
+    tenant_id = current_tenant_or_default() if tenant_id is None else tenant_id
+    counter = InboxCounter.objects.filter(key=f'{tenant_id}:{TOTAL}').values_list('value', flat=True).first()
+    return counter or 0
+
+
+def get_stats(days=30, tenant_id=None):
+    """Totals plus per-day counts for the last ``days`` days, without touching ContactMessage"""
+    tenant_id = current_tenant_or_default() if tenant_id is None else tenant_id
+    prefix = f'{tenant_id}:'
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    counters = {
+        key[len(prefix):]: value
+        for key, value in InboxCounter.objects.filter(
+            Q(key__in=[prefix + TOTAL, prefix + UNREAD])
+            | Q(key__gte=prefix + day_key(first_day), key__lte=prefix + day_key(today))
+        ).values_list('key', 'value')
+    }
+    total = counters.get(TOTAL, 0)
+    unread = counters.get(UNREAD, 0)
+    return {
+        'total': total,
+        'unread': unread,
+        'read': total - unread,
+        'daily': [
+            {'date': day.isoformat(), 'count': counters.get(day_key(day), 0)}
+            for day in (first_day + timedelta(days=n) for n in range(days))
+        ],
+    }
+
+
+def reconcile_counters(message_model=ContactMessage, counter_model=InboxCounter):
+    """Recompute every counter of every tenant from the message table; returns the new values"""
+    messages = message_model._base_manager.all()
+    counts = {}
+    with transaction.atomic():
+        # Deleting first takes the write lock, so no message can be written
+        # (and counted) between the aggregation and the new rows
+        counter_model.objects.all().delete()
+        totals = messages.values('tenant_id').annotate(
+            total=Count('id'), unread=Count('id', filter=Q(is_read=False))
+        )
+        for row in totals:
+            counts.update(scoped(row['tenant_id'], {TOTAL: row['total'], UNREAD: row['unread']}))
+        per_day = (messages.annotate(day=TruncDate('created_at'))
+                   .values('tenant_id', 'day').annotate(count=Count('id')))
+        for row in per_day:
+            counts[f'{row["tenant_id"]}:{day_key(row["day"])}'] = row['count']
+        counter_model.objects.bulk_create(
+            counter_model(key=key, value=value) for key, value in counts.items()
+        )
+    return counts
@@ -0,0 +1,70 @@
+"""
+Dashboard aggregates computed in the database.
+
+Each model is summarized by at most one grouped query, and the result is
+cached until the tenant's content next changes, so dashboards get their
+numbers without any row being fetched or serialized.
+"""
+from django.core.cache import cache
+from django.db.models import Avg, Count, Min, Q
+
+from .changes import change_token, current_version
+from .models import Skill, Experience, Project, Certification, ProjectTechnology
+from .tenants import tenant_key
+
+TOP_TECHNOLOGIES = 10
+
+
+def compute_facets():
+    skill_rows = Skill.objects.values('category').annotate(count=Count('id'), avg_proficiency=Avg('proficiency'))
+    skills = {key: {'count': 0, 'avg_proficiency': None} for key, _ in Skill.SKILL_CATEGORIES}
+    for row in skill_rows:
+        skills[row['category']] = {
+            'count': row['count'],
+            'avg_proficiency': round(row['avg_proficiency'], 1) if row['avg_proficiency'] is not None else None,
+        }
+
+    projects = Project.objects.aggregate(
+        total=Count('id'),
+        featured=Count('id', filter=Q(is_featured=True)),
+        with_live_url=Count('id', filter=Q(live_url__isnull=False) & ~Q(live_url='')),
+    )
+    projects['not_featured'] = projects['total'] - projects['featured']
+
+    technologies = list(
+        ProjectTechnology.objects.values('normalized')
+        .annotate(count=Count('project'), name=Min('name'))
+        .order_by('-count', 'normalized')[:TOP_TECHNOLOGIES]
+    )
+
+    experience = list(Experience.objects.values('company').annotate(count=Count('id')).order_by('-count', 'company'))
+
+    issuers = list(
+        Certification.objects.values('issuer').annotate(count=Count('id')).order_by('-count', 'issuer')
+    )
+
+    return {
+        'skills': {
+            'total': sum(facet['count'] for facet in skills.values()),
+            'by_category': skills,
+        },
+        'projects': {**projects, 'top_technologies': technologies},
+        'experience': {
+            'total': sum(row['count'] for row in experience),
+            'by_company': experience,
+        },
+        'certifications': {
+            'total': sum(row['count'] for row in issuers),
+            'by_issuer': [{'issuer': row['issuer'] or None, 'count': row['count']} for row in issuers],
+        },
+    }
+
+
+def get_facets():
+    """Facets for the current tenant's content, computed at most once per change"""
+    key = tenant_key(f'facets:{change_token()}')
+    facets = cache.get(key)
+    if facets is None:
+        facets = {'version': current_version(), **compute_facets()}
+        cache.set(key, facets)
+    return facets
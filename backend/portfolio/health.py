@@ -0,0 +1,166 @@
+"""
+Liveness and readiness probes.
+
+Liveness only proves the worker can answer. Readiness exercises what a
+request needs: a database round trip, a write lock on the SQLite file, its
+integrity, applied migrations, the cache, and free disk under
+``MEDIA_ROOT``. It also reports the live-stream backlog.
+
+Results are memoized in-process for ``HEALTH_CACHE_TTL`` seconds and
+concurrent probes wait for a single run, so a probe storm costs one round
+of checks per worker per TTL. They are deliberately not kept in the Django
+cache, which is one of the things being checked. The integrity check reads
+the whole file and is rerun only every ``HEALTH_INTEGRITY_INTERVAL``
+seconds.
+"""
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+_lock = threading.Lock()
+_last = None  # (monotonic time, report)
+_integrity = None  # (monotonic time, result)
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def check_database():
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    return {}
+
+
+def sqlite_path():
+    database = settings.DATABASES[DEFAULT_DB_ALIAS]
+    if database['ENGINE'] != 'django.db.backends.sqlite3':
+        return None
+    return str(database['NAME'])
+
+
+def check_database_writable():
+    """A locked database serves reads but stalls every write"""
+    path = sqlite_path()
+    if path is None:
+        return {'skipped': 'not SQLite'}
+    probe = sqlite3.connect(path, timeout=settings.HEALTH_DB_LOCK_TIMEOUT, isolation_level=None)
+    try:
+        probe.execute('BEGIN IMMEDIATE')
+        probe.execute('ROLLBACK')
+    except sqlite3.OperationalError as e:
+        raise CheckFailed(str(e))
+    finally:
+        probe.close()
+    return {}
+
+
+def check_database_integrity():
+    global _integrity
+    path = sqlite_path()
+    if path is None:
+        return {'skipped': 'not SQLite'}
+    now = time.monotonic()
+    if _integrity is None or now - _integrity[0] >= settings.HEALTH_INTEGRITY_INTERVAL:
+        probe = sqlite3.connect(path, timeout=settings.HEALTH_DB_LOCK_TIMEOUT)
+        try:
+            result = probe.execute('PRAGMA quick_check(1)').fetchone()[0]
+        finally:
+            probe.close()
+        _integrity = (now, result)
+    age = round(now - _integrity[0], 1)
+    if _integrity[1] != 'ok':
+        raise CheckFailed(f'quick_check: {_integrity[1]} ({age} s ago)')
+    return {'checked_seconds_ago': age}
+
+
+def check_migrations():
+    connection = connections[DEFAULT_DB_ALIAS]
+    executor = MigrationExecutor(connection)
+    pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if pending:
+        raise CheckFailed(f'{len(pending)} unapplied migration(s)')
+    return {}
+
+
+def check_cache():
+    cache = caches['default']
+    key = f'health:{os.getpid()}:{threading.get_ident()}'
+    token = time.time()
+    cache.set(key, token, 30)
+    if cache.get(key) != token:
+        raise CheckFailed('value written was not read back')
+    return {}
+
+
+def check_disk():
+    path = str(settings.MEDIA_ROOT)
+    while not os.path.exists(path):  # MEDIA_ROOT is created on first upload
+        path = os.path.dirname(path)
+    free = shutil.disk_usage(path).free
+    details = {'free_bytes': free, 'min_free_bytes': settings.HEALTH_MIN_FREE_DISK}
+    if free < settings.HEALTH_MIN_FREE_DISK:
+        raise CheckFailed(f'{free} bytes free on {path}')
+    return details
+
+
+def check_stream():
+    """Live-stream fan-out backlog; reported, never failing readiness"""
+    from .stream import QUEUE_SIZE, broadcaster
+
+    depths = [subscriber.queue.qsize() for subscriber in tuple(broadcaster.subscribers)]
+    return {'subscribers': len(depths), 'max_queue_depth': max(depths, default=0), 'queue_size': QUEUE_SIZE}
+
+
+CHECKS = (
+    ('database', check_database),
+    ('database_writable', check_database_writable),
+    ('database_integrity', check_database_integrity),
+    ('migrations', check_migrations),
+    ('cache', check_cache),
+    ('disk', check_disk),
+    ('stream', check_stream),
+)
+
+
+def run_checks():
+    checks = {}
+    for name, check in CHECKS:
+        started = time.perf_counter()
+        try:
+            result = {'status': 'ok', **check()}
+        except Exception as e:
+            result = {'status': 'fail', 'error': str(e) or e.__class__.__name__}
+        result['duration_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        checks[name] = result
+    ready = all(result['status'] == 'ok' for result in checks.values())
+    return {
+        'status': 'ready' if ready else 'unavailable',
+        'checked_at': timezone.now().isoformat(),
+        'checks': checks,
+    }
+
+
+def readiness():
+    """``(report, cached)``; checks run at most once per ``HEALTH_CACHE_TTL`` per process"""
+    global _last
+    last = _last
+    if last is not None and time.monotonic() - last[0] < settings.HEALTH_CACHE_TTL:
+        return last[1], True
+    with _lock:
+        # Probes that queued behind a run take its result
+        last = _last
+        if last is not None and time.monotonic() - last[0] < settings.HEALTH_CACHE_TTL:
+            return last[1], True
+        report = run_checks()
+        _last = (time.monotonic(), report)
+        return report, False
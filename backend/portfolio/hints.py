@@ -0,0 +1,133 @@
+"""
+Resource hints for the frontend entry page.
+
+The served ``index.html`` is parsed once per version of the file (when it
+is published, or first served after a restart) to find the stylesheets,
+scripts and images the browser will need. ``serve_frontend`` sends them as
+``Link: rel=preload`` headers, and under ASGI servers that implement the
+``http.response.early_hint`` extension :class:`EarlyHintsMiddleware` sends
+the same links in a 103 Early Hints response before Django runs at all.
+"""
+import os
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.encoding import iri_to_uri
+
+from .cache import CacheStats, LRUStore
+from .publish import INDEX_FILENAME, INLINE_SCRIPT_ID, published_path
+
+EARLY_HINT_EXTENSION = 'http.response.early_hint'
+
+
+class ResourceParser(HTMLParser):
+    """Collect ``(url, destination)`` for render-critical sub-resources, in document order"""
+
+    def __init__(self):
+        super().__init__()
+        self.resources = []
+        self.has_inline_data = False
+
+    def add(self, url, destination):
+        if url and not url.startswith(('data:', 'blob:', '#')) and (url, destination) not in self.resources:
+            self.resources.append((url, destination))
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'stylesheet' in rel:
+                self.add(attrs.get('href'), 'style')
+            elif 'preload' in rel and attrs.get('as'):
+                self.add(attrs.get('href'), attrs['as'])
+        elif tag == 'script':
+            if attrs.get('src'):
+                self.add(attrs['src'], 'script')
+            elif attrs.get('id') == INLINE_SCRIPT_ID:
+                self.has_inline_data = True
+        elif tag == 'img':
+            self.add(attrs.get('src'), 'image')
+
+
+def format_link(url, destination):
+    link = f'<{iri_to_uri(url)}>; rel=preload; as={destination}'
+    if urlsplit(url).netloc:
+        link += '; crossorigin'
+    return link
+
+
+def build_links(html, base_url, data_url):
+    """Link header values for a page; the data endpoint is preloaded unless the page inlines it"""
+    parser = ResourceParser()
+    parser.feed(html.decode('utf-8', errors='replace'))
+    parser.close()
+    links = [format_link(urljoin(base_url, url), destination) for url, destination in parser.resources]
+    if parser.has_inline_data:
+        # Not needed for first render; fetched at idle priority for later refreshes
+        links.append(f'<{data_url}>; rel=prefetch')
+    else:
+        links.append(f'<{data_url}>; rel=preload; as=fetch; crossorigin')
+    return tuple(links)
+
+
+def entry_page_path():
+    """The page serve_frontend returns: the published copy, else the bare template"""
+    return published_path(INDEX_FILENAME) or os.path.join(settings.FRONTEND_ROOT, INDEX_FILENAME)
+
+
+# One entry per published page (a page per tenant) and URL prefix; bounded
+# so that memory does not grow with the number of tenants
+_parsed = LRUStore(1024, CacheStats())
+
+
+def page_links(path):
+    """Link values for the page at ``path``, parsed again only when the file changes"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    # URLs differ under a /t/<slug>/ prefix
+    base_url, data_url = reverse('frontend'), reverse('portfolio-data')
+    found, cached = _parsed.get((path, base_url))
+    if found and cached[0] == signature:
+        return cached[1]
+    with open(path, 'rb') as page:
+        links = build_links(page.read(), base_url, data_url)
+    _parsed.set((path, base_url), (signature, links), None)
+    return links
+
+
+def entry_links():
+    return page_links(entry_page_path())
+
+
+class EarlyHintsMiddleware:
+    """
+    ASGI wrapper sending ``103 Early Hints`` for the frontend entry page.
+
+    Does nothing unless the server advertises the early-hint extension in
+    the connection scope; the Link headers on the final response still
+    apply either way. It runs before the tenant is resolved, so hints are
+    only sent for the unprefixed entry page, using the default tenant's
+    copy; other tenants' copies link the same frontend assets.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._entry_path = None
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] == 'http' and scope.get('method') == 'GET'
+                and EARLY_HINT_EXTENSION in scope.get('extensions', {})):
+            if self._entry_path is None:
+                self._entry_path = reverse('frontend')
+            if scope['path'] == scope.get('root_path', '') + self._entry_path:
+                # A stat() and a dict lookup once parsed; cheap enough inline
+                links = entry_links()
+                if links:
+                    await send({'type': EARLY_HINT_EXTENSION,
+                                'links': [link.encode('latin-1') for link in links]})
+        await self.app(scope, receive, send)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.archive import archive_messages, archive_root
+from portfolio.tenants import each_tenant
+
+
+class Command(BaseCommand):
+    help = 'Move old contact messages into compressed archive segments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int, default=180,
+            help='Archive messages received more than this many days ago (default: 180)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Messages per archive segment (default: 1000)'
+        )
+        parser.add_argument('--tenant', help='Slug of the portfolio to archive (default: all)')
+
+    def handle(self, *args, **options):
+        tenants = 0
+        for tenant in each_tenant(options['tenant']):
+            tenants += 1
+            moved = archive_messages(options['older_than_days'], options['batch_size'])
+            if moved:
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ Archived {moved} messages of {tenant.slug} to {archive_root()}'
+                ))
+        if not tenants:
+            raise CommandError(f'No tenant with slug "{options["tenant"]}"')
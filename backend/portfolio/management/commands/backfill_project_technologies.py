@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from portfolio.technologies import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the technology index from every Project.tech_stack'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            added, removed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Technology index rebuilt: {added} rows added, {removed} removed'
+        ))
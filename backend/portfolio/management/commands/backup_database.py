@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.backup import BackupError, backup_database
+
+
+class Command(BaseCommand):
+    help = 'Back up the live database without blocking the site (run periodically, e.g. hourly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Store a full copy and start a new chain instead of an incremental backup'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            meta = backup_database(full=options['full'])
+        except BackupError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {meta["kind"].capitalize()} backup {meta["id"]}: {meta["changed_pages"]} of '
+            f'{meta["page_count"]} pages, {meta["stored_bytes"]} bytes stored in {meta["duration_ms"]:.0f} ms'
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.changes import compact_change_log
+
+
+class Command(BaseCommand):
+    help = 'Compact the change log used by delta sync (run periodically, e.g. daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tombstone-days', type=int, default=30,
+            help='Keep deletion tombstones for this many days (default: 30)'
+        )
+
+    def handle(self, *args, **options):
+        removed, horizon = compact_change_log(options['tombstone_days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Removed {removed} change events; clients older than v{horizon} will do a full refresh'
+        ))
@@ -0,0 +1,76 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+PROJECT_PACKAGES = ('portfolio', 'portfolio_backend')
+
+# What a fresh worker imports before it can answer its first request
+STARTUP_SCRIPT = (
+    'import django; django.setup(); '
+    'from django.urls import get_resolver; get_resolver().url_patterns'
+)
+
+
+class Command(BaseCommand):
+    help = 'Profile module import time of a fresh worker and check it against a budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=1000,
+                            help='Fail if total startup import time exceeds this (default: 1000)')
+        parser.add_argument('--module-budget-ms', type=float, default=30,
+                            help='Flag project modules whose own code takes longer than this to '
+                                 'import, not counting Django or other libraries (default: 30)')
+        parser.add_argument('--top', type=int, default=15,
+                            help='Number of most expensive modules to list (default: 15)')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            capture_output=True, text=True, env=env,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+
+        modules = []
+        # -X importtime lists a module after everything it imported, one level
+        # deeper; project_ms sums the own time of project modules in its subtree
+        children_project_ms = {}
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                depth = len(indent) // 2
+                project_ms = children_project_ms.pop(depth + 1, 0)
+                if name.split('.')[0] in PROJECT_PACKAGES:
+                    project_ms += int(self_us) / 1000
+                children_project_ms[depth] = children_project_ms.get(depth, 0) + project_ms
+                modules.append((name, int(self_us) / 1000, int(cumulative_us) / 1000, depth, project_ms))
+
+        # Top-level entries (depth 0) add up to the whole import phase
+        total_ms = sum(cumulative for _, _, cumulative, depth, _ in modules if depth == 0)
+
+        self.stdout.write(f'Top {options["top"]} modules by own import time:')
+        for name, self_ms, cumulative_ms, _, _ in sorted(modules, key=lambda m: -m[1])[:options['top']]:
+            self.stdout.write(f'  {self_ms:8.1f} ms self {cumulative_ms:9.1f} ms cumulative  {name}')
+
+        # Cumulative time would charge a project module for the libraries it
+        # happens to import first, which the URLconf needs anyway
+        over_budget = [
+            (name, project_ms) for name, _, _, _, project_ms in modules
+            if name.split('.')[0] in PROJECT_PACKAGES and project_ms > options['module_budget_ms']
+        ]
+        for name, project_ms in over_budget:
+            self.stdout.write(self.style.WARNING(
+                f'  ! {name} takes {project_ms:.1f} ms of project code '
+                f'(module budget {options["module_budget_ms"]:.0f} ms)'
+            ))
+
+        summary = f'Total startup import time: {total_ms:.1f} ms (budget {options["budget_ms"]:.0f} ms)'
+        if total_ms > options['budget_ms']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(f'✓ {summary}'))
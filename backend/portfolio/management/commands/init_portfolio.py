@@ -1,25 +1,32 @@
 from django.core.management.base import BaseCommand
-from portfolio.models import PersonalInfo, Skill, Experience, Project, Certification
+from portfolio.models import Tenant, PersonalInfo, Skill, Experience, Project, Certification
+from portfolio.tenants import use_tenant
 
 
 class Command(BaseCommand):
     help = 'Initialize portfolio with default data from your current portfolio'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', default='default',
+                            help='Slug of the portfolio to initialize, created if missing (default: default)')
+        parser.add_argument('--domain', help='Host name to serve a newly created portfolio on')
+
     def handle(self, *args, **options):
+        tenant, created = Tenant.objects.get_or_create(
+            slug=options['tenant'],
+            defaults={'name': PersonalInfo.DEFAULTS['name'], 'domain': options['domain'] or None}
+        )
+        if created:
+            self.stdout.write(self.style.SUCCESS(f'✓ Tenant {tenant.slug} created'))
+        with use_tenant(tenant):
+            self.initialize()
+
+    def initialize(self):
         self.stdout.write('Initializing portfolio with default data...')
 
         # Create personal info
         personal_info, created = PersonalInfo.objects.get_or_create(
-            pk=1,
-            defaults={
-                'name': 'Mada Nithish Reddy',
-                'title': 'Computer Science Engineer',
-                'email': 'madanithishreddy@gmail.com',
-                'phone': '+91 9704715088',
-                'github': 'https://github.com/Nithish6606',
-                'linkedin': 'https://linkedin.com/in/nithish-mada',
-                'bio': 'Recent BTech Computer Science graduate passionate about web development, machine learning, and creating innovative solutions to real-world problems.',
-            }
+            defaults=PersonalInfo.DEFAULTS
         )
         
         if created:
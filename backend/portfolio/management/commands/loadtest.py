@@ -0,0 +1,383 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+LOCKED_MARKER = b'database is locked'
+
+ASSETS = ('style.css', 'app-django.js', 'env-config.js', 'profile.jpg')
+
+# Child process serving the project; server errors (with tracebacks) go to
+# stderr so lock contention shows up even with DEBUG off
+SERVER_SCRIPT = '''
+import logging, sys
+port = int(sys.argv[2])
+logging.getLogger('django.request').addHandler(logging.StreamHandler(sys.stderr))
+if sys.argv[1] == 'wsgi':
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+    from portfolio_backend.wsgi import application
+
+    class Server(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+        request_queue_size = 1024
+
+    class Handler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    make_server('127.0.0.1', port, application, Server, Handler).serve_forever()
+else:
+    import uvicorn
+    uvicorn.run('portfolio_backend.asgi:application', host='127.0.0.1', port=port,
+                log_level='warning', access_log=False)
+'''
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def parse_mix(value):
+    """``data=70,asset=20,contact=5,admin=5`` -> ``{'data': 70, ...}``"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in REQUEST_KINDS:
+            raise CommandError(f'Unknown request kind "{name}" (choose from {", ".join(REQUEST_KINDS)})')
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise CommandError(f'Invalid weight for "{name}": {weight!r}')
+    if not any(weight > 0 for weight in mix.values()):
+        raise CommandError('The request mix needs at least one positive weight')
+    return mix
+
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 client over asyncio streams"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=(), body=b''):
+        """Return ``(status, body)``; reconnects once if a kept-alive socket was closed"""
+        for attempt in (1, 2):
+            fresh = self.writer is None
+            if fresh:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}',
+                     f'Content-Length: {len(body)}', *headers]
+            self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+            try:
+                await self.writer.drain()
+                status_line = await self.reader.readline()
+            except ConnectionError:
+                status_line = b''
+            if status_line:
+                break
+            await self.close()
+            if fresh or attempt == 2:
+                raise ConnectionError('Server closed the connection without a response')
+
+        version, status = status_line.split(b' ', 2)[:2]
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            content = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            content = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            content = await self.reader.read()
+            await self.close()
+
+        if version == b'HTTP/1.0' or response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return int(status), content
+
+
+def data_request(context):
+    return 'GET', '/api/portfolio-data/', ['Accept: application/json', 'Accept-Encoding: gzip, br'], b''
+
+
+def asset_request(context):
+    return 'GET', f'/portfolio/{random.choice(ASSETS)}', ['Accept-Encoding: gzip, br'], b''
+
+
+def contact_request(context):
+    body = json.dumps({
+        'name': 'Load Test',
+        'email': 'loadtest@example.com',
+        'subject': f'Load test {random.getrandbits(32):08x}',
+        'message': 'Generated by manage.py loadtest.',
+    }).encode()
+    return 'POST', '/api/contact-messages/', ['Content-Type: application/json'], body
+
+
+def admin_request(context):
+    # Rewrites the current title: a full save, change event and republish
+    body = json.dumps({'title': context['title']}).encode()
+    return ('PATCH', f'/api/personal-info/{context["personal_info_pk"]}/',
+            ['Content-Type: application/json', f'Authorization: Token {context["token"]}'], body)
+
+
+REQUEST_KINDS = {
+    'data': data_request,
+    'asset': asset_request,
+    'contact': contact_request,
+    'admin': admin_request,
+}
+
+
+class Results:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.locked = 0
+        self.connection_errors = 0
+
+    def add(self, kind, status, latency, content):
+        self.latencies[kind].append(latency)
+        self.statuses[kind][status] += 1
+        if status >= 500 and LOCKED_MARKER in content:
+            self.locked += 1
+
+    def summary(self, elapsed, server_locked):
+        kinds = {}
+        for kind, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            statuses = self.statuses[kind]
+            count = len(latencies)
+            kinds[kind] = {
+                'requests': count,
+                'throughput': round(count / elapsed, 1),
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+                'p90_ms': round(percentile(latencies, 0.90) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'max_ms': round(latencies[-1] * 1000, 2),
+                'error_rate': round(sum(n for s, n in statuses.items() if s >= 500) / count, 4),
+                'throttle_rate': round(statuses.get(429, 0) / count, 4),
+                'statuses': {str(s): n for s, n in sorted(statuses.items())},
+            }
+        everything = sorted(latency for latencies in self.latencies.values() for latency in latencies)
+        total = len(everything)
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'requests': total,
+            'throughput': round(total / elapsed, 1) if elapsed else 0.0,
+            'p50_ms': round(percentile(everything, 0.50) * 1000, 2),
+            'p90_ms': round(percentile(everything, 0.90) * 1000, 2),
+            'p99_ms': round(percentile(everything, 0.99) * 1000, 2),
+            'error_rate': round(sum(k['error_rate'] * k['requests'] for k in kinds.values()) / total, 4) if total else 0.0,
+            'throttle_rate': round(sum(k['throttle_rate'] * k['requests'] for k in kinds.values()) / total, 4) if total else 0.0,
+            'connection_errors': self.connection_errors,
+            'database_locked': max(self.locked, server_locked),
+            'kinds': kinds,
+        }
+
+
+async def run_load(host, port, mix, context, concurrency, duration, max_requests):
+    results = Results()
+    kinds, weights = zip(*mix.items())
+    deadline = time.perf_counter() + duration
+    issued = 0
+
+    async def user():
+        nonlocal issued
+        connection = HTTPConnection(host, port)
+        try:
+            while time.perf_counter() < deadline and (not max_requests or issued < max_requests):
+                issued += 1
+                kind = random.choices(kinds, weights)[0]
+                method, path, headers, body = REQUEST_KINDS[kind](context)
+                started = time.perf_counter()
+                try:
+                    status, content = await connection.request(method, path, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                    results.connection_errors += 1
+                    await connection.close()
+                    continue
+                results.add(kind, status, time.perf_counter() - started, content)
+        finally:
+            await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = ('Serve the project under a local WSGI/ASGI server and drive it with concurrent '
+            'HTTP load; writes go to the configured database, so use a disposable one')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi',
+                            help='Stack to serve: threaded wsgiref, or uvicorn for ASGI (default: wsgi)')
+        parser.add_argument('--url', help='Drive an already running server instead of starting one')
+        parser.add_argument('--concurrency', type=int, default=20,
+                            help='Simultaneous virtual users, one connection each (default: 20)')
+        parser.add_argument('--duration', type=float, default=10,
+                            help='Seconds to generate load for (default: 10)')
+        parser.add_argument('--requests', type=int, default=0,
+                            help='Stop after this many requests (default: no limit)')
+        parser.add_argument('--mix', default='data=70,asset=20,contact=5,admin=5',
+                            help='Weighted request mix (default: data=70,asset=20,contact=5,admin=5)')
+        parser.add_argument('--admin-user',
+                            help='Staff username for admin writes; without it "admin" is dropped from the mix')
+        parser.add_argument('--anon-rate', help='Override ANON_RATE_LIMIT for the started server, e.g. 100000/hour')
+        parser.add_argument('--user-rate', help='Override USER_RATE_LIMIT for the started server')
+        parser.add_argument('--seed', type=int, help='Random seed for a repeatable request sequence')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+        mix = parse_mix(options['mix'])
+        context = self.admin_context(options['admin_user']) if mix.get('admin') else {}
+        if not context:
+            mix.pop('admin', None)
+            if not any(weight > 0 for weight in mix.values()):
+                raise CommandError('Nothing left to request without --admin-user')
+
+        server, log = None, None
+        if options['url']:
+            target = urlsplit(options['url'])
+            host, port = target.hostname, target.port or 80
+        else:
+            host, port = '127.0.0.1', free_port()
+            server, log = self.start_server(options, port)
+        try:
+            results, elapsed = asyncio.run(run_load(
+                host, port, mix, context, options['concurrency'], options['duration'], options['requests']
+            ))
+        finally:
+            server_locked = 0
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+                log.seek(0)
+                server_locked = log.read().count(LOCKED_MARKER)
+                log.close()
+
+        summary = results.summary(elapsed, server_locked)
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+        else:
+            self.report(summary, options)
+
+    def admin_context(self, username):
+        if not username:
+            self.stderr.write('No --admin-user given; skipping admin writes')
+            return {}
+        from django.contrib.auth.models import User
+        from rest_framework.authtoken.models import Token
+        from portfolio.models import PersonalInfo
+
+        user = User.objects.filter(username=username, is_staff=True).first()
+        if user is None:
+            raise CommandError(f'No staff user named "{username}"')
+        personal_info = PersonalInfo.objects.order_by('pk').first()
+        if personal_info is None:
+            raise CommandError('Personal info has not been set up')
+        token, _ = Token.objects.get_or_create(user=user)
+        return {'token': token.key, 'personal_info_pk': personal_info.pk, 'title': personal_info.title}
+
+    def start_server(self, options, port):
+        if options['server'] == 'asgi':
+            try:
+                import uvicorn  # noqa: F401
+            except ImportError:
+                raise CommandError('--server asgi needs uvicorn (pip install uvicorn)')
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings'))
+        if options['anon_rate']:
+            env['ANON_RATE_LIMIT'] = options['anon_rate']
+        if options['user_rate']:
+            env['USER_RATE_LIMIT'] = options['user_rate']
+        log = tempfile.TemporaryFile()
+        server = subprocess.Popen(
+            [sys.executable, '-c', SERVER_SCRIPT, options['server'], str(port)],
+            stdout=subprocess.DEVNULL, stderr=log, env=env,
+        )
+        # Ready once the readiness probe passes (warm-up runs before that);
+        # it is never throttled, so polling it does not eat into the run
+        deadline = time.monotonic() + 30
+        while True:
+            if server.poll() is not None:
+                log.seek(0)
+                raise CommandError(f'Server exited during startup:\n{log.read().decode(errors="replace")[-2000:]}')
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health/ready/', timeout=1):
+                    break
+            except OSError:  # Includes HTTPError: 503 until every check passes
+                if time.monotonic() > deadline:
+                    server.kill()
+                    raise CommandError('Server did not become ready within 30 s')
+                time.sleep(0.1)
+        self.stdout.write(f'Serving {options["server"].upper()} on 127.0.0.1:{port}')
+        return server, log
+
+    def report(self, summary, options):
+        self.stdout.write(
+            f'{summary["requests"]} requests in {summary["elapsed_s"]} s at concurrency '
+            f'{options["concurrency"]}: {summary["throughput"]} req/s'
+        )
+        self.stdout.write(f'  {"kind":8} {"reqs":>7} {"req/s":>8} {"p50 ms":>8} {"p90 ms":>8} '
+                          f'{"p99 ms":>8} {"max ms":>8} {"5xx":>7} {"429":>7}')
+        for kind, row in sorted(summary['kinds'].items()):
+            self.stdout.write(
+                f'  {kind:8} {row["requests"]:7d} {row["throughput"]:8.1f} {row["p50_ms"]:8.2f} '
+                f'{row["p90_ms"]:8.2f} {row["p99_ms"]:8.2f} {row["max_ms"]:8.2f} '
+                f'{row["error_rate"]:7.2%} {row["throttle_rate"]:7.2%}'
+            )
+        self.stdout.write(
+            f'  overall p50 {summary["p50_ms"]} ms, p90 {summary["p90_ms"]} ms, p99 {summary["p99_ms"]} ms; '
+            f'errors {summary["error_rate"]:.2%}, throttled {summary["throttle_rate"]:.2%}, '
+            f'connection errors {summary["connection_errors"]}'
+        )
+        style = self.style.WARNING if summary['database_locked'] else self.style.SUCCESS
+        self.stdout.write(style(f'"database is locked": {summary["database_locked"]} occurrence(s)'))
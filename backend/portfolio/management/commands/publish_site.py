@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.publish import publish_root, publish_site
+from portfolio.tenants import each_tenant
+
+
+class Command(BaseCommand):
+    help = 'Render index.html and portfolio-data.json with the current portfolio data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', help='Slug of the portfolio to publish (default: all)')
+
+    def handle(self, *args, **options):
+        published = 0
+        for tenant in each_tenant(options['tenant']):
+            payload = publish_site(tenant.pk)
+            published += 1
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Published {len(payload)} bytes of portfolio data to {publish_root(tenant.pk)}'
+            ))
+        if not published:
+            raise CommandError(f'No tenant with slug "{options["tenant"]}"')
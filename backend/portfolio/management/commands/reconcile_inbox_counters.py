@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.counters import TOTAL, UNREAD, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the maintained ContactMessage counters of every tenant from the message table'
+
+    def handle(self, *args, **options):
+        counts = reconcile_counters()
+        total = sum(value for key, value in counts.items() if key.endswith(f':{TOTAL}'))
+        unread = sum(value for key, value in counts.items() if key.endswith(f':{UNREAD}'))
+        tenants = sum(1 for key in counts if key.endswith(f':{TOTAL}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Inbox counters reconciled: {total} total, {unread} unread across {tenants} tenant(s)'
+        ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.backup import BackupError, list_backups, restore
+
+
+class Command(BaseCommand):
+    help = 'Restore the database from a backup (the latest unless an id is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('backup_id', nargs='?', help='Backup to restore (default: the latest)')
+        parser.add_argument(
+            '--output', help='Write the restored database to this path instead of replacing the live one'
+        )
+        parser.add_argument('--list', action='store_true', help='List the kept backups and exit')
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false', dest='interactive',
+            help='Do not ask for confirmation before replacing the live database'
+        )
+
+    def handle(self, *args, **options):
+        backups = list_backups()
+        if options['list']:
+            for meta in backups:
+                self.stdout.write(f'{meta["id"]}  {meta["kind"]:<11}  {meta["stored_bytes"]:>10} bytes  {meta["created_at"]}')
+            return
+        if not backups:
+            raise CommandError('There are no backups to restore')
+        backup_id = options['backup_id'] or backups[0]['id']
+
+        if not options['output'] and options['interactive']:
+            answer = input(f'This replaces the live database with backup {backup_id}. Type "yes" to continue: ')
+            if answer != 'yes':
+                raise CommandError('Restore cancelled')
+        try:
+            meta = restore(backup_id, options['output'])
+        except BackupError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Restored backup {meta["id"]} to {options["output"] or "the live database"}'
+        ))
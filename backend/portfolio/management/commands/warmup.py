@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Prime imports, the database connection and caches, reporting time per step'
+
+    def handle(self, *args, **options):
+        failed = False
+        for step, elapsed_ms, error in warm_up():
+            if error is None:
+                self.stdout.write(f'✓ {step}: {elapsed_ms:.1f} ms')
+            else:
+                failed = True
+                self.stdout.write(self.style.ERROR(f'✗ {step}: {error}'))
+        if failed:
+            raise CommandError('Warm-up finished with errors')
+        self.stdout.write(self.style.SUCCESS('Warm-up completed'))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_change_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogCompaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('horizon', models.BigIntegerField(help_text='Clients holding a version below this must do a full refresh')),
+                ('removed', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-horizon'],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def seed_counters(apps, schema_editor):
+    ContactMessage = apps.get_model('portfolio', 'ContactMessage')
+    InboxCounter = apps.get_model('portfolio', 'InboxCounter')
+    aggregate = ContactMessage.objects.aggregate(
+        total=Count('id'), unread=Count('id', filter=Q(is_read=False))
+    )
+    counters = [
+        InboxCounter(key='total', value=aggregate['total']),
+        InboxCounter(key='unread', value=aggregate['unread']),
+    ]
+    per_day = (ContactMessage.objects.annotate(day=TruncDate('created_at'))
+               .values('day').annotate(count=Count('id')))
+    counters += [InboxCounter(key=f"day:{row['day'].isoformat()}", value=row['count']) for row in per_day]
+    InboxCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_change_log_compaction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxCounter',
+            fields=[
+                ('key', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
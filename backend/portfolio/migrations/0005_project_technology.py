@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_technologies(apps, schema_editor):
+    Project = apps.get_model('portfolio', 'Project')
+    ProjectTechnology = apps.get_model('portfolio', 'ProjectTechnology')
+    rows = []
+    for project in Project.objects.all():
+        seen = set()
+        for name in project.tech_stack if isinstance(project.tech_stack, list) else []:
+            name = ' '.join(str(name).split())
+            normalized = name.casefold()[:100]
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                rows.append(ProjectTechnology(project=project, name=name[:100], normalized=normalized))
+    ProjectTechnology.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_inbox_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectTechnology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Technology as written in tech_stack', max_length=100)),
+                ('normalized', models.CharField(help_text='Case-folded name used for lookups', max_length=100)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='technologies', to='portfolio.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['normalized', 'project'], name='portfolio_tech_lookup_idx')],
+                'unique_together': {('project', 'normalized')},
+            },
+        ),
+        migrations.RunPython(backfill_technologies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+DEFAULT_PERSONAL_INFO = {
+    'name': 'Mada Nithish Reddy',
+    'title': 'Computer Science Engineer',
+    'email': 'madanithishreddy@gmail.com',
+    'phone': '+91 9704715088',
+    'github': 'https://github.com/Nithish6606',
+    'linkedin': 'https://linkedin.com/in/nithish-mada',
+    'bio': 'Recent BTech Computer Science graduate passionate about web development, machine learning, and creating innovative solutions to real-world problems.',
+}
+
+
+def create_singletons(apps, schema_editor):
+    """Install the single-row defaults once, so read paths never have to create them"""
+    PersonalInfo = apps.get_model('portfolio', 'PersonalInfo')
+    PortfolioSettings = apps.get_model('portfolio', 'PortfolioSettings')
+    PersonalInfo.objects.get_or_create(pk=1, defaults=DEFAULT_PERSONAL_INFO)
+    PortfolioSettings.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_project_technology'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_singletons, migrations.RunPython.noop),
+    ]
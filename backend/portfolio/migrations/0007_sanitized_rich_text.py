@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:28
+
+from django.db import migrations, models
+
+from portfolio.validators import sanitize_html
+
+
+def backfill_clean_fields(apps, schema_editor):
+    for model_name, source, target in (('PersonalInfo', 'bio', 'bio_clean'),
+                                       ('Experience', 'description', 'description_clean'),
+                                       ('Project', 'description', 'description_clean')):
+        model = apps.get_model('portfolio', model_name)
+        rows = list(model.objects.all())
+        for row in rows:
+            setattr(row, target, sanitize_html(getattr(row, source)))
+        model.objects.bulk_update(rows, [target], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_default_singletons'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='description_clean',
+            field=models.TextField(blank=True, editable=False, help_text='description with disallowed HTML removed'),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='bio_clean',
+            field=models.TextField(blank=True, editable=False, help_text='bio with disallowed HTML removed'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='description_clean',
+            field=models.TextField(blank=True, editable=False, help_text='description with disallowed HTML removed'),
+        ),
+        migrations.RunPython(backfill_clean_fields, migrations.RunPython.noop),
+    ]
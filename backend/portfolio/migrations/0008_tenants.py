@@ -0,0 +1,134 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:36
+
+import django.db.models.deletion
+import portfolio.tenants
+from django.db import migrations, models
+
+
+def create_default_tenant(apps, schema_editor):
+    # Existing rows are assigned to tenant 1 by the AddField defaults below
+    Tenant = apps.get_model('portfolio', 'Tenant')
+    PersonalInfo = apps.get_model('portfolio', 'PersonalInfo')
+    owner = PersonalInfo.objects.order_by('pk').values_list('name', flat=True).first()
+    Tenant.objects.get_or_create(pk=1, defaults={'slug': 'default', 'name': owner or 'Default portfolio'})
+
+
+def prefix_counter_keys(apps, schema_editor):
+    InboxCounter = apps.get_model('portfolio', 'InboxCounter')
+    counters = list(InboxCounter.objects.all())
+    InboxCounter.objects.all().delete()
+    InboxCounter.objects.bulk_create(
+        InboxCounter(key=f'1:{counter.key}', value=counter.value) for counter in counters
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_sanitized_rich_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tenant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(help_text='Served under /t/<slug>/', unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('domain', models.CharField(blank=True, help_text='Host name served as this portfolio', max_length=253, null=True, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['slug'],
+            },
+        ),
+        migrations.RunPython(create_default_tenant, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='projecttechnology',
+            name='portfolio_tech_lookup_idx',
+        ),
+        migrations.AlterField(
+            model_name='inboxcounter',
+            name='key',
+            field=models.CharField(max_length=40, primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(prefix_counter_keys, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='skill',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='certification',
+            name='tenant',
+            field=models.ForeignKey(db_index=False, default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='changeevent',
+            name='tenant',
+            field=models.ForeignKey(db_index=False, default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='contactmessage',
+            name='tenant',
+            field=models.ForeignKey(db_index=False, default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='tenant',
+            field=models.ForeignKey(db_index=False, default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='tenant',
+            field=models.OneToOneField(default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='portfoliosettings',
+            name='tenant',
+            field=models.OneToOneField(default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tenant',
+            field=models.ForeignKey(db_index=False, default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='projecttechnology',
+            name='tenant',
+            field=models.ForeignKey(db_index=False, default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='tenant',
+            field=models.ForeignKey(db_index=False, default=portfolio.tenants.current_tenant_or_default, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.tenant'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='skill',
+            unique_together={('tenant', 'category', 'name')},
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['tenant', 'order', '-created_at'], name='portfolio_cert_tenant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='changeevent',
+            index=models.Index(fields=['tenant', 'id'], name='portfolio_change_tenant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['tenant', '-created_at'], name='portfolio_msg_tenant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['tenant', 'order', '-created_at'], name='portfolio_exp_tenant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['tenant', 'order', '-created_at'], name='portfolio_proj_tenant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttechnology',
+            index=models.Index(fields=['tenant', 'normalized', 'project'], name='portfolio_tech_lookup_idx'),
+        ),
+    ]
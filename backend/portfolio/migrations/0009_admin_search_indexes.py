@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:48
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_tenants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(models.F('tenant'), django.db.models.functions.comparison.Collate(models.F('name'), 'NOCASE'), name='portfolio_msg_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(models.F('tenant'), django.db.models.functions.comparison.Collate(models.F('email'), 'NOCASE'), name='portfolio_msg_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(models.F('tenant'), django.db.models.functions.comparison.Collate(models.F('subject'), 'NOCASE'), name='portfolio_msg_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(models.F('tenant'), django.db.models.functions.comparison.Collate(models.F('title'), 'NOCASE'), name='portfolio_proj_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(models.F('tenant'), django.db.models.functions.comparison.Collate(models.F('name'), 'NOCASE'), name='portfolio_skill_name_idx'),
+        ),
+    ]
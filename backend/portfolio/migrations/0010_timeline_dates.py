@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:00
+
+import portfolio.validators
+from django.db import migrations, models
+
+from portfolio.validators import parse_duration
+
+
+def backfill_dates(apps, schema_editor):
+    # Durations that cannot be parsed keep empty dates
+    Experience = apps.get_model('portfolio', 'Experience')
+    rows = list(Experience.objects.all())
+    for row in rows:
+        row.start_date, row.end_date = parse_duration(row.duration) or (None, None)
+    Experience.objects.bulk_update(rows, ['start_date', 'end_date'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='end_date',
+            field=models.DateField(blank=True, editable=False, help_text='Parsed from duration; empty for a current role', null=True),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='start_date',
+            field=models.DateField(blank=True, editable=False, help_text='Parsed from duration', null=True),
+        ),
+        migrations.AlterField(
+            model_name='experience',
+            name='duration',
+            field=models.CharField(max_length=50, validators=[portfolio.validators.validate_duration]),
+        ),
+        migrations.RunPython(backfill_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['tenant', 'issue_date'], name='portfolio_cert_issued_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['tenant', 'start_date'], name='portfolio_exp_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['tenant', 'end_date'], name='portfolio_exp_end_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_timeline_dates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='experience',
+            name='duration',
+            field=models.CharField(max_length=50),
+        ),
+    ]
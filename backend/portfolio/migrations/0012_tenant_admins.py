@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def bind_existing_staff(apps, schema_editor):
+    # Staff used to manage every portfolio; keep them managing the first one
+    Tenant = apps.get_model('portfolio', 'Tenant')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    tenant = Tenant.objects.filter(pk=1).first()
+    if tenant is not None:
+        tenant.admins.add(*User.objects.filter(is_staff=True, is_superuser=False))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0011_duration_free_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='admins',
+            field=models.ManyToManyField(blank=True, help_text='Staff users who manage this portfolio; superusers manage all', related_name='administered_tenants', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(bind_existing_staff, migrations.RunPython.noop),
+    ]
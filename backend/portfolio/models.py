@@ -1,9 +1,80 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Collate
 from django.contrib.auth.models import User
 import json
 
+from .tenants import current_tenant_id, current_tenant_or_default
+from .validators import parse_duration, sanitize_instance
 
-class PersonalInfo(models.Model):
+
+class Tenant(models.Model):
+    """One hosted portfolio; every content row belongs to exactly one tenant"""
+    slug = models.SlugField(max_length=50, unique=True, help_text="Served under /t/<slug>/")
+    name = models.CharField(max_length=100)
+    domain = models.CharField(max_length=253, unique=True, blank=True, null=True,
+                              help_text="Host name served as this portfolio")
+    is_active = models.BooleanField(default=True)
+    admins = models.ManyToManyField(User, blank=True, related_name='administered_tenants',
+                                    help_text="Staff users who manage this portfolio; superusers manage all")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['slug']
+
+    def __str__(self):
+        return self.name
+
+
+class TenantManager(models.Manager):
+    """Default manager of tenant-owned models: only the current tenant's rows"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        tenant_id = current_tenant_id()
+        return queryset if tenant_id is None else queryset.filter(tenant_id=tenant_id)
+
+
+def tenant_field(one_per_tenant=False):
+    """Owner of a row; new rows default to the tenant being served"""
+    if one_per_tenant:
+        return models.OneToOneField(Tenant, on_delete=models.CASCADE, default=current_tenant_or_default,
+                                    editable=False, related_name='+')
+    # Not indexed alone: each model has composite indexes leading with it
+    return models.ForeignKey(Tenant, on_delete=models.CASCADE, default=current_tenant_or_default,
+                             editable=False, related_name='+', db_index=False)
+
+
+class SanitizedFieldsMixin:
+    """
+    Keeps cleaned copies of rich-text fields, declared as
+    ``SANITIZED_FIELDS = {source: target}``, up to date on every save, so
+    readers never have to sanitize. Bulk writers call
+    :func:`portfolio.validators.sanitize_instance` themselves.
+    """
+    SANITIZED_FIELDS = {}
+
+    def save(self, *args, **kwargs):
+        changed = sanitize_instance(self)
+        if kwargs.get('update_fields') is not None and changed:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *changed}
+        super().save(*args, **kwargs)
+
+
+class PersonalInfo(SanitizedFieldsMixin, models.Model):
+    # Installed by migration 0006 for the first portfolio; one row per tenant
+    DEFAULTS = {
+        'name': 'Mada Nithish Reddy',
+        'title': 'Computer Science Engineer',
+        'email': 'madanithishreddy@gmail.com',
+        'phone': '+91 9704715088',
+        'github': 'https://github.com/Nithish6606',
+        'linkedin': 'https://linkedin.com/in/nithish-mada',
+        'bio': 'Recent BTech Computer Science graduate passionate about web development, machine learning, and creating innovative solutions to real-world problems.',
+    }
+    SANITIZED_FIELDS = {'bio': 'bio_clean'}
+
+    tenant = tenant_field(one_per_tenant=True)
     name = models.CharField(max_length=100)
     title = models.CharField(max_length=100)
     email = models.EmailField()
@@ -11,9 +82,13 @@ class PersonalInfo(models.Model):
     github = models.URLField()
     linkedin = models.URLField()
     bio = models.TextField()
+    bio_clean = models.TextField(blank=True, editable=False, help_text="bio with disallowed HTML removed")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
     class Meta:
         verbose_name = "Personal Information"
         verbose_name_plural = "Personal Information"
@@ -32,38 +107,91 @@ class Skill(models.Model):
         ('tools', 'Tools'),
     ]
     
+    tenant = tenant_field()
     name = models.CharField(max_length=100)
     category = models.CharField(max_length=50, choices=SKILL_CATEGORIES)
     proficiency = models.IntegerField(default=80, help_text="Proficiency level (0-100)")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
     class Meta:
-        unique_together = ['name', 'category']
+        # Leads with the tenant and follows the ordering, so a tenant's
+        # skills are read straight off this index
+        unique_together = ['tenant', 'category', 'name']
         ordering = ['category', 'name']
+        indexes = [
+            # Case-insensitive prefix search (LIKE 'x%') in the admin
+            models.Index(F('tenant'), Collate(F('name'), 'NOCASE'), name='portfolio_skill_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
 
 
-class Experience(models.Model):
+class Experience(SanitizedFieldsMixin, models.Model):
+    SANITIZED_FIELDS = {'description': 'description_clean'}
+
+    tenant = tenant_field()
     title = models.CharField(max_length=100)
     company = models.CharField(max_length=100)
     duration = models.CharField(max_length=50)
+    start_date = models.DateField(blank=True, null=True, editable=False, help_text="Parsed from duration")
+    end_date = models.DateField(blank=True, null=True, editable=False,
+                                help_text="Parsed from duration; empty for a current role")
     description = models.TextField()
+    description_clean = models.TextField(blank=True, editable=False, help_text="description with disallowed HTML removed")
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['tenant', 'order', '-created_at'], name='portfolio_exp_tenant_idx'),
+            # Timeline ranges and chronological ordering
+            models.Index(fields=['tenant', 'start_date'], name='portfolio_exp_start_idx'),
+            models.Index(fields=['tenant', 'end_date'], name='portfolio_exp_end_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
 
+    def save(self, *args, **kwargs):
+        changed = self.refresh_dates()
+        if kwargs.get('update_fields') is not None and changed:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *changed}
+        super().save(*args, **kwargs)
+
+    def refresh_dates(self):
+        """
+        Re-derive ``start_date``/``end_date`` from ``duration`` (both empty if
+        it cannot be parsed); returns the names of the fields that changed.
+        """
+        if 'duration' in self.get_deferred_fields():
+            return []  # Not loaded, so not edited
+        start, end = parse_duration(self.duration) or (None, None)
+        changed = []
+        if self.start_date != start:
+            self.start_date = start
+            changed.append('start_date')
+        if self.end_date != end:
+            self.end_date = end
+            changed.append('end_date')
+        return changed
+
 
-class Project(models.Model):
+class Project(SanitizedFieldsMixin, models.Model):
+    SANITIZED_FIELDS = {'description': 'description_clean'}
+
+    tenant = tenant_field()
     title = models.CharField(max_length=100)
     description = models.TextField()
+    description_clean = models.TextField(blank=True, editable=False, help_text="description with disallowed HTML removed")
     tech_stack = models.JSONField(default=list, help_text="List of technologies used")
     github_url = models.URLField(blank=True, null=True)
     live_url = models.URLField(blank=True, null=True)
@@ -73,8 +201,15 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['tenant', 'order', '-created_at'], name='portfolio_proj_tenant_idx'),
+            models.Index(F('tenant'), Collate(F('title'), 'NOCASE'), name='portfolio_proj_title_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -87,7 +222,33 @@ class Project(models.Model):
         return str(self.tech_stack)
 
 
+class ProjectTechnology(models.Model):
+    """Normalized index of Project.tech_stack, one row per project and technology"""
+    tenant = tenant_field()
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='technologies')
+    name = models.CharField(max_length=100, help_text="Technology as written in tech_stack")
+    normalized = models.CharField(max_length=100, help_text="Case-folded name used for lookups")
+
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
+    class Meta:
+        unique_together = ['project', 'normalized']
+        indexes = [
+            # Technology -> projects lookups and per-technology counts
+            models.Index(fields=['tenant', 'normalized', 'project'], name='portfolio_tech_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.project_id})"
+
+    @staticmethod
+    def normalize(name):
+        return ' '.join(str(name).split()).casefold()[:100]
+
+
 class Certification(models.Model):
+    tenant = tenant_field()
     title = models.CharField(max_length=200)
     issuer = models.CharField(max_length=100, blank=True)
     issue_date = models.DateField(blank=True, null=True)
@@ -96,14 +257,22 @@ class Certification(models.Model):
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['tenant', 'order', '-created_at'], name='portfolio_cert_tenant_idx'),
+            models.Index(fields=['tenant', 'issue_date'], name='portfolio_cert_issued_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
 
 class ContactMessage(models.Model):
+    tenant = tenant_field()
     name = models.CharField(max_length=100)
     email = models.EmailField()
     subject = models.CharField(max_length=200)
@@ -111,15 +280,45 @@ class ContactMessage(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', '-created_at'], name='portfolio_msg_tenant_idx'),
+            models.Index(F('tenant'), Collate(F('name'), 'NOCASE'), name='portfolio_msg_name_idx'),
+            models.Index(F('tenant'), Collate(F('email'), 'NOCASE'), name='portfolio_msg_email_idx'),
+            models.Index(F('tenant'), Collate(F('subject'), 'NOCASE'), name='portfolio_msg_subject_idx'),
+        ]
 
     def __str__(self):
         return f"Message from {self.name} - {self.subject}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored read state so counters can see transitions
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
+
+
+class InboxCounter(models.Model):
+    """
+    Maintained ContactMessage counts per tenant: ``<tenant>:total``,
+    ``<tenant>:unread`` and one ``<tenant>:day:YYYY-MM-DD`` row per day with
+    messages received that day.
+    """
+    key = models.CharField(max_length=40, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
 
 class PortfolioSettings(models.Model):
-    """Global settings for the portfolio"""
+    """Settings of one portfolio (one row per tenant)"""
+    tenant = tenant_field(one_per_tenant=True)
     theme = models.CharField(max_length=20, default='light', choices=[
         ('light', 'Light'),
         ('dark', 'Dark'),
@@ -130,21 +329,77 @@ class PortfolioSettings(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
     class Meta:
         verbose_name = "Portfolio Settings"
         verbose_name_plural = "Portfolio Settings"
 
     def save(self, *args, **kwargs):
-        # Ensure only one settings instance exists
-        if not self.pk and PortfolioSettings.objects.exists():
-            raise ValueError('Only one PortfolioSettings instance is allowed')
+        # One settings row per tenant, enforced by the unique tenant column
+        # rather than a query
+        if self._state.adding:
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                raise ValueError('Only one PortfolioSettings instance is allowed')
+            return
         super().save(*args, **kwargs)
 
     @classmethod
     def get_settings(cls):
-        """Get or create the portfolio settings instance"""
-        settings, created = cls.objects.get_or_create(pk=1)
-        return settings
+        """Return the portfolio settings instance (cached, never writes)"""
+        from .singletons import get_portfolio_settings
+        return get_portfolio_settings()
 
     def __str__(self):
         return "Portfolio Settings"
+
+
+class ChangeEvent(models.Model):
+    """Append-only log of content changes; the row id is the content version"""
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    tenant = tenant_field()
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # A tenant's current version and events after a version
+            models.Index(fields=['tenant', 'id'], name='portfolio_change_tenant_idx'),
+        ]
+
+    def __str__(self):
+        return f"v{self.pk}: {self.model} {self.object_id} {self.action}"
+
+    def as_event(self):
+        """Compact representation pushed to clients"""
+        return {'model': self.model, 'id': self.object_id, 'action': self.action, 'version': self.pk}
+
+
+class ChangeLogCompaction(models.Model):
+    """Record of a change-log compaction run"""
+    horizon = models.BigIntegerField(
+        help_text="Clients holding a version below this must do a full refresh"
+    )
+    removed = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-horizon']
+
+    def __str__(self):
+        return f"Compaction up to v{self.horizon} ({self.removed} events removed)"
@@ -0,0 +1,114 @@
+"""
+Pagination for the API's list endpoints.
+
+Counts are cached per tenant, queryset signature (its SQL without
+ordering) and change token of the model, so a list page costs the one
+SELECT for its rows once the count is known; any tracked write to the
+model moves the token. Besides ``?page=`` clients may pick:
+
+- ``?page_size=N``, up to ``PAGINATION_MAX_PAGE_SIZE``;
+- ``?limit=N&offset=M``, with the same bound on ``limit``;
+- ``?page_size=all``, the whole collection in one response and one query
+  when it has at most ``PAGINATION_MAX_ALL_ROWS`` rows; larger ones get
+  their first ``PAGINATION_MAX_ALL_ROWS`` rows and a ``next`` link that
+  continues by offset.
+
+All modes answer with the same ``count``/``next``/``previous``/``results``
+envelope.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import LimitOffsetPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .changes import TRACKED_MODELS, change_token
+from .tenants import tenant_key
+
+ALL_ROWS = 'all'
+
+
+def cached_count(queryset):
+    """``queryset.count()``, cached until its model next changes; plain ``len()`` for in-memory rows"""
+    if not hasattr(queryset, 'query'):
+        return len(queryset)
+    model = queryset.model
+    if model not in TRACKED_MODELS:
+        return queryset.count()
+    try:
+        signature = str(queryset.order_by().query)
+    except EmptyResultSet:
+        return 0
+    digest = hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+    key = tenant_key(f'count:{model._meta.model_name}:{change_token(model)}:{digest}')
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count)
+    return count
+
+
+class CachedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        return cached_count(self.object_list)
+
+
+class CachedCountLimitOffsetPagination(LimitOffsetPagination):
+    def get_count(self, queryset):
+        return cached_count(queryset)
+
+
+class PortfolioPagination(PageNumberPagination):
+    django_paginator_class = CachedCountPaginator
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return settings.PAGINATION_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.offset_pagination = None
+        self.all_rows = None
+        params = request.query_params
+        if params.get(self.page_size_query_param) == ALL_ROWS:
+            return self.paginate_all(queryset, request, view)
+        if 'limit' in params or 'offset' in params:
+            self.offset_pagination = CachedCountLimitOffsetPagination()
+            self.offset_pagination.max_limit = self.max_page_size
+            self.offset_pagination.default_limit = self.page_size
+            rows = self.offset_pagination.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.offset_pagination.display_page_controls
+            return rows
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_all(self, queryset, request, view=None):
+        cap = settings.PAGINATION_MAX_ALL_ROWS
+        # One row past the cap tells whether the collection fits without counting it
+        rows = list(queryset[:cap + 1])
+        if len(rows) <= cap:
+            self.all_rows = (len(rows), None)
+            return rows
+        url = remove_query_param(request.build_absolute_uri(), self.page_size_query_param)
+        url = replace_query_param(replace_query_param(url, 'limit', cap), 'offset', cap)
+        self.all_rows = (cached_count(queryset), url)
+        return rows[:cap]
+
+    def get_paginated_response(self, data):
+        if self.offset_pagination is not None:
+            return self.offset_pagination.get_paginated_response(data)
+        if self.all_rows is not None:
+            count, next_url = self.all_rows
+            return Response({'count': count, 'next': next_url, 'previous': None, 'results': data})
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.offset_pagination is not None:
+            return self.offset_pagination.to_html()
+        return super().to_html()
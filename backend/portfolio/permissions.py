@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from .tenants import administers
+
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """
@@ -27,8 +29,8 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        # Write permissions only for admin users
-        return request.user and request.user.is_staff
+        # Write permissions only for admins of the portfolio being served
+        return administers(request.user)
 
 
 class IsAuthenticatedForWrite(permissions.BasePermission):
@@ -60,7 +62,7 @@ class IsOwnerOrAdmin(permissions.BasePermission):
             return request.user.is_authenticated
         
         # Write permissions for owners or admin
-        return (hasattr(obj, 'owner') and obj.owner == request.user) or request.user.is_staff
+        return (hasattr(obj, 'owner') and obj.owner == request.user) or administers(request.user)
 
 
 class ContactMessagePermission(permissions.BasePermission):
@@ -74,8 +76,25 @@ class ContactMessagePermission(permissions.BasePermission):
         if request.method == 'POST':
             return True  # Anyone can send a message
         
-        # Only admin can view/manage messages
-        return request.user and request.user.is_staff
+        # Only the portfolio's admins can view/manage messages
+        return administers(request.user)
 
     def has_object_permission(self, request, view, obj):
-        return request.user and request.user.is_staff
+        return administers(request.user)
+
+
+class IsTenantAdmin(permissions.BasePermission):
+    """
+    Staff access to the portfolio being served: its admins and superusers.
+    Use instead of IsAdminUser on tenant-scoped views.
+    """
+
+    def has_permission(self, request, view):
+        return administers(request.user)
+
+
+class IsSuperUser(permissions.BasePermission):
+    """Deployment-wide operations (backups, profiles, cache internals) span every tenant"""
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_superuser)
@@ -0,0 +1,179 @@
+"""
+On-demand request profiling for admins.
+
+An admin fetches a signed token from ``POST /api/admin/profiles/`` and sends
+it back in an ``X-Profile`` header (or a ``__profile`` query parameter) on
+the request to investigate. That request then runs under cProfile with
+tracemalloc tracing, and both results are written to ``PROFILE_ROOT``:
+
+- ``<id>.prof``: pstats data (``python -m pstats``, snakeviz, ...)
+- ``<id>.memory.txt``: allocations made during the request, by line
+- ``<id>.json``: request metadata shown by ``GET /api/admin/profiles/``
+
+The store keeps the newest ``PROFILE_MAX_ENTRIES`` profiles. Requests
+without the header or parameter cost one dict lookup and a substring test.
+Only one request is profiled at a time, because tracemalloc is
+process-wide. Under ASGI only the synchronous part of a request is
+captured.
+"""
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from .publish import atomic_write
+
+HEADER = 'HTTP_X_PROFILE'
+QUERY_PARAM = '__profile'
+TOKEN_SALT = 'portfolio.profiling'
+TRACEMALLOC_FRAMES = 10
+MEMORY_TOP = 50
+
+PROFILE_ID_RE = re.compile(r'^[0-9]{14}-[0-9a-f]{8}$')
+FILES = {
+    'cpu': ('.prof', 'application/octet-stream'),
+    'memory': ('.memory.txt', 'text/plain; charset=utf-8'),
+}
+
+_active = threading.Lock()
+
+
+def profile_root():
+    return str(settings.PROFILE_ROOT)
+
+
+def issue_token(user):
+    """A token enabling profiling for ``PROFILE_TOKEN_MAX_AGE`` seconds"""
+    return signing.dumps({'user': user.pk}, salt=TOKEN_SALT)
+
+
+def check_token(token):
+    try:
+        signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:  # Includes SignatureExpired
+        return False
+    return True
+
+
+def requested_token(request):
+    """The profiling token on a request, or None; cheap when there is none"""
+    token = request.META.get(HEADER)
+    if token is None and QUERY_PARAM in request.META.get('QUERY_STRING', ''):
+        token = request.GET.get(QUERY_PARAM)
+    return token
+
+
+def profile_path(profile_id, suffix):
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    return os.path.join(profile_root(), profile_id + suffix)
+
+
+def save_profile(meta, profiler, memory_lines):
+    profile_id = meta['id']
+    os.makedirs(profile_root(), exist_ok=True)
+    profiler.dump_stats(profile_path(profile_id, '.prof'))
+    atomic_write(profile_path(profile_id, '.memory.txt'), '\n'.join(memory_lines).encode() + b'\n')
+    # Metadata last: a profile is listed only once its files exist
+    atomic_write(profile_path(profile_id, '.json'), json.dumps(meta, indent=2).encode())
+    evict()
+
+
+def list_profiles():
+    """Metadata of stored profiles, newest first"""
+    try:
+        names = os.listdir(profile_root())
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in sorted(names, reverse=True):
+        if name.endswith('.json') and PROFILE_ID_RE.match(name[:-5]):
+            try:
+                with open(os.path.join(profile_root(), name), 'rb') as meta:
+                    profiles.append(json.load(meta))
+            except (OSError, ValueError):
+                continue  # Evicted or half-written meanwhile
+    return profiles
+
+
+def evict():
+    """Delete the oldest profiles beyond ``PROFILE_MAX_ENTRIES``"""
+    for meta in list_profiles()[settings.PROFILE_MAX_ENTRIES:]:
+        # Metadata first, so a partially deleted profile is never listed
+        for suffix in ('.json', '.prof', '.memory.txt'):
+            try:
+                os.unlink(profile_path(meta['id'], suffix))
+            except FileNotFoundError:
+                pass
+
+
+def memory_report(before, after):
+    lines = [f'Allocations during the request, top {MEMORY_TOP} lines by size difference:']
+    lines.extend(str(stat) for stat in after.compare_to(before, 'lineno')[:MEMORY_TOP])
+    return lines
+
+
+class ProfilingMiddleware:
+    """Profile requests that carry a valid profiling token"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = requested_token(request)
+        if token is None:
+            return self.get_response(request)
+        if not check_token(token):
+            response = self.get_response(request)
+            response['X-Profile-Status'] = 'invalid-token'
+            return response
+        if not _active.acquire(blocking=False):
+            response = self.get_response(request)
+            response['X-Profile-Status'] = 'busy'
+            return response
+        try:
+            return self.profile(request)
+        finally:
+            _active.release()
+
+    def profile(self, request):
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            response = profiler.runcall(self.get_response, request)
+        finally:
+            cpu_time = time.thread_time() - cpu_started
+            duration = time.perf_counter() - started
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+
+        now = timezone.now()
+        meta = {
+            'id': f'{now:%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+            'cpu_ms': round(cpu_time * 1000, 3),
+            'peak_traced_bytes': peak,
+            'created_at': now.isoformat(),
+        }
+        save_profile(meta, profiler, memory_report(before, after))
+        response['X-Profile-Id'] = meta['id']
+        return response
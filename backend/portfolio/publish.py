@@ -0,0 +1,133 @@
+"""
+Static publish pipeline.
+
+Renders each tenant's portfolio payload once per content change into
+``PUBLISH_ROOT/<tenant id>/``: a standalone ``portfolio-data.json`` and a copy of the
+frontend ``index.html`` with the same JSON inlined, so visitors get a fully
+populated page without a follow-up API call. Files are written to a
+temporary name and renamed into place, so readers never see partial output.
+"""
+import logging
+import os
+import tempfile
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from .models import Skill, Experience, Project, Certification
+from .serializers import (
+    PersonalInfoSerializer, ExperienceSerializer, ProjectSerializer
+)
+from .singletons import get_personal_info
+from .tenants import current_tenant_or_default, use_tenant
+
+logger = logging.getLogger(__name__)
+
+DATA_FILENAME = 'portfolio-data.json'
+INDEX_FILENAME = 'index.html'
+INLINE_SCRIPT_ID = 'portfolio-data'
+
+
+def build_portfolio_data():
+    """Assemble the complete portfolio payload served by PortfolioDataView"""
+    # Get personal info (cached; reads never create the row)
+    personal_info = get_personal_info()
+
+    # Get skills by category
+    skills = Skill.objects.all()
+    skills_by_category = defaultdict(list)
+    for skill in skills:
+        skills_by_category[skill.category].append(skill.name)
+
+    # Ensure all expected categories exist
+    expected_categories = ['programmingLanguages', 'webTechnologies', 'frameworks',
+                          'databases', 'technologies', 'tools']
+    for category in expected_categories:
+        if category not in skills_by_category:
+            skills_by_category[category] = []
+
+    # Get experience
+    experience = Experience.objects.all()
+
+    # Get projects
+    projects = Project.objects.all()
+
+    # Get certifications as simple list of titles
+    certifications = list(Certification.objects.values_list('title', flat=True))
+
+    return {
+        'personalInfo': PersonalInfoSerializer(personal_info).data if personal_info else {},
+        'skills': dict(skills_by_category),
+        'experience': ExperienceSerializer(experience, many=True).data,
+        'projects': ProjectSerializer(projects, many=True).data,
+        'certifications': certifications,
+    }
+
+
+def publish_root(tenant_id=None):
+    """Directory holding a tenant's (default: the current tenant's) published files"""
+    tenant_id = current_tenant_or_default() if tenant_id is None else tenant_id
+    return os.path.join(settings.PUBLISH_ROOT, str(tenant_id))
+
+
+def published_path(filename):
+    """Return the path of the current tenant's published file, or None if it has not been published"""
+    path = os.path.join(publish_root(), filename)
+    return path if os.path.isfile(path) else None
+
+
+def atomic_write(path, content):
+    """Write bytes to ``path`` via a temporary file and an atomic rename"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def render_index(template, payload):
+    """Inline the JSON payload into the frontend page just before </head>"""
+    # "<" is escaped so the payload can never close the script element
+    inline = payload.replace(b'<', b'\\u003c')
+    script = (b'<script id="' + INLINE_SCRIPT_ID.encode() + b'" type="application/json">'
+              + inline + b'</script>\n')
+    marker = template.find(b'</head>')
+    if marker == -1:
+        return script + template
+    return template[:marker] + script + template[marker:]
+
+
+def publish_site(tenant_id=None):
+    """Regenerate a tenant's published JSON and HTML from the current database"""
+    tenant_id = current_tenant_or_default() if tenant_id is None else tenant_id
+    with use_tenant(tenant_id):
+        payload = JSONRenderer().render(build_portfolio_data())
+        atomic_write(os.path.join(publish_root(tenant_id), DATA_FILENAME), payload)
+
+        template_path = os.path.join(settings.FRONTEND_ROOT, INDEX_FILENAME)
+        if os.path.isfile(template_path):
+            with open(template_path, 'rb') as template:
+                page = render_index(template.read(), payload)
+            index_path = os.path.join(publish_root(tenant_id), INDEX_FILENAME)
+            atomic_write(index_path, page)
+
+            # Parse the new page's resource hints now rather than on its first visit
+            from .hints import page_links
+            page_links(index_path)
+    return payload
+
+
+def publish_site_safely(tenant_id=None):
+    """on_commit hook: a failed publish must never fail the write that caused it"""
+    try:
+        publish_site(tenant_id)
+    except Exception:
+        logger.exception('Publishing the static portfolio of tenant %s failed', tenant_id)
@@ -0,0 +1,157 @@
+"""
+In-memory read model for anonymous reads of the public content ViewSets.
+
+A tenant's rows of one model are serialized once per change into
+an immutable :class:`ReadModel`: one tuple of field values per row, kept in
+the model's default ordering, with a primary-key map and per-field lookup
+indexes (``category``, ``is_featured``). A change builds a new model
+and replaces the old one in a single store, so a request always sees one
+consistent snapshot. List, retrieve, filtering and pagination are then
+answered without any ORM query; other workers' changes are noticed
+through the invalidation bus (see :func:`portfolio.changes.change_token`).
+
+Like :mod:`portfolio.singletons`, copies are kept for the most recently
+served tenants only; :func:`stats` reports what they cost in this worker.
+"""
+import sys
+
+from django.http import Http404
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .cache import CacheStats, LRUStore
+from .changes import change_token
+from .tenants import current_tenant_or_default
+
+MAX_TENANTS = 1024
+
+# (model, tenant id) -> ReadModel
+_loaded = LRUStore(MAX_TENANTS * 4, CacheStats())
+
+
+def _deep_size(value):
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(k) + _deep_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_size(item) for item in value)
+    return size
+
+
+class ReadModel:
+    """Serialized rows of one model for one tenant, as of one change token"""
+
+    __slots__ = ('token', 'fields', 'rows', 'by_pk', 'indexes', 'url_positions', 'footprint')
+
+    def __init__(self, token, serializer_class, instances, indexed=()):
+        serializer = serializer_class()
+        readable = [name for name, field in serializer.fields.items() if not field.write_only]
+        self.token = token
+        self.fields = tuple(readable)
+        # File fields serialize to a relative URL without a request; made absolute per request
+        self.url_positions = tuple(
+            position for position, name in enumerate(readable)
+            if isinstance(serializer.fields[name], serializers.FileField)
+            and getattr(serializer.fields[name], 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        )
+        rows = []
+        for data in serializer_class(instances, many=True).data:
+            rows.append(tuple(data[name] for name in readable))
+        self.rows = tuple(rows)
+        pk_position = readable.index('id')
+        self.by_pk = {row[pk_position]: row for row in self.rows}
+        self.indexes = {}
+        for name in indexed:
+            position = readable.index(name)
+            index = {}
+            for row in self.rows:
+                index.setdefault(row[position], []).append(row)
+            self.indexes[name] = {value: tuple(matching) for value, matching in index.items()}
+        self.footprint = sum(_deep_size(part) for part in (self.fields, self.rows, self.by_pk, self.indexes))
+
+    def lookup(self, field, value):
+        """Rows whose ``field`` equals ``value``, in default order"""
+        return self.indexes[field].get(value, ())
+
+    def get(self, pk):
+        try:
+            return self.by_pk.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def as_dict(self, row, request=None):
+        data = dict(zip(self.fields, row))
+        if request is not None:
+            for position in self.url_positions:
+                if row[position]:
+                    data[self.fields[position]] = request.build_absolute_uri(row[position])
+        return data
+
+
+def get_read_model(model, serializer_class, indexed=()):
+    """The current tenant's read model of ``model``, rebuilt when its rows change"""
+    tenant_id = current_tenant_or_default()
+    # Token first: rows committed after it only make the copy newer than its token
+    token = change_token(model)
+    found, read_model = _loaded.get((model, tenant_id))
+    if found and read_model.token == token:
+        return read_model
+    read_model = ReadModel(token, serializer_class, model.objects.filter(tenant_id=tenant_id), indexed)
+    _loaded.set((model, tenant_id), read_model, None)
+    return read_model
+
+
+def stats():
+    """Read models held by this worker and their approximate size in bytes"""
+    models = {}
+    for (model, _), read_model in _loaded.items():
+        summary = models.setdefault(model._meta.model_name, {'tenants': 0, 'rows': 0, 'bytes': 0})
+        summary['tenants'] += 1
+        summary['rows'] += len(read_model.rows)
+        summary['bytes'] += read_model.footprint
+    return {
+        'models': models,
+        'bytes': sum(summary['bytes'] for summary in models.values()),
+        'max_entries': _loaded.max_entries,
+    }
+
+
+class ReadModelMixin:
+    """
+    Serves anonymous ``list`` and ``retrieve`` of a ModelViewSet from the read
+    model. Views filter it in :meth:`read_model_rows`, mirroring their
+    ``get_queryset``; returning None there falls back to the ORM.
+    """
+
+    read_model_indexes = ()
+
+    def uses_read_model(self, request):
+        return request.method in ('GET', 'HEAD') and not request.user.is_authenticated
+
+    def get_read_model(self):
+        return get_read_model(self.queryset.model, self.get_serializer_class(), self.read_model_indexes)
+
+    def read_model_rows(self, read_model):
+        return read_model.rows
+
+    def list(self, request, *args, **kwargs):
+        if not self.uses_read_model(request):
+            return super().list(request, *args, **kwargs)
+        read_model = self.get_read_model()
+        rows = self.read_model_rows(read_model)
+        if rows is None:
+            return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([read_model.as_dict(row, request) for row in page])
+        return Response([read_model.as_dict(row, request) for row in rows])
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.uses_read_model(request):
+            return super().retrieve(request, *args, **kwargs)
+        read_model = self.get_read_model()
+        row = read_model.get(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        if row is None:
+            raise Http404('No %s matches the given query.' % self.queryset.model._meta.object_name)
+        return Response(read_model.as_dict(row, request))
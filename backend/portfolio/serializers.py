@@ -1,18 +1,33 @@
 from rest_framework import serializers
-from .models import PersonalInfo, Skill, Experience, Project, Certification, ContactMessage, PortfolioSettings
+from .models import Tenant, PersonalInfo, Skill, Experience, Project, Certification, ContactMessage, PortfolioSettings
+from .tenants import current_tenant_or_default
+
+
+class CurrentTenantDefault:
+    """Default for hidden tenant fields: the tenant being served"""
+
+    def __call__(self):
+        return Tenant(pk=current_tenant_or_default())
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
 
 
 class PersonalInfoSerializer(serializers.ModelSerializer):
     class Meta:
         model = PersonalInfo
-        fields = ['id', 'name', 'title', 'email', 'phone', 'github', 'linkedin', 'bio', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'title', 'email', 'phone', 'github', 'linkedin', 'bio', 'bio_clean',
+                  'created_at', 'updated_at']
+        read_only_fields = ['id', 'bio_clean', 'created_at', 'updated_at']
 
 
 class SkillSerializer(serializers.ModelSerializer):
+    # Declared so the (tenant, category, name) uniqueness check still runs
+    tenant = serializers.HiddenField(default=CurrentTenantDefault())
+
     class Meta:
         model = Skill
-        fields = ['id', 'name', 'category', 'proficiency', 'created_at']
+        fields = ['id', 'tenant', 'name', 'category', 'proficiency', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
@@ -29,8 +44,9 @@ class SkillsByCategorySerializer(serializers.Serializer):
 class ExperienceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Experience
-        fields = ['id', 'title', 'company', 'duration', 'description', 'order', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'title', 'company', 'duration', 'start_date', 'end_date', 'description',
+                  'description_clean', 'order', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'start_date', 'end_date', 'description_clean', 'created_at', 'updated_at']
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -38,10 +54,10 @@ class ProjectSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Project
-        fields = ['id', 'title', 'description', 'tech_stack', 'tech_stack_display', 
+        fields = ['id', 'title', 'description', 'description_clean', 'tech_stack', 'tech_stack_display', 
                  'github_url', 'live_url', 'image', 'order', 'is_featured', 
                  'created_at', 'updated_at']
-        read_only_fields = ['id', 'tech_stack_display', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'description_clean', 'tech_stack_display', 'created_at', 'updated_at']
 
 
 class CertificationSerializer(serializers.ModelSerializer):
@@ -0,0 +1,98 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import counters, singletons
+from .cache import invalidate_cached_views
+from .changes import TRACKED_MODELS, record_change
+from .publish import publish_site_safely
+from .technologies import sync_project_technologies
+from .tenants import current_tenant_or_default, forget_resolutions
+from .models import (
+    Tenant, PersonalInfo, Skill, Experience, Project,
+    Certification, ContactMessage, PortfolioSettings
+)
+
+# Models whose rows feed the public, cacheable read views
+CONTENT_MODELS = (PersonalInfo, Skill, Experience, Project, Certification, PortfolioSettings)
+
+
+def _same_call(queued, func, kwargs):
+    if kwargs:
+        return isinstance(queued, partial) and queued.func is func and queued.keywords == kwargs
+    return queued is func
+
+
+def on_commit_once(func, using=None, **kwargs):
+    """
+    Register ``func(**kwargs)`` to run after the current transaction commits,
+    unless the same call is already queued, so a bulk write triggers one
+    rebuild instead of N.
+    """
+    connection = transaction.get_connection(using)
+    if connection.in_atomic_block and any(_same_call(queued, func, kwargs) for _, queued, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(partial(func, **kwargs) if kwargs else func, using=using)
+
+
+def notify_content_changed(tenant_id=None):
+    """Drop a tenant's cached read views and republish it once the current write has committed"""
+    # Resolved now: on_commit hooks may run outside the request's tenant scope
+    tenant_id = current_tenant_or_default() if tenant_id is None else tenant_id
+    on_commit_once(invalidate_cached_views, tenant_id=tenant_id)
+    on_commit_once(publish_site_safely, tenant_id=tenant_id)
+
+
+def content_changed(sender, instance, **kwargs):
+    notify_content_changed(instance.tenant_id)
+
+
+def record_saved(sender, instance, created, raw=False, **kwargs):
+    """Append to the change log inside the writing transaction"""
+    if not raw:
+        record_change(instance, 'created' if created else 'updated')
+
+
+def record_deleted(sender, instance, **kwargs):
+    record_change(instance, 'deleted')
+
+
+def project_saved(sender, instance, raw=False, **kwargs):
+    """Keep the technology index in step with Project.tech_stack"""
+    if not raw:
+        sync_project_technologies([instance])
+
+
+def inbox_message_saved(sender, instance, created, **kwargs):
+    """Keep inbox counters in step with the write, in the same transaction"""
+    if created:
+        counters.message_created(instance)
+    else:
+        counters.message_saved(instance)
+
+
+def inbox_message_deleted(sender, instance, **kwargs):
+    counters.message_deleted(instance)
+
+
+# Receivers are bound per sender: a sender-less receiver would count as a
+# listener for every model and disable Django's fast queryset deletes.
+for model in CONTENT_MODELS:
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'content_saved_{model.__name__}')
+    post_delete.connect(content_changed, sender=model, dispatch_uid=f'content_deleted_{model.__name__}')
+
+for model in TRACKED_MODELS:
+    post_save.connect(record_saved, sender=model, dispatch_uid=f'record_saved_{model.__name__}')
+    post_delete.connect(record_deleted, sender=model, dispatch_uid=f'record_deleted_{model.__name__}')
+
+post_save.connect(inbox_message_saved, sender=ContactMessage, dispatch_uid='inbox_message_saved')
+post_delete.connect(inbox_message_deleted, sender=ContactMessage, dispatch_uid='inbox_message_deleted')
+post_save.connect(project_saved, sender=Project, dispatch_uid='project_technologies')
+
+post_save.connect(forget_resolutions, sender=Tenant, dispatch_uid='tenant_saved')
+post_delete.connect(forget_resolutions, sender=Tenant, dispatch_uid='tenant_deleted')
+
+for model in (PersonalInfo, PortfolioSettings):
+    post_save.connect(singletons.invalidate, sender=model, dispatch_uid=f'singleton_saved_{model.__name__}')
+    post_delete.connect(singletons.invalidate, sender=model, dispatch_uid=f'singleton_deleted_{model.__name__}')
@@ -0,0 +1,45 @@
+"""
+Process-local access to the one-per-tenant models (PersonalInfo, PortfolioSettings).
+
+Rows are loaded at most once per change and then served from memory;
+saves and deletes in this process drop the copy immediately, and other
+workers notice through the invalidation bus. Copies are kept for the most
+recently served tenants only, so memory stays flat however many tenants
+there are. Reads never create rows: the first tenant's defaults are
+installed by migration 0006.
+"""
+from .cache import CacheStats, LRUStore
+from .changes import change_token
+from .models import PersonalInfo, PortfolioSettings
+from .tenants import current_tenant_or_default
+
+MAX_TENANTS = 1024
+
+# (model, tenant id) -> (change token, instance or None)
+_loaded = LRUStore(MAX_TENANTS * 2, CacheStats())
+
+
+def _get(model):
+    tenant_id = current_tenant_or_default()
+    token = change_token(model)
+    found, cached = _loaded.get((model, tenant_id))
+    if found and cached[0] == token:
+        return cached[1]
+    instance = model.objects.filter(tenant_id=tenant_id).first()
+    _loaded.set((model, tenant_id), (token, instance), None)
+    return instance
+
+
+def get_personal_info():
+    """The portfolio owner's PersonalInfo, or None if it has been deleted"""
+    return _get(PersonalInfo)
+
+
+def get_portfolio_settings():
+    """The tenant's PortfolioSettings row; an unsaved default instance if it is missing"""
+    return _get(PortfolioSettings) or PortfolioSettings()
+
+
+def invalidate(sender, instance, **kwargs):
+    """Signal receiver: forget the cached copy of ``instance``'s row"""
+    _loaded.delete((sender, instance.tenant_id))
@@ -0,0 +1,16 @@
+"""
+The admin site, installed as Django's default one by
+:class:`portfolio.apps.PortfolioAdminConfig`. Kept apart from
+:mod:`portfolio.admin`, whose registrations would otherwise run while the
+default site is still being created.
+"""
+from django.contrib import admin
+
+from .tenants import administers
+
+
+class TenantAdminSite(admin.AdminSite):
+    """Open to staff only for the portfolios they manage; superusers see all"""
+
+    def has_permission(self, request):
+        return super().has_permission(request) and administers(request.user)
@@ -0,0 +1,141 @@
+"""
+Per-process fan-out of change events to Server-Sent Events clients.
+
+A single asyncio task per worker watches the change log while at least one
+client is connected and pushes new events onto each subscriber's queue, so
+idle connections cost a queue and a suspended coroutine rather than a
+thread or a database query each. The task reads the log only when the
+invalidation bus says something was recorded, or every ``POLL_INTERVAL``
+seconds for writes that bypassed it.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+
+from . import bus
+from .changes import CHANGES_NAMESPACE, PRIVATE_MODELS, current_version, events_since
+from .tenants import unscoped
+
+POLL_INTERVAL = 5
+BUS_POLL_INTERVAL = 0.02
+KEEPALIVE_INTERVAL = 15
+QUEUE_SIZE = 256
+REPLAY_BATCH = 500
+EVENT_BATCH = 1000
+
+
+class Subscriber:
+    __slots__ = ('queue', 'tenant_id', 'include_private', 'overflowed', 'sent')
+
+    def __init__(self, tenant_id, include_private):
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.tenant_id = tenant_id
+        self.include_private = include_private
+        self.overflowed = False
+        self.sent = None  # Last event id the client has, once known
+
+    def offer(self, event):
+        if event.tenant_id != self.tenant_id:
+            return
+        if self.sent is not None and event.pk <= self.sent:
+            return  # Already delivered by the replay
+        if event.model in PRIVATE_MODELS and not self.include_private:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client is dropped; it resumes from Last-Event-ID
+            self.overflowed = True
+
+
+class ChangeBroadcaster:
+    def __init__(self):
+        self.subscribers = set()
+        self.version = None
+        self._task = None
+
+    def subscribe(self, tenant_id, include_private=False):
+        subscriber = Subscriber(tenant_id, include_private)
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def _poll(self):
+        # One poller serves every tenant; the task was started inside the
+        # first subscriber's request and would otherwise inherit its tenant
+        with unscoped():
+            try:
+                await self._poll_all()
+            finally:
+                # Events recorded while nobody listens are owed to no one;
+                # the next poller starts from the then current version
+                self.version = None
+
+    async def _poll_all(self):
+        loop_time = asyncio.get_running_loop().time
+        if self.version is None:
+            self.version = await sync_to_async(current_version, thread_sensitive=False)()
+        seen, read_at = None, 0
+        while self.subscribers:
+            token = bus.version(CHANGES_NAMESPACE)
+            if token == seen and loop_time() - read_at < POLL_INTERVAL:
+                await asyncio.sleep(BUS_POLL_INTERVAL)
+                continue
+            read_at = loop_time()
+            events = await sync_to_async(events_since, thread_sensitive=False)(
+                self.version, include_private=True, limit=EVENT_BATCH
+            )
+            for event in events:
+                for subscriber in tuple(self.subscribers):
+                    subscriber.offer(event)
+                self.version = event.pk
+            if len(events) < EVENT_BATCH:
+                seen = token  # Caught up with everything recorded before the token was read
+
+
+broadcaster = ChangeBroadcaster()
+
+
+def format_event(event):
+    return f"id: {event.pk}\nevent: change\ndata: {json.dumps(event.as_event())}\n\n"
+
+
+async def event_stream(last_event_id, tenant_id, include_private=False):
+    """Yield a tenant's SSE frames, replaying anything missed since ``last_event_id``"""
+    subscriber = broadcaster.subscribe(tenant_id, include_private)
+    try:
+        if last_event_id is None:
+            sent = await sync_to_async(current_version, thread_sensitive=False)(tenant_id)
+            subscriber.sent = sent
+            yield f"retry: 3000\nid: {sent}\n\n"
+        else:
+            sent = last_event_id
+            yield "retry: 3000\n\n"
+            while True:
+                missed = await sync_to_async(events_since, thread_sensitive=False)(
+                    sent, include_private=include_private, limit=REPLAY_BATCH, tenant_id=tenant_id
+                )
+                for event in missed:
+                    yield format_event(event)
+                    sent = event.pk
+                if len(missed) < REPLAY_BATCH:
+                    break
+            subscriber.sent = sent
+
+        while not subscriber.overflowed:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event.pk <= sent:
+                continue  # already delivered during replay
+            yield format_event(event)
+            sent = subscriber.sent = event.pk
+    finally:
+        broadcaster.unsubscribe(subscriber)
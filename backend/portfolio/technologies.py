@@ -0,0 +1,75 @@
+"""
+Technology index over Project.tech_stack.
+
+ProjectTechnology mirrors each project's JSON list as indexed rows, so
+technology filters and facet counts are answered from an index instead of
+decoding every project's JSON.
+"""
+from django.db.models import Count, Min
+
+from .models import Project, ProjectTechnology
+
+
+def desired_technologies(project):
+    """``{normalized: display name}`` for a project's tech_stack, first spelling wins"""
+    technologies = {}
+    stack = project.tech_stack if isinstance(project.tech_stack, list) else []
+    for name in stack:
+        normalized = ProjectTechnology.normalize(name)
+        if normalized:
+            technologies.setdefault(normalized, ' '.join(str(name).split())[:100])
+    return technologies
+
+
+def sync_project_technologies(projects):
+    """Bring the index rows of ``projects`` in line with their tech_stack"""
+    projects = list(projects)
+    existing = {}
+    for row in ProjectTechnology.objects.filter(project__in=projects):
+        existing.setdefault(row.project_id, {})[row.normalized] = row
+
+    stale, missing = [], []
+    for project in projects:
+        wanted = desired_technologies(project)
+        current = existing.get(project.pk, {})
+        stale += [row.pk for normalized, row in current.items() if normalized not in wanted]
+        missing += [
+            ProjectTechnology(tenant_id=project.tenant_id, project=project, name=name, normalized=normalized)
+            for normalized, name in wanted.items() if normalized not in current
+        ]
+    if stale:
+        ProjectTechnology.objects.filter(pk__in=stale).delete()
+    if missing:
+        ProjectTechnology.objects.bulk_create(missing)
+    return len(missing), len(stale)
+
+
+def filter_by_technologies(queryset, names, match='all'):
+    """Restrict a Project queryset to projects using all (or any) of ``names``"""
+    normalized = {ProjectTechnology.normalize(name) for name in names} - {''}
+    if not normalized:
+        return queryset
+    matches = ProjectTechnology.objects.filter(normalized__in=normalized)
+    if match == 'any':
+        return queryset.filter(pk__in=matches.values('project'))
+    matching_all = (matches.values('project').annotate(matched=Count('id'))
+                    .filter(matched=len(normalized)).values('project'))
+    return queryset.filter(pk__in=matching_all)
+
+
+def technology_counts(queryset=None):
+    """Per-technology project counts, most used first"""
+    rows = ProjectTechnology.objects.all()
+    if queryset is not None:
+        rows = rows.filter(project__in=queryset.values('pk'))
+    return [
+        {'name': row['name'], 'normalized': row['normalized'], 'count': row['count']}
+        for row in rows.values('normalized')
+        .annotate(count=Count('project'), name=Min('name'))
+        .order_by('-count', 'normalized')
+    ]
+
+
+def rebuild_index():
+    """Re-sync every project; returns ``(added, removed)``"""
+    return sync_project_technologies(Project.objects.all())
@@ -0,0 +1,192 @@
+"""
+Tenant scoping: many portfolios served by one deployment.
+
+``TenantMiddleware`` resolves the tenant of each request from a
+``/t/<slug>/`` path prefix or the Host header (falling back to the default
+tenant) and makes it current for the rest of the request. Tenant-owned
+models filter their default manager by the current tenant and stamp new
+rows with it, so views, import/export, signals and cache keys are scoped
+without passing the tenant around. Staff accounts manage only the tenants
+that list them as admins (:func:`administers`); superusers manage all. Code running outside a request
+(migrations, management commands) is unscoped unless it uses
+:func:`use_tenant`.
+
+Resolutions are kept in a bounded in-process LRU, so the cost per request
+does not depend on how many tenants exist, and are dropped in every worker
+through the invalidation bus when a tenant row changes.
+"""
+import contextvars
+import re
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import Http404
+from django.urls import get_script_prefix, set_script_prefix
+
+from . import bus
+from .cache import CacheStats, LRUStore
+
+DEFAULT_TENANT_ID = 1
+
+_current = contextvars.ContextVar('portfolio_tenant', default=None)
+
+
+def current_tenant_id():
+    """Id of the tenant being served, or None outside any tenant scope"""
+    return _current.get()
+
+
+def current_tenant_or_default():
+    """Field default for tenant foreign keys: the current tenant, else the default one"""
+    tenant_id = _current.get()
+    return DEFAULT_TENANT_ID if tenant_id is None else tenant_id
+
+
+@contextmanager
+def use_tenant(tenant):
+    """Run the block scoped to ``tenant`` (a Tenant or an id; None for unscoped)"""
+    token = _current.set(getattr(tenant, 'pk', tenant))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def unscoped():
+    """Run the block across all tenants, e.g. for process-wide pollers"""
+    return use_tenant(None)
+
+
+def each_tenant(slug=None):
+    """
+    Yield every tenant (or only the one with ``slug``), each current while
+    the caller's loop body runs; for management commands.
+    """
+    from .models import Tenant
+
+    tenants = Tenant.objects.order_by('pk')
+    if slug is not None:
+        tenants = tenants.filter(slug=slug)
+    for tenant in tenants.iterator():
+        with use_tenant(tenant):
+            yield tenant
+
+
+def administers(user, tenant_id=None):
+    """
+    Whether ``user`` manages a tenant (default: the current one). Superusers
+    manage every tenant; other staff only those listing them in
+    ``Tenant.admins``. Memberships are read once per user object.
+    """
+    if user is None or not user.is_authenticated or not user.is_staff:
+        return False
+    if user.is_superuser:
+        return True
+    tenant_id = current_tenant_or_default() if tenant_id is None else tenant_id
+    administered = getattr(user, '_administered_tenants', None)
+    if administered is None:
+        administered = user._administered_tenants = frozenset(
+            user.administered_tenants.values_list('pk', flat=True)
+        )
+    return tenant_id in administered
+
+
+def tenant_key(key, tenant_id=None):
+    """Prefix a cache key with the (current) tenant"""
+    return f't{current_tenant_or_default() if tenant_id is None else tenant_id}:{key}'
+
+
+class TenantScopedViewMixin:
+    """
+    DRF views declare ``queryset`` once at import time, outside any tenant;
+    rebuild it per request through the model's (tenant-scoped) manager.
+    """
+
+    def get_queryset(self):
+        return self.queryset.model._default_manager.all()
+
+
+PATH_PREFIX_RE = re.compile(r'^/t/(?P<slug>[-a-zA-Z0-9_]+)(?P<rest>/.*)?$')
+TENANTS_NAMESPACE = 'tenants'
+
+# (kind, value) -> (bus version, (tenant id, is_active) or None for "no such tenant")
+_resolved = LRUStore(4096, CacheStats())
+
+
+def _lookup(kind, value):
+    token = bus.version(TENANTS_NAMESPACE)
+    found, resolved = _resolved.get((kind, value))
+    if found and resolved[0] == token:
+        return resolved[1]
+    from .models import Tenant
+
+    filters = {'slug': value} if kind == 'slug' else {'domain': value}
+    row = Tenant.objects.filter(**filters).values_list('pk', 'is_active').first()
+    _resolved.set((kind, value), (token, row), None)
+    return row
+
+
+def forget_resolutions(sender=None, **kwargs):
+    """Signal receiver: tenant rows changed, resolve again here and in every other worker"""
+    _resolved.clear()
+    bus.bump_on_commit(TENANTS_NAMESPACE)
+
+
+def resolve(request):
+    """
+    Tenant id for a request, stripping a ``/t/<slug>`` prefix from its path.
+
+    Raises Http404 for unknown or inactive tenants named in the path, and for
+    inactive tenants matched by host; unknown hosts get the default tenant.
+    """
+    match = PATH_PREFIX_RE.match(request.path_info)
+    if match:
+        row = _lookup('slug', match['slug'])
+        if row is None or not row[1]:
+            raise Http404('No such portfolio')
+        prefix = f'/t/{match["slug"]}'
+        # request.path keeps the prefix; URLs resolve and reverse without it
+        request.path_info = match['rest'] or '/'
+        set_script_prefix(get_script_prefix().rstrip('/') + prefix + '/')
+        return row[0]
+    host = request.get_host().rsplit(':', 1)[0].lower()
+    row = _lookup('domain', host)
+    if row is None:
+        return DEFAULT_TENANT_ID
+    if not row[1]:
+        raise Http404('No such portfolio')
+    return row[0]
+
+
+class TenantMiddleware:
+    """Make the request's tenant current for the view and everything it calls"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        script_prefix = get_script_prefix()
+        try:
+            request.tenant_id = resolve(request)
+            with use_tenant(request.tenant_id):
+                return self.get_response(request)
+        finally:
+            # Not left behind for whatever this thread handles next
+            set_script_prefix(script_prefix)
+
+    async def __acall__(self, request):
+        script_prefix = get_script_prefix()
+        try:
+            request.tenant_id = await sync_to_async(resolve)(request)
+            with use_tenant(request.tenant_id):
+                return await self.get_response(request)
+        finally:
+            set_script_prefix(script_prefix)
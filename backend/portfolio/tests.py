@@ -1,3 +1,436 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from . import bus, counters
+from .cache import _view_generation, invalidate_cached_views
+from .changes import changes_since, compact_change_log, current_version, sync_horizon
+from .models import (
+    Tenant, PersonalInfo, Skill, Experience, Project, ProjectTechnology,
+    ContactMessage, ChangeEvent, InboxCounter
+)
+from .tenants import DEFAULT_TENANT_ID, administers, tenant_key, unscoped, use_tenant
+
+
+class PortfolioTestCase(APITestCase):
+    """
+    Runs against a cache file, invalidation bus and publish/archive roots of
+    its own, so tests never touch (or read) a development server's state.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        root = tempfile.mkdtemp(prefix='portfolio-tests-')
+        cls.addClassCleanup(shutil.rmtree, root, ignore_errors=True)
+        overrides = override_settings(
+            CACHES={'default': {**settings.CACHES['default'], 'LOCATION': os.path.join(root, 'cache.sqlite3')}},
+            INVALIDATION_BUS_PATH=os.path.join(root, 'invalidation-bus'),
+            PUBLISH_ROOT=os.path.join(root, 'published'),
+            ARCHIVE_ROOT=os.path.join(root, 'archive'),
+            BACKUP_ROOT=os.path.join(root, 'backups'),
+            PROFILE_ROOT=os.path.join(root, 'profiles'),
+        )
+        overrides.enable()
+        cls.addClassCleanup(overrides.disable)
+        bus.close()  # Remapped from the overridden path on next use
+        cls.addClassCleanup(bus.close)
+        super().setUpClass()
+
+    def setUp(self):
+        caches['default'].clear()
+        # Each test's writes are rolled back without committing, so their
+        # bus bumps never ran: drop every in-process copy instead
+        bus.bump_all()
+
+    def login_admin(self):
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pw-123456')
+        self.client.force_authenticate(user)
+        return user
+
+    def commit(self, write):
+        """Run ``write`` and the hooks it registered for after its transaction commits"""
+        with self.captureOnCommitCallbacks(execute=True):
+            return write()
+
+
+class CachedViewInvalidationTests(PortfolioTestCase):
+    url = '/api/skills-by-category/'
+
+    def test_write_invalidates_cached_views_on_commit(self):
+        self.assertEqual(self.client.get(self.url).json()['tools'], [])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Skill.objects.create(name='Git', category='tools')
+        # Still served from the cache until the write commits
+        self.assertEqual(self.client.get(self.url).json()['tools'], [])
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(self.url).json()['tools'], ['Git'])
+
+    def test_api_write_invalidates_cached_views(self):
+        self.login_admin()
+        self.assertEqual(self.client.get('/api/portfolio-data/').json()['projects'], [])
+
+        response = self.commit(lambda: self.client.post('/api/projects/', {
+            'title': 'Site', 'description': 'A site', 'tech_stack': ['Django'],
+        }, format='json'))
+        self.assertEqual(response.status_code, 201)
+        # Signed-in reads bypass the cache; ask as a visitor
+        self.client.force_authenticate(None)
+        projects = self.client.get('/api/portfolio-data/').json()['projects']
+        self.assertEqual([project['title'] for project in projects], ['Site'])
+
+    def test_invalidation_is_per_tenant(self):
+        other = Tenant.objects.create(slug='other', name='Other')
+        with use_tenant(other):
+            generation = _view_generation()
+        invalidate_cached_views(DEFAULT_TENANT_ID)
+        with use_tenant(other):
+            self.assertEqual(_view_generation(), generation)
+        invalidate_cached_views(other.pk)
+        with use_tenant(other):
+            self.assertNotEqual(_view_generation(), generation)
+
+
+class ChangeLogTests(PortfolioTestCase):
+
+    def test_changes_since_returns_net_changes(self):
+        since = current_version()
+        kept = Project.objects.create(title='Kept', description='v1')
+        kept.description = 'v2'
+        kept.save()
+        gone = Project.objects.create(title='Gone', description='x')
+        gone_id = gone.pk
+        gone.delete()
+        ContactMessage.objects.create(name='A', email='a@example.com', subject='Hi', message='Hello')
+
+        delta = changes_since(since)
+        self.assertEqual(delta['since'], since)
+        self.assertEqual(set(delta['changes']), {'project'})
+        projects = delta['changes']['project']
+        self.assertEqual([(row['id'], row['description']) for row in projects['upserted']], [(kept.pk, 'v2')])
+        self.assertEqual(projects['deleted'], [gone_id])
+        # Private models are in the log but never in a delta
+        self.assertGreater(current_version(), delta['version'])
+
+        self.assertEqual(changes_since(delta['version'])['changes'], {})
+
+    def test_changes_endpoint(self):
+        since = current_version()
+        skill = Skill.objects.create(name='Go', category='programmingLanguages')
+
+        response = self.client.get('/api/portfolio-data/changes/', {'since': since})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['changes']['skill']['upserted']], [skill.pk])
+        self.assertEqual(self.client.get('/api/portfolio-data/changes/', {'since': 'x'}).status_code, 400)
+
+    def test_compaction_keeps_deltas(self):
+        since = current_version()
+        project = Project.objects.create(title='P', description='v1')
+        for n in range(2, 5):
+            project.description = f'v{n}'
+            project.save()
+        removed_project = Project.objects.create(title='R', description='x')
+        removed_project.delete()
+        before = changes_since(since)
+
+        removed, horizon = compact_change_log()
+        self.assertEqual(removed, 4)  # Superseded events of both projects
+        self.assertEqual(changes_since(since), before)
+        self.assertEqual(horizon, sync_horizon())
+        self.assertLessEqual(horizon, since)
+
+    def test_expired_tombstones_move_the_horizon(self):
+        since = current_version()
+        project = Project.objects.create(title='Old', description='x')
+        project.delete()
+        Skill.objects.create(name='Go', category='programmingLanguages')  # The newest event always survives
+        tombstone = ChangeEvent.objects.get(model='project', action='deleted')
+        ChangeEvent.objects.filter(pk=tombstone.pk).update(created_at=timezone.now() - timedelta(days=31))
+
+        _, horizon = compact_change_log(tombstone_days=30)
+        self.assertEqual(horizon, tombstone.pk)
+        self.assertIsNone(changes_since(since))
+        self.assertIsNotNone(changes_since(horizon))
+
+        response = self.client.get('/api/portfolio-data/changes/', {'since': since})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json(), {'reset': True, 'version': current_version()})
+
+
+class BulkEndpointTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.login_admin()
+
+    def test_bulk_create(self):
+        since = current_version()
+        response = self.commit(lambda: self.client.post('/api/projects/bulk/', [
+            {'title': 'A', 'description': '<strong>a</strong><script>x</script>', 'tech_stack': ['Django', 'React']},
+            {'title': 'B', 'description': 'b', 'tech_stack': ['Django']},
+        ], format='json'))
+        self.assertEqual(response.status_code, 201)
+        ids = [row['id'] for row in response.json()]
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertEqual(Project.objects.get(pk=ids[0]).description_clean, '<strong>a</strong>x')
+        self.assertEqual(ProjectTechnology.objects.filter(normalized='django').count(), 2)
+        self.assertEqual(
+            sorted(changes_since(since)['changes']['project']['upserted'], key=lambda row: row['id'])[0]['id'],
+            ids[0],
+        )
+
+    def test_bulk_create_rejects_invalid_rows(self):
+        response = self.client.post('/api/projects/bulk/', [{'title': 'A', 'description': 'a'}, {'title': 'B'}],
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Project.objects.count(), 0)
+
+    def test_bulk_update(self):
+        first = Project.objects.create(title='A', description='a')
+        second = Project.objects.create(title='B', description='b')
+        response = self.client.patch('/api/projects/bulk/', [
+            {'id': first.pk, 'title': 'A2'},
+            {'id': str(second.pk), 'description': '<em>b2</em><img src=x>'},  # String ids are accepted
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.title, 'A2')
+        self.assertEqual(second.description_clean, '<em>b2</em>')
+
+        self.assertEqual(self.client.patch('/api/projects/bulk/', [{'id': 999999, 'title': 'X'}],
+                                           format='json').status_code, 404)
+        self.assertEqual(self.client.patch('/api/projects/bulk/', [{'id': first.pk}, {'id': str(first.pk)}],
+                                           format='json').status_code, 400)
+        self.assertEqual(self.client.patch('/api/projects/bulk/', [{'id': 'abc'}], format='json').status_code, 400)
+        self.assertEqual(self.client.patch('/api/projects/bulk/', [{'title': 'no id'}],
+                                           format='json').status_code, 400)
+
+    def test_bulk_delete(self):
+        projects = [Project.objects.create(title=title, description='x') for title in 'ABC']
+        response = self.client.delete('/api/projects/bulk/', {'ids': [projects[0].pk, projects[1].pk, 999999]},
+                                      format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.json()['deleted']), [projects[0].pk, projects[1].pk])
+        self.assertEqual(list(Project.objects.values_list('title', flat=True)), ['C'])
+        self.assertEqual(self.client.delete('/api/projects/bulk/', {'ids': [999999]}, format='json').status_code, 404)
+
+    def test_bulk_requires_admin(self):
+        self.client.force_authenticate(None)
+        response = self.client.post('/api/projects/bulk/', [{'title': 'A', 'description': 'a'}], format='json')
+        self.assertIn(response.status_code, (401, 403))
+        self.assertEqual(Project.objects.count(), 0)
+
+    def test_reorder(self):
+        first, second, third = (
+            Experience.objects.create(title=title, company='C', duration='2020 - 2021', description='x', order=n)
+            for n, title in enumerate('ABC')
+        )
+        response = self.client.post('/api/experience/reorder/', {'ids': [third.pk, first.pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['order'], [third.pk, first.pk, second.pk])
+        self.assertEqual(sorted(response.json()['moved']), sorted([first.pk, second.pk, third.pk]))
+        self.assertEqual(list(Experience.objects.order_by('order').values_list('title', flat=True)), ['C', 'A', 'B'])
+
+        # Already in that order: nothing is written
+        since = current_version()
+        response = self.client.post('/api/experience/reorder/', {'ids': [third.pk]}, format='json')
+        self.assertEqual(response.json()['moved'], [])
+        self.assertEqual(current_version(), since)
+
+        response = self.client.post('/api/experience/reorder/', {'ids': [999999]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post('/api/experience/reorder/', {'ids': [first.pk, first.pk]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class InboxCounterTests(PortfolioTestCase):
+
+    def create_message(self, **fields):
+        return ContactMessage.objects.create(
+            name='Visitor', email='visitor@example.com', subject='Hello', message='Hi', **fields
+        )
+
+    def assertCounts(self, total, unread):
+        stats = counters.get_stats(days=1)
+        self.assertEqual((stats['total'], stats['unread'], stats['read']), (total, unread, total - unread))
+        self.assertEqual(counters.get_total(), total)
+        # The maintained counters match a recount from the message table
+        def nonzero(counts):
+            return {key: value for key, value in counts if value}
+
+        maintained = nonzero(InboxCounter.objects.values_list('key', 'value'))
+        self.assertEqual(nonzero(counters.reconcile_counters().items()), maintained)
+
+    def test_create(self):
+        self.create_message()
+        self.create_message(is_read=True)
+        self.assertCounts(total=2, unread=1)
+        self.assertEqual(counters.get_stats(days=1)['daily'][0]['count'], 2)
+
+    def test_save(self):
+        message = self.create_message()
+        message.is_read = True  # The instance create() returned
+        message.save()
+        self.assertCounts(total=1, unread=0)
+
+        message = ContactMessage.objects.get(pk=message.pk)
+        message.is_read = False
+        message.save()
+        message.save()  # Saving again without a change counts nothing
+        self.assertCounts(total=1, unread=1)
+
+        message = ContactMessage.objects.get(pk=message.pk)
+        message.subject = 'Re: Hello'
+        message.save()
+        self.assertCounts(total=1, unread=1)
+
+    def test_delete(self):
+        unread = self.create_message()
+        read = self.create_message(is_read=True)
+        self.create_message()
+        unread.delete()
+        self.assertCounts(total=2, unread=1)
+        read.delete()
+        self.assertCounts(total=1, unread=1)
+        ContactMessage.objects.all().delete()
+        self.assertCounts(total=0, unread=0)
+
+    def test_mark_read(self):
+        messages = [self.create_message() for _ in range(3)]
+        self.assertEqual(counters.set_read_state(ContactMessage.objects.filter(pk=messages[0].pk), True), 1)
+        self.assertCounts(total=3, unread=2)
+        # Already read: not counted twice
+        self.assertEqual(counters.set_read_state(ContactMessage.objects.all(), True), 2)
+        self.assertCounts(total=3, unread=0)
+
+        self.login_admin()
+        response = self.client.post('/api/contact-messages/mark-unread/',
+                                    {'ids': [messages[1].pk, messages[2].pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['updated'], response.json()['unread']), (2, 2))
+        response = self.client.post('/api/contact-messages/mark-read/', {'all': True}, format='json')
+        self.assertEqual((response.json()['updated'], response.json()['unread']), (2, 0))
+        self.assertCounts(total=3, unread=0)
+
+    def test_counters_are_per_tenant(self):
+        other = Tenant.objects.create(slug='other', name='Other')
+        self.create_message()
+        with use_tenant(other):
+            self.create_message()
+            self.create_message()
+            self.assertEqual(counters.get_total(), 2)
+            counters.set_read_state(ContactMessage.objects.all(), True)
+        self.assertCounts(total=1, unread=1)
+        self.assertEqual(counters.get_stats(tenant_id=other.pk)['unread'], 0)
+
+
+class TenantIsolationTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.other = Tenant.objects.create(slug='other', name='Other')
+        Skill.objects.create(name='Go', category='programmingLanguages')
+        with use_tenant(self.other):
+            self.rust = Skill.objects.create(name='Rust', category='programmingLanguages')
+
+    def test_querysets(self):
+        self.assertEqual(self.rust.tenant_id, self.other.pk)
+        with use_tenant(DEFAULT_TENANT_ID):
+            self.assertEqual(list(Skill.objects.values_list('name', flat=True)), ['Go'])
+            self.assertFalse(Skill.objects.filter(pk=self.rust.pk).exists())
+        with use_tenant(self.other):
+            self.assertEqual(list(Skill.objects.values_list('name', flat=True)), ['Rust'])
+        with unscoped():
+            self.assertEqual(Skill.objects.count(), 2)
+        self.assertEqual(Skill.all_tenants.count(), 2)
+
+    def test_cache_keys(self):
+        self.assertNotEqual(tenant_key('view'), tenant_key('view', self.other.pk))
+        with use_tenant(self.other):
+            self.assertEqual(tenant_key('view'), f't{self.other.pk}:view')
+
+    def test_requests(self):
+        for _ in range(2):  # Filled, then served from the cache
+            self.assertEqual(self.client.get('/api/skills-by-category/').json()['programmingLanguages'], ['Go'])
+            self.assertEqual(self.client.get('/t/other/api/skills-by-category/').json()['programmingLanguages'],
+                             ['Rust'])
+        self.assertEqual(self.client.get(f'/api/skills/{self.rust.pk}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/t/other/api/skills/{self.rust.pk}/').status_code, 200)
+        self.assertEqual(self.client.get('/t/missing/api/skills/').status_code, 404)
+
+    def test_staff_manage_only_their_tenants(self):
+        staff = User.objects.create_user('staff', password='pw-123456', is_staff=True)
+        self.other.admins.add(staff)
+        staff = User.objects.get(pk=staff.pk)
+        self.assertTrue(administers(staff, self.other.pk))
+        self.assertFalse(administers(staff, DEFAULT_TENANT_ID))
+
+        self.client.force_authenticate(staff)
+        payload = {'name': 'Zig', 'category': 'programmingLanguages'}
+        self.assertEqual(self.client.post('/api/skills/', payload, format='json').status_code, 403)
+        self.assertEqual(self.client.post('/t/other/api/skills/', payload, format='json').status_code, 201)
+        with use_tenant(self.other):
+            self.assertTrue(Skill.objects.filter(name='Zig').exists())
+
+
+class SanitizedFieldTests(PortfolioTestCase):
+    raw = '<p>Hi <strong>there</strong><script>alert(1)</script> <a href="javascript:run()" onclick="x">link</a></p>'
+
+    def test_clean_copy_on_save(self):
+        project = Project.objects.create(title='P', description=self.raw)
+        project.refresh_from_db()
+        self.assertEqual(project.description, self.raw)
+        self.assertEqual(project.description_clean, '<p>Hi <strong>there</strong>alert(1) <a>link</a></p>')
+
+        experience = Experience.objects.create(title='E', company='C', duration='2020 - 2021', description='x')
+        experience.description = '<em>new</em><iframe></iframe>'
+        experience.save(update_fields=['description'])
+        experience.refresh_from_db()
+        self.assertEqual(experience.description_clean, '<em>new</em>')
+
+    def test_api_round_trip(self):
+        self.login_admin()
+        project = Project.objects.create(title='P', description=self.raw)
+        data = self.client.get(f'/api/projects/{project.pk}/').json()
+        self.assertEqual(data['description'], self.raw)
+        clean = data['description_clean']
+
+        # Writing back what was read changes nothing; the clean copy is read-only
+        data['description_clean'] = '<script>forged</script>'
+        response = self.client.put(f'/api/projects/{project.pk}/', {
+            key: value for key, value in data.items() if key != 'image'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['description'], response.json()['description_clean']), (self.raw, clean))
+        project.refresh_from_db()
+        self.assertEqual((project.description, project.description_clean), (self.raw, clean))
+
+    def test_export_import_round_trip(self):
+        self.login_admin()
+        personal_info = PersonalInfo.objects.get()
+        personal_info.bio = self.raw
+        personal_info.save()
+        Project.objects.create(title='P', description=self.raw, tech_stack=['Django'])
+        Experience.objects.create(title='E', company='C', duration='Jan 2020 - Present', description=self.raw)
+
+        exported = self.client.get('/api/admin/export/').json()['data']
+        self.assertEqual(exported['projects'][0]['description'], self.raw)
+        self.assertNotIn('<script>', exported['projects'][0]['description_clean'])
+
+        since = current_version()
+        response = self.client.post('/api/admin/import/', exported, format='json')
+        self.assertEqual(response.status_code, 200)
+        # Unchanged data imports as a no-op, raw text and clean copies intact
+        self.assertEqual(current_version(), since)
+        self.assertEqual(self.client.get('/api/admin/export/').json()['data'], exported)
@@ -0,0 +1,32 @@
+"""
+Rate limits for the API.
+
+DRF's anonymous and per-user throttles, except that requests sent by
+:mod:`portfolio.warmup` are let through without being counted: they all come
+from 127.0.0.1 and would otherwise spend the anonymous quota of every local
+client at each worker start.
+"""
+from rest_framework import throttling
+
+# Set on the WSGI environ of warm-up requests. Not an HTTP_* key, so no
+# client can send it in a header.
+WARMUP_ENVIRON_KEY = 'portfolio.warmup'
+
+
+def is_warmup_request(request):
+    return bool(request.META.get(WARMUP_ENVIRON_KEY))
+
+
+class WarmupExemptMixin:
+    def allow_request(self, request, view):
+        if is_warmup_request(request):
+            return True
+        return super().allow_request(request, view)
+
+
+class AnonRateThrottle(WarmupExemptMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(WarmupExemptMixin, throttling.UserRateThrottle):
+    pass
@@ -1,4 +1,4 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 
@@ -26,12 +26,27 @@ urlpatterns = [
     # Custom API endpoints
     path('api/skills-by-category/', views.SkillsByCategoryView.as_view(), name='skills-by-category'),
     path('api/portfolio-data/', views.PortfolioDataView.as_view(), name='portfolio-data'),
+    path('api/portfolio-data/changes/', views.PortfolioChangesView.as_view(), name='portfolio-data-changes'),
+    path('api/facets/', views.FacetsView.as_view(), name='facets'),
     path('api/admin/login/', views.AdminLoginView.as_view(), name='admin-login'),
     path('api/admin/logout/', views.AdminLogoutView.as_view(), name='admin-logout'),
     path('api/admin/import/', views.PortfolioImportView.as_view(), name='portfolio-import'),
     path('api/admin/export/', views.export_portfolio_data, name='portfolio-export'),
+    path('api/admin/cache-stats/', views.cache_stats, name='cache-stats'),
+    path('api/admin/compression-stats/', views.compression_stats, name='compression-stats'),
+    path('api/admin/profiles/', views.profiles, name='profiles'),
+    re_path(r'^api/admin/profiles/(?P<profile_id>[0-9]{14}-[0-9a-f]{8})/(?P<kind>cpu|memory)/$',
+            views.profile_download, name='profile-download'),
+    path('api/admin/backups/', views.backups, name='backups'),
     path('api/health/', views.health_check, name='health-check'),
+    path('api/health/live/', views.health_live, name='health-live'),
+    path('api/health/ready/', views.health_ready, name='health-ready'),
+    path('api/stream/', views.change_stream, name='change-stream'),
     
     # Legacy endpoints for frontend compatibility
     path('api/data/', views.portfolio_data_legacy, name='portfolio-data-legacy'),
+    
+    # Published frontend (index.html with inlined data, plus its assets)
+    path('portfolio/', views.serve_frontend, name='frontend'),
+    re_path(r'^portfolio/(?P<path>.+)$', views.serve_frontend_assets, name='frontend-assets'),
 ]
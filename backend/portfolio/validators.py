@@ -1,7 +1,153 @@
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
+import calendar
+import datetime
+import hashlib
 import re
-import bleach
+import threading
+
+from .cache import CacheStats, LRUStore
+
+# Compiled once at import rather than on every validation
+UNSAFE_NAME_CHARS_RE = re.compile(r'[<>"\'\&]')
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_RE = re.compile(r'^\+?[\d\s\-\(\)]{10,15}$')
+URL_RE = re.compile(r'^https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(/.*)?$')
+
+# Basic HTML allowed in rich-text fields; everything else is stripped
+ALLOWED_TAGS = frozenset(['p', 'br', 'strong', 'em', 'ul', 'ol', 'li', 'a'])
+ALLOWED_ATTRIBUTES = {'a': ['href']}
+ALLOWED_PROTOCOLS = frozenset(['http', 'https', 'mailto'])
+
+# bleach Cleaners are not thread-safe: one per thread, built on first use
+_cleaners = threading.local()
+# Sanitized output by hash of the input: re-saving or re-importing unchanged
+# text is a dict lookup instead of a bleach parse
+_sanitized = LRUStore(4096, CacheStats())
+
+
+def _get_cleaner():
+    cleaner = getattr(_cleaners, 'cleaner', None)
+    if cleaner is None:
+        from bleach.sanitizer import Cleaner  # Imported on first use; only write paths sanitize
+
+        cleaner = _cleaners.cleaner = Cleaner(tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES,
+                                              protocols=ALLOWED_PROTOCOLS, strip=True)
+    return cleaner
+
+
+def sanitize_html(value):
+    """Strip disallowed tags, attributes and URL schemes from ``value``"""
+    if not value:
+        return value
+    key = hashlib.blake2b(value.encode(), digest_size=16).digest()
+    found, cleaned = _sanitized.get(key)
+    if not found:
+        cleaned = _get_cleaner().clean(value)
+        _sanitized.set(key, cleaned, None)
+    return cleaned
+
+
+def sanitize_instance(instance):
+    """
+    Refresh the ``SANITIZED_FIELDS`` of a model instance from their sources.
+
+    Returns the names of the stored fields whose value changed, for callers
+    that write with ``update_fields`` or ``bulk_update``. Sources deferred by
+    ``.only()`` were not edited and are skipped rather than loaded.
+    """
+    changed = []
+    deferred = instance.get_deferred_fields()
+    for source, target in getattr(instance, 'SANITIZED_FIELDS', {}).items():
+        if source in deferred:
+            continue
+        cleaned = sanitize_html(getattr(instance, source))
+        if getattr(instance, target) != cleaned:
+            setattr(instance, target, cleaned)
+            changed.append(target)
+    return changed
+
+
+# Free-text durations such as "Nov 2024 – Jan 2025", "2019 to 2021" or "03/2023 - Present"
+DURATION_SEPARATOR_RE = re.compile(r'\s*(?:[–—−]|\s-\s|\bto\b|\buntil\b|\btill\b)\s*', re.IGNORECASE)
+MONTH_YEAR_RE = re.compile(r'([a-z]+)\.?,?\s*(\d{4})')
+NUMERIC_MONTH_YEAR_RE = re.compile(r'(\d{1,2})[/.](\d{4})')
+YEAR_MONTH_RE = re.compile(r'(\d{4})[-/.](\d{1,2})')
+YEAR_RE = re.compile(r'\d{4}')
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+ONGOING_WORDS = frozenset(['present', 'current', 'currently', 'now', 'ongoing', 'today', 'date'])
+ONGOING = object()
+
+
+def _month_number(word):
+    if len(word) < 3:
+        return None
+    for name, number in MONTHS.items():
+        if name.startswith(word):
+            return number
+    return None
+
+
+def _parse_duration_point(text, end):
+    """First (or with ``end``, last) day of a month or year, ONGOING, or None"""
+    text = text.strip().strip('.,').lower()
+    if text in ONGOING_WORDS:
+        return ONGOING
+    month = None
+    match = MONTH_YEAR_RE.fullmatch(text)
+    if match:
+        month, year = _month_number(match[1]), int(match[2])
+        if month is None:
+            return None
+    elif NUMERIC_MONTH_YEAR_RE.fullmatch(text):
+        month, year = map(int, NUMERIC_MONTH_YEAR_RE.fullmatch(text).groups())
+    elif YEAR_MONTH_RE.fullmatch(text):
+        year, month = map(int, YEAR_MONTH_RE.fullmatch(text).groups())
+    elif YEAR_RE.fullmatch(text):
+        year = int(text)
+    else:
+        return None
+    if not 1900 <= year <= 2999 or month is not None and not 1 <= month <= 12:
+        return None
+    if month is None:
+        return datetime.date(year, 12, 31) if end else datetime.date(year, 1, 1)
+    return datetime.date(year, month, calendar.monthrange(year, month)[1] if end else 1)
+
+
+def parse_duration(text):
+    """
+    ``(start_date, end_date)`` covered by a free-text duration, or None if it
+    cannot be read. Months map to their first and last day, years to Jan 1
+    and Dec 31; an open end ("Present") gives an ``end_date`` of None.
+    """
+    text = (text or '').strip()
+    parts = DURATION_SEPARATOR_RE.split(text)
+    if len(parts) == 1:
+        start = _parse_duration_point(text, end=False)
+        if start is not None and start is not ONGOING:
+            return start, _parse_duration_point(text, end=True)
+        parts = text.split('-')  # "Nov 2024-Jan 2025"
+    if len(parts) != 2:
+        return None
+    start = _parse_duration_point(parts[0], end=False)
+    end = _parse_duration_point(parts[1], end=True)
+    if start is None or start is ONGOING or end is None:
+        return None
+    if end is ONGOING:
+        return start, None
+    return (start, end) if start <= end else None
+
+
+def validate_duration(value):
+    """
+    Former validator of ``Experience.duration``, kept for migration 0010.
+    Durations are free text; dates are derived only from those that parse.
+    """
+    if parse_duration(value) is None:
+        raise ValidationError(
+            "Enter a date range such as 'Nov 2024 – Jan 2025', '2019 – 2021' or 'Mar 2023 – Present'"
+        )
+
 
 class SecurityValidatorMixin:
     """Mixin to add security validations to serializers"""
@@ -12,7 +158,7 @@ class SecurityValidatorMixin:
             raise ValidationError("Name must be at least 2 characters long")
         
         # Remove potentially dangerous characters
-        cleaned_value = re.sub(r'[<>"\'\&]', '', value)
+        cleaned_value = UNSAFE_NAME_CHARS_RE.sub('', value)
         if cleaned_value != value:
             raise ValidationError("Name contains invalid characters")
         
@@ -20,15 +166,13 @@ class SecurityValidatorMixin:
     
     def validate_email(self, value):
         """Enhanced email validation"""
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_regex, value):
+        if not EMAIL_RE.match(value):
             raise ValidationError("Enter a valid email address")
         return value.lower()
     
     def validate_phone(self, value):
         """Validate phone number format"""
-        phone_regex = r'^\+?[\d\s\-\(\)]{10,15}$'
-        if not re.match(phone_regex, value):
+        if not PHONE_RE.match(value):
             raise ValidationError("Enter a valid phone number")
         return value
     
@@ -42,38 +186,23 @@ class SecurityValidatorMixin:
             raise ValidationError("URL must start with http:// or https://")
         
         # Basic URL pattern validation
-        url_pattern = r'^https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(/.*)?$'
-        if not re.match(url_pattern, value):
+        if not URL_RE.match(value):
             raise ValidationError("Enter a valid URL")
         
         return value
     
     def validate_text_content(self, value):
         """Sanitize text content to prevent XSS"""
-        if not value:
-            return value
-        
-        # Allow basic HTML tags but sanitize
-        allowed_tags = ['p', 'br', 'strong', 'em', 'ul', 'ol', 'li', 'a']
-        allowed_attributes = {'a': ['href']}
-        
-        cleaned_value = bleach.clean(
-            value, 
-            tags=allowed_tags, 
-            attributes=allowed_attributes,
-            strip=True
-        )
-        
-        return cleaned_value
+        return sanitize_html(value)
 
 # Phone number validator
 phone_validator = RegexValidator(
-    regex=r'^\+?[\d\s\-\(\)]{10,15}$',
+    regex=PHONE_RE,
     message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
 )
 
 # URL validator for GitHub/LinkedIn
 url_validator = RegexValidator(
-    regex=r'^https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(/.*)?$',
+    regex=URL_RE,
     message="Enter a valid URL starting with http:// or https://"
 )
@@ -1,17 +1,29 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
 from django.utils.decorators import method_decorator
 from django.db import transaction
+from django.db.models import F, Q
 from django.contrib.auth import authenticate
+from django.utils.dateparse import parse_date
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
 from rest_framework import generics, status, viewsets
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.decorators import (
+    action, api_view, authentication_classes, permission_classes, throttle_classes
+)
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.throttling import SimpleRateThrottle
 from rest_framework.views import APIView
-from rest_framework.authtoken.models import Token
+from asgiref.sync import sync_to_async
 from collections import defaultdict
+from datetime import datetime, time, timezone as dt_timezone
 import json
 
 from .models import (
@@ -26,47 +38,63 @@ from .serializers import (
 )
 from .permissions import (
     IsAdminOrReadOnly, IsAuthenticatedForWrite, 
-    ContactMessagePermission, IsOwnerOrAdmin
+    ContactMessagePermission, IsOwnerOrAdmin, IsSuperUser, IsTenantAdmin
 )
-
-
-class PersonalInfoViewSet(viewsets.ModelViewSet):
+from .cache import cached_view
+from .publish import build_portfolio_data, published_path
+from .stream import event_stream
+from .changes import changes_since, current_version
+from .bulk import BulkWriteMixin, ReorderMixin, IdListSerializer
+from . import counters
+from .facets import get_facets
+from .singletons import get_personal_info
+from .technologies import filter_by_technologies, sync_project_technologies, technology_counts
+from .tenants import TenantScopedViewMixin, administers
+from .readmodel import ReadModelMixin
+
+
+class PersonalInfoViewSet(TenantScopedViewMixin, viewsets.ModelViewSet):
     queryset = PersonalInfo.objects.all()
     serializer_class = PersonalInfoSerializer
     permission_classes = [IsAdminOrReadOnly]  # Only admin can edit, everyone can read
 
     def get_object(self):
-        # Always return the first (and ideally only) personal info record
-        personal_info, created = PersonalInfo.objects.get_or_create(
-            pk=1,
-            defaults={
-                'name': 'Mada Nithish Reddy',
-                'title': 'Computer Science Engineer',
-                'email': 'madanithishreddy@gmail.com',
-                'phone': '+91 9704715088',
-                'github': 'https://github.com/Nithish6606',
-                'linkedin': 'https://linkedin.com/in/nithish-mada',
-                'bio': 'Recent BTech Computer Science graduate passionate about web development, machine learning, and creating innovative solutions to real-world problems.',
-            }
-        )
+        # Always return the first (and ideally only) personal info record;
+        # reads come from the in-process singleton cache, writes from the DB
+        if self.request.method in ('GET', 'HEAD', 'OPTIONS'):
+            personal_info = get_personal_info()
+        else:
+            personal_info = PersonalInfo.objects.first()
+        if personal_info is None:
+            raise Http404('Personal info has not been set up')
+        self.check_object_permissions(self.request, personal_info)
         return personal_info
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(TenantScopedViewMixin, ReadModelMixin, BulkWriteMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [IsAdminOrReadOnly]  # Only admin can edit, everyone can read
+    read_model_indexes = ('category',)
+
+    def read_model_rows(self, read_model):
+        category = self.request.query_params.get('category', None)
+        if category:
+            return read_model.lookup('category', category)
+        return read_model.rows
 
     def get_queryset(self):
+        queryset = super().get_queryset()
         category = self.request.query_params.get('category', None)
         if category:
-            return self.queryset.filter(category=category)
-        return self.queryset
+            return queryset.filter(category=category)
+        return queryset
 
 
 class SkillsByCategoryView(APIView):
     permission_classes = [AllowAny]  # Public read access
 
+    @method_decorator(cached_view())
     def get(self, request):
         skills = Skill.objects.all()
         skills_by_category = defaultdict(list)
@@ -84,31 +112,124 @@ class SkillsByCategoryView(APIView):
         return Response(dict(skills_by_category))
 
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class TimelineFilterMixin:
+    """
+    ``?start=&end=`` (ISO dates, either optional) keep rows whose dates fall
+    in or overlap that range; ``?current=true`` keeps ongoing ones, and
+    ``?ordering=`` sorts by one of ``timeline_orderings``, all in SQL.
+    Filtered requests skip the read model.
+    """
+    timeline_start_field = None
+    timeline_end_field = None
+    timeline_orderings = ()
+    timeline_params = ('start', 'end', 'current', 'ordering')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        start, end = self.timeline_bound('start'), self.timeline_bound('end')
+        first, last = self.timeline_start_field, self.timeline_end_field
+        if last is None:
+            if start:
+                queryset = queryset.filter(**{f'{first}__gte': start})
+        elif start:
+            # Rows with no end yet are still running
+            queryset = queryset.filter(Q(**{f'{last}__gte': start})
+                                       | Q(**{f'{first}__isnull': False, f'{last}__isnull': True}))
+        if end:
+            queryset = queryset.filter(**{f'{first}__lte': end})
+        if last is not None and params.get('current', '').lower() == 'true':
+            queryset = queryset.filter(**{f'{first}__isnull': False, f'{last}__isnull': True})
+
+        ordering = params.get('ordering')
+        if ordering:
+            if ordering not in self.timeline_orderings:
+                raise ValidationError({'ordering': f'Expected one of: {", ".join(self.timeline_orderings)}'})
+            field = ordering.lstrip('-')
+            if not ordering.startswith('-'):
+                expression = F(field).asc(nulls_last=True)
+            elif field == last:
+                expression = F(field).desc(nulls_first=True)  # Ongoing first
+            else:
+                expression = F(field).desc(nulls_last=True)
+            queryset = queryset.order_by(expression, 'order', 'pk')
+        return queryset
+
+    def timeline_bound(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Expected an ISO date (YYYY-MM-DD)'})
+        return parsed
+
+    def read_model_rows(self, read_model):
+        if any(name in self.request.query_params for name in self.timeline_params):
+            return None
+        return super().read_model_rows(read_model)
+
+
+class ExperienceViewSet(TimelineFilterMixin, TenantScopedViewMixin, ReadModelMixin, BulkWriteMixin, ReorderMixin,
+                        viewsets.ModelViewSet):
     queryset = Experience.objects.all()
     serializer_class = ExperienceSerializer
     permission_classes = [IsAdminOrReadOnly]  # Only admin can edit, everyone can read
+    timeline_start_field = 'start_date'
+    timeline_end_field = 'end_date'
+    timeline_orderings = ('start_date', '-start_date', 'end_date', '-end_date')
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(TenantScopedViewMixin, ReadModelMixin, BulkWriteMixin, ReorderMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAdminOrReadOnly]  # Only admin can edit, everyone can read
+    read_model_indexes = ('is_featured',)
 
     def get_queryset(self):
+        queryset = super().get_queryset()
+        featured_only = self.request.query_params.get('featured', None)
+        if featured_only and featured_only.lower() == 'true':
+            queryset = queryset.filter(is_featured=True)
+
+        # ?tech=Python&tech=Flask matches projects using all of them;
+        # add &tech_match=any to match projects using any of them
+        technologies = self.request.query_params.getlist('tech')
+        if technologies:
+            match = 'any' if self.request.query_params.get('tech_match') == 'any' else 'all'
+            queryset = filter_by_technologies(queryset, technologies, match)
+        return queryset
+
+    def read_model_rows(self, read_model):
+        if self.request.query_params.getlist('tech'):
+            return None  # Technology filters need the join table
         featured_only = self.request.query_params.get('featured', None)
         if featured_only and featured_only.lower() == 'true':
-            return self.queryset.filter(is_featured=True)
-        return self.queryset
+            return read_model.lookup('is_featured', True)
+        return read_model.rows
 
+    @action(detail=False, methods=['get'])
+    def technologies(self, request):
+        """Technologies with the number of projects using each"""
+        return Response(technology_counts())
 
-class CertificationViewSet(viewsets.ModelViewSet):
+    def after_bulk_write(self, instances):
+        sync_project_technologies(instances)
+
+
+class CertificationViewSet(TimelineFilterMixin, TenantScopedViewMixin, ReadModelMixin, BulkWriteMixin, ReorderMixin,
+                           viewsets.ModelViewSet):
     queryset = Certification.objects.all()
     serializer_class = CertificationSerializer
     permission_classes = [IsAdminOrReadOnly]  # Only admin can edit, everyone can read
+    timeline_start_field = 'issue_date'
+    timeline_orderings = ('issue_date', '-issue_date')
 
 
-class ContactMessageViewSet(viewsets.ModelViewSet):
+class ContactMessageViewSet(TenantScopedViewMixin, viewsets.ModelViewSet):
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
     permission_classes = [ContactMessagePermission]  # Custom permission for contact messages
@@ -134,6 +255,62 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         
         return super().create(request, *args, **kwargs)
     
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Inbox totals and per-day counts from the maintained counters"""
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 366)
+        except ValueError:
+            return Response({'detail': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(counters.get_stats(days))
+
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        return self._set_read_state(request, True)
+
+    @action(detail=False, methods=['post'], url_path='mark-unread')
+    def mark_unread(self, request):
+        return self._set_read_state(request, False)
+
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """Archived messages in ``?start=&end=`` (dates or datetimes), paginated, or the archive summary"""
+        from . import archive  # Admin-only; kept off the worker startup path
+
+        start, end = request.query_params.get('start'), request.query_params.get('end')
+        if not start and not end:
+            return Response(archive.archive_summary())
+        try:
+            start = parse_range_bound(start, end_of_day=False) if start else datetime.min.replace(tzinfo=dt_timezone.utc)
+            end = parse_range_bound(end, end_of_day=True) if end else datetime.max.replace(tzinfo=dt_timezone.utc)
+        except ValueError:
+            return Response({'detail': 'start and end must be ISO dates or datetimes'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        rows = archive.archived_messages_between(start, end)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(rows)
+
+    @action(detail=False, methods=['get'], url_path=r'archived/(?P<message_id>\d+)')
+    def archived_message(self, request, message_id):
+        from . import archive
+
+        message = archive.find_archived_message(int(message_id))
+        if message is None:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(message)
+
+    def _set_read_state(self, request, is_read):
+        # {"ids": [...]} targets specific messages; {"all": true} the whole inbox
+        queryset = ContactMessage.objects.all()
+        if not request.data.get('all'):
+            serializer = IdListSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            queryset = queryset.filter(pk__in=serializer.validated_data['ids'])
+        changed = counters.set_read_state(queryset, is_read)
+        return Response({'updated': changed, **counters.get_stats(days=1)})
+
     def get_client_ip(self, request):
         """Get client IP address"""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -148,41 +325,39 @@ class PortfolioDataView(APIView):
     """API endpoint to get complete portfolio data in the format expected by frontend"""
     permission_classes = [AllowAny]
 
+    @method_decorator(cached_view())
     def get(self, request):
-        # Get personal info
-        personal_info, _ = PersonalInfo.objects.get_or_create(pk=1)
-        
-        # Get skills by category
-        skills = Skill.objects.all()
-        skills_by_category = defaultdict(list)
-        for skill in skills:
-            skills_by_category[skill.category].append(skill.name)
-        
-        # Ensure all expected categories exist
-        expected_categories = ['programmingLanguages', 'webTechnologies', 'frameworks', 
-                              'databases', 'technologies', 'tools']
-        for category in expected_categories:
-            if category not in skills_by_category:
-                skills_by_category[category] = []
+        return Response(build_portfolio_data())
 
-        # Get experience
-        experience = Experience.objects.all()
-        
-        # Get projects
-        projects = Project.objects.all()
-        
-        # Get certifications as simple list of titles
-        certifications = list(Certification.objects.values_list('title', flat=True))
-
-        data = {
-            'personalInfo': PersonalInfoSerializer(personal_info).data,
-            'skills': dict(skills_by_category),
-            'experience': ExperienceSerializer(experience, many=True).data,
-            'projects': ProjectSerializer(projects, many=True).data,
-            'certifications': certifications,
-        }
-        
-        return Response(data)
+
+class PortfolioChangesView(APIView):
+    """Delta sync: rows changed and tombstones for rows deleted since ``?since=<version>``"""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            return Response({'detail': 'since must be an integer version'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        delta = changes_since(since)
+        if delta is None:
+            # Tombstones the client needs were compacted away
+            return Response({'reset': True, 'version': current_version()},
+                            status=status.HTTP_410_GONE)
+        return Response(delta)
+
+
+class FacetsView(APIView):
+    """Dashboard aggregates (counts per category, featured, issuer, ...)"""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        facets = get_facets()
+        if administers(request.user):
+            facets = {**facets, 'inbox': counters.get_stats(days=7)}
+        return Response(facets)
 
 
 class AdminLoginView(APIView):
@@ -196,7 +371,7 @@ class AdminLoginView(APIView):
             
             # Authenticate user
             user = authenticate(username=username, password=password)
-            if user and user.is_staff:
+            if user and administers(user):
                 # Create or get token
                 token, created = Token.objects.get_or_create(user=user)
                 return Response({
@@ -232,7 +407,7 @@ class AdminLogoutView(APIView):
 
 
 class PortfolioImportView(APIView):
-    permission_classes = [IsAdminUser]  # Only admin users can import
+    permission_classes = [IsTenantAdmin]  # Only the portfolio's admins can import
 
     def post(self, request):
 
@@ -244,45 +419,61 @@ class PortfolioImportView(APIView):
             with transaction.atomic():
                 data = serializer.validated_data
                 
+                # Rows are updated in place and only when they differ, so an
+                # import of mostly unchanged data yields a small change log
+                # (and small delta-sync payloads) instead of recreating
+                # everything.
+
                 # Update personal info
-                personal_info, _ = PersonalInfo.objects.get_or_create(pk=1)
-                for field, value in data['personalInfo'].items():
-                    setattr(personal_info, field, value)
-                personal_info.save()
-
-                # Clear and recreate skills
-                Skill.objects.all().delete()
-                for category, skills in data['skills'].items():
-                    for skill_name in skills:
-                        Skill.objects.create(name=skill_name, category=category)
-
-                # Clear and recreate experience
-                Experience.objects.all().delete()
-                for i, exp_data in enumerate(data['experience']):
-                    Experience.objects.create(
-                        title=exp_data['title'],
-                        company=exp_data['company'],
-                        duration=exp_data['duration'],
-                        description=exp_data['description'],
-                        order=i
-                    )
-
-                # Clear and recreate projects
-                Project.objects.all().delete()
-                for i, proj_data in enumerate(data['projects']):
-                    Project.objects.create(
-                        title=proj_data['title'],
-                        description=proj_data['description'],
-                        tech_stack=proj_data.get('techStack', []),
-                        github_url=proj_data.get('github_url', ''),
-                        live_url=proj_data.get('live_url', ''),
-                        order=i
-                    )
-
-                # Clear and recreate certifications
-                Certification.objects.all().delete()
-                for i, cert_title in enumerate(data['certifications']):
-                    Certification.objects.create(title=cert_title, order=i)
+                personal_info, _ = PersonalInfo.objects.get_or_create()
+                personal_fields = {
+                    field: value for field, value in data['personalInfo'].items()
+                    if field in PersonalInfoSerializer.Meta.fields
+                    and field not in PersonalInfoSerializer.Meta.read_only_fields
+                }
+                update_if_changed(personal_info, personal_fields)
+
+                # Sync skills: keep existing, delete removed, create new
+                wanted = {
+                    (category, skill_name)
+                    for category, skills in data['skills'].items()
+                    for skill_name in skills
+                }
+                for skill in Skill.objects.all():
+                    if (skill.category, skill.name) in wanted:
+                        wanted.discard((skill.category, skill.name))
+                    else:
+                        skill.delete()
+                for category, skill_name in sorted(wanted):
+                    Skill.objects.create(name=skill_name, category=category)
+
+                # Sync experience by display position
+                sync_ordered_rows(Experience, [
+                    {
+                        'title': exp_data['title'],
+                        'company': exp_data['company'],
+                        'duration': exp_data['duration'],
+                        'description': exp_data['description'],
+                    }
+                    for exp_data in data['experience']
+                ])
+
+                # Sync projects by display position
+                sync_ordered_rows(Project, [
+                    {
+                        'title': proj_data['title'],
+                        'description': proj_data['description'],
+                        'tech_stack': proj_data.get('techStack', proj_data.get('tech_stack', [])),
+                        'github_url': proj_data.get('github_url', ''),
+                        'live_url': proj_data.get('live_url', ''),
+                    }
+                    for proj_data in data['projects']
+                ])
+
+                # Sync certifications by display position
+                sync_ordered_rows(Certification, [
+                    {'title': cert_title} for cert_title in data['certifications']
+                ])
 
             return Response({'message': 'Portfolio data imported successfully'})
             
@@ -291,18 +482,55 @@ class PortfolioImportView(APIView):
                           status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def parse_range_bound(value, end_of_day):
+    """Parse an ISO date or datetime query parameter into an aware datetime"""
+    from django.utils import timezone
+    from django.utils.dateparse import parse_date, parse_datetime
+
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def update_if_changed(instance, values):
+    """Assign ``values`` and save only if any field actually changed"""
+    changed = [field for field, value in values.items() if getattr(instance, field) != value]
+    if changed or instance.pk is None:
+        for field in changed:
+            setattr(instance, field, values[field])
+        instance.save()
+    return bool(changed)
+
+
+def sync_ordered_rows(model, rows):
+    """Make ``model``'s rows match ``rows`` position by position"""
+    existing = list(model.objects.order_by('order', 'id'))
+    for i, values in enumerate(rows):
+        values = dict(values, order=i)
+        if i < len(existing):
+            update_if_changed(existing[i], values)
+        else:
+            model.objects.create(**values)
+    for obj in existing[len(rows):]:
+        obj.delete()
+
+
 @api_view(['GET'])
-@permission_classes([IsAdminUser])
+@permission_classes([IsTenantAdmin])
+@cached_view(any_user=True)  # Runs after the permission check; the payload is the same for every admin
 def export_portfolio_data(request):
     """Export portfolio data as JSON"""
-    # Proper permission check is now handled by IsAdminUser decorator
-    
-    view = PortfolioDataView()
-    response = view.get(request)
+    # Proper permission check is now handled by IsTenantAdmin decorator
     
     return Response({
         'filename': 'portfolio-data.json',
-        'data': response.data
+        'data': build_portfolio_data()
     })
 
 
@@ -313,6 +541,167 @@ def health_check(request):
     return Response({'status': 'healthy', 'message': 'Portfolio API is running'})
 
 
+# Probes skip authentication and throttling: a probe storm must never be
+# answered with 429s, nor cost a session or token lookup
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def health_live(request):
+    """Liveness: the worker answers; no dependency is touched"""
+    import os
+
+    return Response({'status': 'alive', 'pid': os.getpid()})
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def health_ready(request):
+    """Readiness: database, migrations, cache and disk, with per-check timings"""
+    from . import health
+
+    report, cached = health.readiness()
+    ready = report['status'] == 'ready'
+    response = Response({**report, 'cached': cached},
+                        status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+class ChangeStreamThrottle(SimpleRateThrottle):
+    """New change stream connections, per user or client address"""
+    scope = 'stream'
+
+    def get_cache_key(self, request, view):
+        user = getattr(request, 'stream_user', None)
+        ident = user.pk if user is not None else self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+# Live change stream (Server-Sent Events); only served under ASGI
+@require_GET
+async def change_stream(request):
+    """
+    Push compact change events (model, id, action, version) to clients.
+
+    Needs an ASGI server: under WSGI the event generator would hold a worker
+    thread for as long as the client stays connected, so the endpoint answers
+    501 there instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'The change stream needs an ASGI server'},
+                            status=status.HTTP_501_NOT_IMPLEMENTED)
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return JsonResponse({'detail': 'Invalid Last-Event-ID'}, status=400)
+
+    user = await get_stream_user(request)
+    request.stream_user = user
+    throttle = ChangeStreamThrottle()
+    if not await sync_to_async(throttle.allow_request)(request, None):
+        response = JsonResponse({'detail': 'Too many change stream connections'},
+                                status=status.HTTP_429_TOO_MANY_REQUESTS)
+        wait = throttle.wait()
+        if wait is not None:
+            response['Retry-After'] = str(int(wait) + 1)
+        return response
+
+    include_private = await sync_to_async(administers)(user, request.tenant_id)
+    response = StreamingHttpResponse(
+        event_stream(last_event_id, request.tenant_id, include_private=include_private),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable proxy buffering
+    return response
+
+
+async def get_stream_user(request):
+    """Resolve the user from a session cookie or a DRF token, if any"""
+    auth = request.headers.get('Authorization', '').split()
+    if len(auth) == 2 and auth[0] == 'Token':
+        try:
+            user, _ = await sync_to_async(TokenAuthentication().authenticate_credentials)(auth[1])
+            return user
+        except AuthenticationFailed:
+            return None
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+# Cache statistics for monitoring
+@api_view(['GET'])
+@permission_classes([IsSuperUser])
+def cache_stats(request):
+    """
+    Hit/miss/eviction counters of the default cache in this worker, and per
+    cached view key how requests were answered: fresh, stale while another
+    request refreshed it, after waiting for that refresh, or by recomputing;
+    also the size of the in-memory read models.
+    """
+    from . import readmodel
+    from .cache import single_flight_stats
+
+    get_stats = getattr(cache, 'get_stats', None)
+    if get_stats is None:
+        return Response({'detail': 'Cache backend does not report statistics'},
+                        status=status.HTTP_404_NOT_FOUND)
+    return Response({**get_stats(), 'views': single_flight_stats.snapshot(), 'read_models': readmodel.stats()})
+
+
+@api_view(['GET'])
+@permission_classes([IsSuperUser])
+def compression_stats(request):
+    """Per-encoding bytes, ratio and CPU time spent compressing in this worker"""
+    from .compression import brotli, stats
+    return Response({'brotli_available': brotli is not None, 'encodings': stats.snapshot()})
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsSuperUser])
+def profiles(request):
+    """List stored request profiles, or issue a token that turns profiling on"""
+    from . import profiling
+
+    if request.method == 'POST':
+        return Response({
+            'token': profiling.issue_token(request.user),
+            'expires_in': settings.PROFILE_TOKEN_MAX_AGE,
+            'header': 'X-Profile',
+            'query_param': profiling.QUERY_PARAM,
+        }, status=status.HTTP_201_CREATED)
+    return Response({'profiles': profiling.list_profiles()})
+
+
+@api_view(['GET'])
+@permission_classes([IsSuperUser])
+def profile_download(request, profile_id, kind):
+    """Download the CPU (pstats) or memory report of one stored profile"""
+    import os
+    from django.http import FileResponse
+    from . import profiling
+
+    suffix, content_type = profiling.FILES[kind]
+    path = profiling.profile_path(profile_id, suffix)
+    if path is None or not os.path.isfile(path):
+        raise Http404('Profile not found')
+    return FileResponse(open(path, 'rb'), content_type=content_type, as_attachment=True,
+                        filename=os.path.basename(path))
+
+
+@api_view(['GET'])
+@permission_classes([IsSuperUser])
+def backups(request):
+    """Kept database backups, newest first, with the time of the latest"""
+    from . import backup
+
+    return Response(backup.backup_status())
+
+
 # Welcome page for root endpoint
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -329,6 +718,7 @@ def welcome_view(request):
         },
         'api_endpoints': {
             'health': '/api/health/',
+            'stream': '/api/stream/',  # ASGI servers only
             'portfolio_data': '/api/portfolio-data/',
             'personal_info': '/api/personal-info/',
             'skills': '/api/skills/',
@@ -377,16 +767,22 @@ def portfolio_data_legacy(request):
 
 # Frontend serving views
 def serve_frontend(request):
-    """Serve the main portfolio HTML file"""
+    """Serve the main portfolio HTML file, preferring the published copy"""
     import os
     from django.http import FileResponse, Http404
-    from django.conf import settings
+    from .hints import entry_page_path, page_links
     
-    # Path to the frontend files (parent directory of backend)
-    frontend_path = os.path.join(settings.FRONTEND_ROOT, 'index.html')
+    # The published page has the portfolio data inlined; fall back to the
+    # bare template (which fetches /api/portfolio-data/) until it exists
+    frontend_path = entry_page_path()
     
     if os.path.exists(frontend_path):
-        return FileResponse(open(frontend_path, 'rb'), content_type='text/html')
+        response = FileResponse(open(frontend_path, 'rb'), content_type='text/html')
+        # Let the browser start on CSS/JS/images before it has parsed the page
+        links = page_links(frontend_path)
+        if links:
+            response['Link'] = ', '.join(links)
+        return response
     else:
         raise Http404("Portfolio frontend not found")
 
@@ -398,8 +794,17 @@ def serve_frontend_assets(request, path):
     from django.conf import settings
     import mimetypes
     
-    # Path to the requested file
-    file_path = os.path.join(settings.FRONTEND_ROOT, path)
+    # Path to the requested file; published files take precedence
+    file_path = published_path(path) if path == 'portfolio-data.json' else None
+    if file_path is None:
+        frontend_root = os.path.realpath(settings.FRONTEND_ROOT)
+        file_path = os.path.realpath(os.path.join(frontend_root, path))
+        # Never serve anything outside the frontend, the backend tree or dotfiles
+        backend_root = os.path.realpath(settings.BASE_DIR)
+        if (os.path.commonpath([frontend_root, file_path]) != frontend_root
+                or os.path.commonpath([backend_root, file_path]) == backend_root
+                or any(part.startswith('.') for part in path.split('/'))):
+            raise Http404(f"File not found: {path}")
     
     if os.path.exists(file_path) and os.path.isfile(file_path):
         # Get the correct MIME type
@@ -0,0 +1,131 @@
+"""
+Worker warm-up.
+
+Does the one-off work a fresh process would otherwise do while serving its
+first visitor: importing the URLconf and views, opening the database
+connection, and filling the in-process caches for the public read paths.
+The requests go through a WSGI handler of their own under either entry
+point; what they fill is per process, not per handler. They are marked so
+the API throttles do not count them (see :mod:`portfolio.throttling`).
+
+Servers that load the application before forking workers (gunicorn
+``--preload``, uWSGI without ``lazy-apps``) run :func:`warm_up_on_start` in
+the parent, so it then closes the database and cache connections and unmaps
+the invalidation bus; each worker opens its own on first use. The
+in-process caches are kept and shared copy-on-write.
+"""
+import io
+import logging
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.cache import caches
+from django.db import connection, connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+WARM_PATHS = ('/api/portfolio-data/', '/api/skills-by-category/', '/api/facets/')
+
+
+def _timed(steps, name, func):
+    started = time.perf_counter()
+    try:
+        func()
+        steps.append((name, (time.perf_counter() - started) * 1000, None))
+    except Exception as e:
+        steps.append((name, (time.perf_counter() - started) * 1000, e))
+
+
+def _warmup_host():
+    # Any concrete allowed host will do; wildcards fall back to localhost
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip('.')
+        if host and '*' not in host:
+            return host
+    return 'localhost'
+
+
+def _request(handler, path):
+    """Send a GET through the full middleware stack, as a real visitor would"""
+    from .throttling import WARMUP_ENVIRON_KEY
+
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+        'SERVER_NAME': _warmup_host(),
+        'SERVER_PORT': '443' if getattr(settings, 'SECURE_SSL_REDIRECT', False) else '80',
+        'REMOTE_ADDR': '127.0.0.1', 'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+        'wsgi.url_scheme': 'https' if getattr(settings, 'SECURE_SSL_REDIRECT', False) else 'http',
+        WARMUP_ENVIRON_KEY: True,  # Not counted against the 127.0.0.1 throttle quota
+    }
+    statuses = []
+    body = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    if not statuses[0].startswith('200'):
+        raise RuntimeError(f'GET {path} returned {statuses[0]}')
+
+
+def _ensure_published():
+    from .publish import published_path, publish_site
+
+    if published_path('portfolio-data.json') is None:
+        publish_site()
+
+
+def _entry_hints():
+    from .hints import entry_links
+
+    entry_links()
+
+
+def _database():
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def release_connections():
+    """Close per-process handles opened while warming up; reopened lazily on use"""
+    from . import bus
+
+    connections.close_all()
+    for cache in caches.all(initialized_only=True):
+        if hasattr(cache, 'close_connections'):
+            cache.close_connections()
+    bus.close()
+
+
+def warm_up():
+    """Run every warm-up step; returns ``[(step, milliseconds, error or None)]``"""
+    from .singletons import get_personal_info, get_portfolio_settings
+
+    handler = WSGIHandler()
+    steps = []
+    _timed(steps, 'urlconf', lambda: get_resolver().url_patterns)
+    _timed(steps, 'database', _database)
+    _timed(steps, 'singletons', lambda: (get_personal_info(), get_portfolio_settings()))
+    for path in WARM_PATHS:
+        _timed(steps, path, lambda path=path: _request(handler, path))
+    _timed(steps, 'publish', _ensure_published)
+    _timed(steps, 'hints', _entry_hints)
+    return steps
+
+
+def warm_up_on_start():
+    """WSGI/ASGI hook: warm up if enabled, logging instead of raising"""
+    if not getattr(settings, 'WARMUP_ON_START', False):
+        return
+    steps = warm_up()
+    _timed(steps, 'release', release_connections)
+    for step, elapsed_ms, error in steps:
+        if error is not None:
+            logger.warning('Warm-up step %s failed after %.1f ms: %s', step, elapsed_ms, error)
+        else:
+            logger.info('Warm-up step %s took %.1f ms', step, elapsed_ms)
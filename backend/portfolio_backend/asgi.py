@@ -3,6 +3,12 @@ ASGI config for portfolio_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve through this entry point (e.g. ``uvicorn portfolio_backend.asgi:application``)
+to use the /api/stream/ Server-Sent Events endpoint: under ASGI each client
+is a suspended coroutine instead of a blocked worker thread. Servers that
+support the ``http.response.early_hint`` extension also get 103 Early Hints
+for the frontend page.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +20,14 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings')
 
 application = get_asgi_application()
+
+# 103 Early Hints for /portfolio/ where the server supports them
+from portfolio.hints import EarlyHintsMiddleware  # noqa: E402
+
+application = EarlyHintsMiddleware(application)
+
+# Prime imports, the DB connection and caches before the first request
+# (disable with WARMUP_ON_START=False)
+from portfolio.warmup import warm_up_on_start  # noqa: E402
+
+warm_up_on_start()
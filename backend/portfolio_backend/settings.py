@@ -32,7 +32,7 @@ ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1,Nithish6606
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'portfolio.apps.PortfolioAdminConfig',  # django.contrib.admin, tenant-aware site
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -46,6 +46,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Before anything that reads or rewrites the response body
+    'portfolio.compression.CompressionMiddleware',
+    # Inert unless a request carries an admin-issued profiling token
+    'portfolio.profiling.ProfilingMiddleware',
+    # Scopes everything below to the portfolio named by the path or host
+    'portfolio.tenants.TenantMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,9 +88,70 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests instead of reopening per request
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Warm imports, the DB connection and caches when a worker starts (see portfolio/warmup.py)
+WARMUP_ON_START = config('WARMUP_ON_START', default=True, cast=bool)
+
+
+# Cache
+# Two tiers: a per-process LRU in front of a SQLite file shared by all
+# workers on the host (see portfolio/cache.py).
+
+CACHE_DIR = BASE_DIR / 'cache'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'portfolio.cache.TwoTierCache',
+        'LOCATION': str(CACHE_DIR / 'portfolio-cache.sqlite3'),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'L1_MAX_ENTRIES': 512,
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=10, cast=int),
+        },
+    }
+}
+
+# Memory-mapped counters through which workers tell each other what changed
+# (see portfolio/bus.py); must be on a local filesystem shared by all workers
+INVALIDATION_BUS_PATH = config('INVALIDATION_BUS_PATH', default=str(CACHE_DIR / 'invalidation-bus'))
+
+
+# Compression
+# br (when the optional brotli package is installed) or gzip; smaller
+# bodies are sent as-is (see portfolio/compression.py).
+
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+
+
+# Request profiling (see portfolio/profiling.py)
+
+PROFILE_MAX_ENTRIES = config('PROFILE_MAX_ENTRIES', default=50, cast=int)
+PROFILE_TOKEN_MAX_AGE = config('PROFILE_TOKEN_MAX_AGE', default=3600, cast=int)
+
+
+# Database backups (see portfolio/backup.py); run `manage.py backup_database`
+# from cron. Pages copied per step and the pause between steps bound how
+# long the web tier can wait on a backup.
+
+BACKUP_KEEP_CHAINS = config('BACKUP_KEEP_CHAINS', default=4, cast=int)
+BACKUP_INCREMENTALS_PER_FULL = config('BACKUP_INCREMENTALS_PER_FULL', default=23, cast=int)
+BACKUP_STEP_PAGES = config('BACKUP_STEP_PAGES', default=256, cast=int)
+BACKUP_STEP_PAUSE = config('BACKUP_STEP_PAUSE', default=0.01, cast=float)
+
+
+# Readiness probe (see portfolio/health.py)
+
+HEALTH_CACHE_TTL = config('HEALTH_CACHE_TTL', default=5, cast=float)
+HEALTH_DB_LOCK_TIMEOUT = config('HEALTH_DB_LOCK_TIMEOUT', default=0.5, cast=float)
+HEALTH_INTEGRITY_INTERVAL = config('HEALTH_INTEGRITY_INTERVAL', default=300, cast=int)
+HEALTH_MIN_FREE_DISK = config('HEALTH_MIN_FREE_DISK', default=100 * 1024 * 1024, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,6 +204,18 @@ STATICFILES_FINDERS = [
 # Frontend files location
 FRONTEND_ROOT = BASE_DIR.parent  # Parent directory contains the frontend files
 
+# Pre-rendered index.html and portfolio-data.json, regenerated on every content change
+PUBLISH_ROOT = BASE_DIR / 'published'
+
+# Compressed, append-only segments of archived contact messages
+ARCHIVE_ROOT = BASE_DIR / 'archive'
+
+# Admin-requested CPU/memory profiles, newest PROFILE_MAX_ENTRIES kept
+PROFILE_ROOT = BASE_DIR / 'profiles'
+
+# Compressed full and incremental database backups
+BACKUP_ROOT = config('BACKUP_ROOT', default=str(BASE_DIR / 'backups'))
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -155,18 +234,24 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Cached counts, ?page_size=, ?limit=&offset= and ?page_size=all (see portfolio/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'portfolio.pagination.PortfolioPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'portfolio.throttling.AnonRateThrottle',  # Both skip warm-up requests
+        'portfolio.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
-        'user': '1000/hour'
+        'user': '1000/hour',
+        'stream': '60/hour'
     }
 }
 
+# Bounds on client-chosen page sizes, and on ?page_size=all responses
+PAGINATION_MAX_PAGE_SIZE = config('PAGINATION_MAX_PAGE_SIZE', default=100, cast=int)
+PAGINATION_MAX_ALL_ROWS = config('PAGINATION_MAX_ALL_ROWS', default=500, cast=int)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -216,4 +301,5 @@ REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {
     'anon': config('ANON_RATE_LIMIT', default='50/hour'),  # Reduced from 100
     'user': config('USER_RATE_LIMIT', default='500/hour'),  # Reduced from 1000
     'contact': '10/hour',  # New: Limit contact form submissions
+    'stream': config('STREAM_RATE_LIMIT', default='60/hour'),  # Change stream connections
 }
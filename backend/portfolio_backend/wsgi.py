@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings')
 
 application = get_wsgi_application()
+
+# Prime imports, the DB connection and caches before the first request
+# (disable with WARMUP_ON_START=False)
+from portfolio.warmup import warm_up_on_start  # noqa: E402
+
+warm_up_on_start()